@@ -1,12 +1,29 @@
+from phases import PhaseTimer  # Boot phase timing
+boot_timer = PhaseTimer(start_ms=0)  # First, so imports are timed too; ticks_ms() starts at reset
 import machine
-import network
-import urequests
-import time
 import dht
 import bmp280
 from machine import Pin, I2C
-import gc  # Garbage collector
 from lcd_i2c import I2cLcd  # I2C LCD library
+import runtime  # Cooperative task runtime
+import uplink  # Keep-alive Telegram client
+from outbox import Outbox  # Retrying outbound queue
+from ringlog import RingLog  # Flash ring log for offline reports
+from deadband import ChangeFilter  # Report-by-exception deadbands
+from aggregate import WindowStats, History  # Streaming window stats
+from fanout import Fanout  # One read, many sinks at their own rates
+from wifi import WifiManager  # Fast reconnect and link watch
+from dutycycle import DutyCycle  # Deep-sleep battery mode
+from sample import Sample, RECORD_FMT  # Compact reading type
+from profiler import Profiler  # Stage time and heap profiling
+from spans import Tracer  # Per-stage latency histograms
+from commands import CommandPoller  # Long-polled bot commands
+from render import Renderer, Template, Fixed, Choice, When, Each, Text  # Message templates
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+boot_timer.mark('imports')
 
 # ================================
 #       Configuration
@@ -16,22 +33,67 @@ BMP280_I2C_ADDR = 0x76
 RAIN_SENSOR_PIN = 34       # GPIO pin for Rain Sensor
 LDR_PIN = 35               # GPIO pin for LDR
 MQ135_PIN = 14             # MQ-135 Digital Pin (adjust as needed)
+MQ135_ANALOG = False       # True: MQ135_PIN is the analog output on an ADC pin (e.g. 32) ...
+MQ135_THRESHOLD = 300000   # ... and readings at or above this mean bad air
+LCD_I2C_ADDR = 0x3F        # LCD I2C address (try 0x27 if 0x3F doesn't work)
 WIFI_SSID = 'lokimux'
 WIFI_PASSWORD = '11072004'
+WIFI_STATIC_IP = None  # (ip, netmask, gateway, dns) to skip DHCP, or None
 TELEGRAM_TOKEN = '7447852497:AAFaefX8uXIA9drenumOLAblUlpR7xDStAg'  # Replace with your token
 CHAT_ID = '1706011784'     # Replace with your chat ID
+GROUP_CHAT_ID = '-1002342228163'  # Group chat id (often negative); the bot must be a member
+BOT_USERNAME = None        # e.g. 'station_bot', so /now@other_bot in a group is left alone
+
+# Where readings go: (kind, target, period ms). The sensors are read once per
+# SAMPLE_INTERVAL_MS and every line gets its own share at its own rate:
+#   'telegram'  chat id: window summary, when it left the deadbands or is due a heartbeat
+#   'lcd'       None: the PAGES in turn, each for its own dwell, with the newest reading (period None)
+#   'serial'    None: one printed line of window means
+#   'file'      path: window means appended to a flash ring log
+# Remove or comment out lines to turn sinks off; Telegram sinks share one connection.
+SINKS = (
+    ('telegram', CHAT_ID, 900000),
+    ('telegram', GROUP_CHAT_ID, 3600000),
+    ('lcd', None, None),
+    ('serial', None, 60000),
+    ('file', 'log.bin', 300000),
+)
+
+SAMPLE_INTERVAL_MS = 2000         # Sensor sampling period (DHT11 allows 1 Hz)
+HEARTBEAT_INTERVAL_S = 1800       # Report to a chat anyway after this much silence
+OUTBOX_INTERVAL_MS = 5000         # How often queued reports are retried
+UPLINK_TIMEOUT_S = 5              # Socket timeout of a Telegram request; every task waits while one blocks
+HOUSEKEEPING_INTERVAL_MS = 30000  # GC period
+WIFI_TIMEOUT_MS = 15000           # Give up on one join attempt after this
+WIFI_WATCH_INTERVAL_MS = 1000     # Link status check period
+BACKLOG_PATH = 'backlog{}.bin'    # Per chat ({} is the chat id): reports that overflow the RAM queue
+BACKLOG_RECORDS = 256             # Flash ring size, in readings
+LOG_RECORDS = 1024                # File log ring size, in readings
+LOG_FLUSH_INTERVAL_MS = 1800000   # File log: write out a part-filled block at least this often
+DEEP_SLEEP_MS = 0                 # >0: deep sleep this long between samples (battery mode)
+WAKE_BUDGET_MS = 1000             # Wake-to-sleep time allowed when only sampling
+REPORT_BUDGET_MS = 10000          # ... and when the wake also reports
+REPORT_SEND_MS = 4000             # Of a report wake, kept for the sends; the Wi-Fi join gets the rest
+PROFILE = False                   # Record time and heap use per stage
+PROFILE_INTERVAL_MS = 60000       # How often the stage report is printed
+TRACE = True                      # Latency histograms per stage: print(tracer.report())
+TRACE_IN_MESSAGE = False          # Append the latency report to every report message
+COMMANDS = True                   # Answer /now, /stats and /history in the chats (not in battery mode)
+COMMAND_POLL_INTERVAL_MS = 250    # How often the pending getUpdates long poll is checked
+COMMAND_TIMEOUT_S = 25            # Longest the Bot API holds one long poll open (and a report waits for it)
+OFFSET_PATH = 'offset.dat'        # Next update to fetch, so no command is answered twice
+HISTORY_INTERVAL_MS = 600000      # One /history line per this much time ...
+HISTORY_SIZE = 12                 # ... and how many lines are kept
 
 # ================================
 #      I2C Initialization
 # ================================
 # I2C for BMP280 (SDA=21, SCL=22)
 i2c_bmp = I2C(1, scl=Pin(22), sda=Pin(21))
-bmp_sensor = bmp280.BMP280(i2c_bmp)
-
-# I2C for LCD (SDA=18, SCL=19)
-i2c_lcd = I2C(0, scl=Pin(26), sda=Pin(27))
-lcd_addr = 0x3F  # LCD I2C address (try 0x27 if 0x3F doesn't work)
-lcd = I2cLcd(i2c_lcd, lcd_addr, 2, 16)  # 16x2 LCD
+bmp_sensor = bmp280.BMP280(i2c_bmp, no_alloc=True, profile='weather')  # Reuse read buffers, forced mode
+lcd = None  # Opened by the first 'lcd' sink (SDA=27, SCL=26 on I2C 0)
+file_logs = []  # RingLogs of the 'file' sinks
+boot_timer.mark('i2c')
 
 # ================================
 #       Sensor Initialization
@@ -39,166 +101,336 @@ lcd = I2cLcd(i2c_lcd, lcd_addr, 2, 16)  # 16x2 LCD
 dht_sensor = dht.DHT11(Pin(DHT_PIN))
 rain_sensor = Pin(RAIN_SENSOR_PIN, Pin.IN)
 ldr = Pin(LDR_PIN, Pin.IN)
-mq135 = Pin(MQ135_PIN, Pin.IN)  # MQ-135 in digital mode
+mq135 = machine.ADC(Pin(MQ135_PIN)) if MQ135_ANALOG else Pin(MQ135_PIN, Pin.IN)
+boot_timer.mark('sensors')
 
 # ================================
-#       Helper Functions
+#       WiFi and Telegram Uplink
 # ================================
-def connect_to_wifi():
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
-    wlan.connect(WIFI_SSID, WIFI_PASSWORD)
-    while not wlan.isconnected():
-        print("Connecting to WiFi...")
-        time.sleep(1)
-    print("Connected to WiFi")
+wifi = WifiManager(WIFI_SSID, WIFI_PASSWORD, WIFI_STATIC_IP, WIFI_TIMEOUT_MS)  # Cached BSSID, backoff
+telegram = uplink.TelegramClient(TELEGRAM_TOKEN, timeout=UPLINK_TIMEOUT_S)  # One connection, shared by every chat
+renderer = Renderer(CHAT_ID)  # One sendMessage body buffer, shared by every chat
+profiler = Profiler(PROFILE)  # Stage decorators are no-ops unless PROFILE is set
+tracer = Tracer(TRACE)  # Spans are created once and record into fixed histograms
+dht_span = tracer.span('dht')
+bmp_span = tracer.span('bmp')
+lcd_span = tracer.span('lcd')
+send_span = tracer.span('send')
 
+# ================================
+#       Helper Functions
+# ================================
+@profiler.stage('read')
+@tracer.traced('read')
 def read_sensors():
     # Read DHT11
-    dht_sensor.measure()
+    with dht_span:
+        dht_sensor.measure()
     temperature = dht_sensor.temperature()
     humidity = dht_sensor.humidity()
-    
+
     # Read BMP280
-    pressure = bmp_sensor.pressure
-    altitude = bmp_sensor.altitude()
-    
-    # Read rain sensor and LDR
-    rain = "Yes" if rain_sensor.value() == 0 else "No"
-    light_value = "🌙 Dark" if ldr.value() == 1 else "☀️ Light"
-    
-    # Determine air quality based on MQ-135 reading:
-    air_quality = "Bad" if mq135.value() == 0 else "Good"
-    
-    # (Optional) Debug: print the raw MQ-135 value
-    print("MQ-135 raw value:", mq135.value())
-    
-    return temperature, humidity, pressure, altitude, light_value, rain, air_quality
-
-def update_lcd(temp, hum, pres, alt, light, rain, air_quality):
-    # Display 1: Project Name
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("IoT Weather")
-    lcd.set_cursor(0, 1)
-    lcd.putstr("Monitoring Sys")
-    time.sleep(2)
-    
-    # Display 2: Temperature
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Temperature:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr("{:.1f} C".format(temp))
-    time.sleep(2)
-    
-    # Display 3: Humidity
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Humidity:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr("{:.1f} %".format(hum))
-    time.sleep(2)
-    
-    # Display 4: Pressure
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Pressure:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr("{:.0f} hPa".format(pres))
-    time.sleep(2)
-    
-    # Display 5: Altitude
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Altitude:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr("{:.1f} m".format(alt))
-    time.sleep(2)
-    
-    # Display 6: Rain
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Rain:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr(rain)
-    time.sleep(2)
-    
-    # Display 7: Light Status
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Light Status:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr(light)
-    time.sleep(2)
-    
-    # Display 8: Air Quality
-    lcd.clear()
-    lcd.set_cursor(0, 0)
-    lcd.putstr("Air Quality:")
-    lcd.set_cursor(0, 1)
-    lcd.putstr(air_quality)
-    time.sleep(2)
-    
-    lcd.clear()
-
-def check_memory():
-    gc.collect()
-    print('Free memory:', gc.mem_free(), 'bytes')
+    with bmp_span:
+        bmp = bmp_sensor.read_all()  # One burst read for temperature, pressure and altitude
+
+    # Rain sensor and LDR, and the MQ-135 (digital output low, or analog over the threshold: bad air)
+    air_bad = mq135.read() >= MQ135_THRESHOLD if MQ135_ANALOG else mq135.value() == 0
+    return Sample(temperature, humidity, bmp.pressure, bmp.altitude,
+                  dark=ldr.value() == 1, rain=rain_sensor.value() == 0, air_bad=air_bad)
+
+def open_lcd(init=True):
+    # init=False skips the HD44780 power-on sequence, for an LCD that is already set up
+    global lcd
+    if lcd is None:
+        lcd = I2cLcd(I2C(0, scl=Pin(26), sda=Pin(27)), LCD_I2C_ADDR, 2, 16, fast=True,  # Batched transfers
+                     init=init)
+    return lcd
+
+@profiler.stage('lcd')
+def show_screen(line1, line2):
+    # Compose the screen in the LCD framebuffer and send only changed cells
+    with lcd_span:
+        lcd.clear_frame()
+        lcd.write(0, 0, line1)
+        lcd.write(1, 0, line2)
+        lcd.flush()
+
+# LCD pages: (title, value from the latest Sample, dwell seconds)
+PAGES = (
+    ("IoT Weather", lambda s: "Monitoring Sys", 2),
+    ("Temperature:", lambda s: "{:.1f} C".format(s.temperature), 2),
+    ("Humidity:", lambda s: "{:.1f} %".format(s.humidity), 2),
+    ("Pressure:", lambda s: "{:.0f} hPa".format(s.pressure), 2),
+    ("Altitude:", lambda s: "{:.1f} m".format(s.altitude), 2),
+    ("Rain:", lambda s: "Yes" if s.rain else "No", 2),
+    ("Light Status:", lambda s: "Dark" if s.dark else "Light", 2),  # The LCD has no emoji glyphs
+    ("Air Quality:", lambda s: "Bad" if s.air_bad else "Good", 2),
+)
 
+@profiler.stage('send')
 def send_telegram_message(message):
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    data = {
-        'chat_id': CHAT_ID,
-        'text': message,
-        'parse_mode': 'HTML',
-        'disable_web_page_preview': True
-    }
     try:
-        check_memory()
-        response = urequests.post(url, json=data)
-        print("Response code:", response.status_code)
-        print("Response text:", response.text)
+        with send_span:
+            status, body = telegram.post('sendMessage', message)
+        print("Response code:", status)
+        print("Response text:", body)
+        print("Uplink:", telegram.stats)
+        return status == 200
     except Exception as e:
         print("An error occurred:", e)
+    return False
+
+def spread(field):
+    # " (min–max, σ stddev)" over the report window; nothing for a single reading
+    return When(lambda sample: sample.window and getattr(sample.window, field),
+                " (", Fixed(lambda stats: stats.min, 1), "–", Fixed(lambda stats: stats.max, 1),
+                ", σ ", Fixed(lambda stats: stats.stddev, 1), ")")
+
+def summary(field, decimals):
+    # "mean (min–max)" of one field of a WindowStats
+    return When(lambda stats: getattr(stats, field),
+                Fixed(lambda s: s.mean, decimals), " (", Fixed(lambda s: s.min, decimals),
+                "–", Fixed(lambda s: s.max, decimals), ")")
+
+# Literals are encoded once; the renderer writes fields straight into the request body
+MESSAGE = Template(
+    "🌤Weather Station\n"
+    "------------------------------\n"
+    "🌡Temperature: ", Fixed(lambda s: s.temperature, 1), " °C", spread('temperature'),
+    "\n💧Humidity: ", Fixed(lambda s: s.humidity, 0), " %", spread('humidity'),
+    "\n📏Pressure: ", Fixed(lambda s: s.pressure, 2), " hPa", spread('pressure'),
+    "\n🏔Altitude: ", Fixed(lambda s: s.altitude, 2), " m"
+    "\n💡Light Status: ", Choice(lambda s: s.dark, "🌙 Dark", "☀️ Light"),
+    "\n🌧Rain Detected: ", Choice(lambda s: s.rain, "☔️ Yes", "🌞 No"),
+    "\n🌱Air Quality: ", Choice(lambda s: s.air_bad, "🚫 Bad", "😊 Good"),
+    "\n------------------------------\n"
+    "Have a great day! 😊",
+    When(lambda s: TRACE_IN_MESSAGE, "\n\n⏱ Latency\n", Text(lambda on: tracer.report())))
+
+# Several queued readings in one message, oldest first
+BATCH = Template(
+    "🌤Weather Station (", Fixed(len), " readings)\n"
+    "------------------------------\n",
+    Each(lambda samples: samples,
+         "🌡", Fixed(lambda s: s.temperature, 1), "°C 💧", Fixed(lambda s: s.humidity, 0),
+         "% 📏", Fixed(lambda s: s.pressure, 2), "hPa 🌧", Choice(lambda s: s.rain, "Yes", "No"),
+         " 🌱", Choice(lambda s: s.air_bad, "Bad", "Good"), "\n"),
+    "------------------------------")
+
+# Command replies: /stats over every sample since boot, and the command list
+STATS = Template(
+    "📊Since boot (", Fixed(lambda w: w.count), " samples)\n"
+    "------------------------------\n"
+    "🌡Temperature: ", summary('temperature', 1), " °C"
+    "\n💧Humidity: ", summary('humidity', 0), " %"
+    "\n📏Pressure: ", summary('pressure', 2), " hPa"
+    "\n🌧Rain: ", Fixed(lambda w: 100 * w.rain / w.count), " % of samples"
+    "\n🌱Bad air: ", Fixed(lambda w: 100 * w.air_bad / w.count), " % of samples"
+    "\n------------------------------")
+
+HELP = Template(
+    "🌤Weather Station commands\n"
+    "/now – the latest reading\n"
+    "/stats – minimum, mean and maximum since boot\n"
+    "/history – recent readings, oldest first")
+
+@profiler.stage('render')
+def format_message(sample, chat_id=None):
+    return renderer.render(MESSAGE, sample, chat_id)  # Valid until the next render
+
+@profiler.stage('render')
+def format_batch(samples, chat_id=None):
+    return renderer.render(BATCH, samples, chat_id)
+
+# ================================
+#             Sinks
+# ================================
+def telegram_outbox(chat_id):
+    # One chat's reports: its own queue and flash backlog, the shared connection and buffer
+    backlog = RingLog(BACKLOG_PATH.format(chat_id), RECORD_FMT, BACKLOG_RECORDS,
+                      encode=Sample.to_record, decode=Sample.from_record)
+    return Outbox(send_telegram_message, lambda s: format_message(s, chat_id),
+                  lambda samples: format_batch(samples, chat_id), spill=backlog)
+
+async def display_task(store):
+    # Rotate through the pages, always rendering the newest cached reading. Each page
+    # has its own dwell, so this is a coroutine of its own rather than a periodic route
+    open_lcd()
+    while True:
+        for title, value, dwell in PAGES:
+            show_screen(title, value(store.value))
+            await asyncio.sleep(dwell)
+
+def log_line(sample):
+    print("Reading: {:.1f} C, {:.0f} %, {:.2f} hPa, {:.1f} m, {}, rain {}, air {}".format(
+        sample.temperature, sample.humidity, sample.pressure, sample.altitude,
+        "dark" if sample.dark else "light", "yes" if sample.rain else "no",
+        "bad" if sample.air_bad else "good"))
+
+def file_log(path):
+    # Records collect in RAM and go to flash a block at a time; flush_logs() writes the rest
+    log = RingLog(path, RECORD_FMT, LOG_RECORDS, encode=Sample.to_record, decode=Sample.from_record)
+    file_logs.append(log)
+    return log.append
+
+def flush_logs():
+    for log in file_logs:
+        log.flush()
+
+def open_sink(kind, target):
+    # (callable taking a Sample, its Outbox for a Telegram sink or None) for one SINKS line;
+    # the 'lcd' line is display_task() instead
+    if kind == 'telegram':
+        outbox = telegram_outbox(target)
+        return outbox.put, outbox
+    if kind == 'serial':
+        return log_line, None
+    if kind == 'file':
+        return file_log(target), None
+    raise ValueError("Unknown sink: " + kind)
+
+def chats():
+    return tuple(str(target) for kind, target, _ in SINKS if kind == 'telegram')
+
+def build_commands(latest, totals, history, hold):
+    # Replies from what the station already keeps; no command reads a sensor
+    handlers = {
+        'now': lambda chat_id: renderer.render(MESSAGE, latest.value, chat_id),
+        'stats': lambda chat_id: renderer.render(STATS, totals, chat_id),
+        'history': lambda chat_id: renderer.render(BATCH, history.items() or [latest.value], chat_id),
+        'help': lambda chat_id: renderer.render(HELP, None, chat_id),
+    }
+    handlers['start'] = handlers['help']
+    return CommandPoller(telegram, handlers, chats=chats(), timeout_s=COMMAND_TIMEOUT_S,
+                         offset_path=OFFSET_PATH, username=BOT_USERNAME, hold=hold)
+
+# ================================
+#             Tasks
+# ================================
+def build_runtime():
+    rt = runtime.Runtime()
+    fanout = Fanout(rt.latest)  # Every reading goes to every sink's window
+    outboxes = []
+    for kind, target, period_ms in SINKS:
+        if kind == 'lcd':
+            rt.spawn(display_task(rt.latest))  # Pages turn at their own dwell
+            continue
+        sink, outbox = open_sink(kind, target)
+        changes = None
+        if outbox is not None:
+            outbox.max_sends = 1  # A send blocks the loop; one per turn of the 'telegram' task
+            outboxes.append(outbox)
+            changes = ChangeFilter(heartbeat_s=HEARTBEAT_INTERVAL_S)  # Per chat
+        fanout.route(kind if target is None else '{} {}'.format(kind, target), sink, period_ms,
+                     changes=changes)
+    totals = WindowStats()  # Every sample since boot, for /stats
+    history = History(HISTORY_SIZE)  # One summary per HISTORY_INTERVAL_MS, for /history
+    commands = COMMANDS and outboxes
+    if commands:
+        fanout.route('history', history.add, HISTORY_INTERVAL_MS)
+
+    def take_sample():
+        reading = read_sensors()
+        fanout.add(reading)
+        totals.add(reading)
+
+    take_sample()  # Tasks start with a reading to show
+    boot_timer.mark('first sample')
+    print("Boot:", boot_timer)
+    runtime.housekeeping()  # Collect once and set the GC threshold before the tasks start
+
+    rt.every('sample', SAMPLE_INTERVAL_MS, take_sample, SAMPLE_INTERVAL_MS)
+    fanout.schedule(rt)
+    if outboxes:  # Only Telegram sinks need the network
+
+        turn = 0
+
+        def pump():
+            # The next outbox with a report due, so a turn blocks for one request at most
+            nonlocal turn
+            for _ in range(len(outboxes)):
+                outbox = outboxes[turn]
+                turn = (turn + 1) % len(outboxes)
+                if outbox.due():
+                    outbox.pump()
+                    return
+
+        def reports_due():
+            for outbox in outboxes:
+                if outbox.due():
+                    return True
+            return False
+
+        # Sends wait for the command long poll instead of abandoning it (and the connection)
+        rt.every('telegram', OUTBOX_INTERVAL_MS, lambda: wifi.up and not telegram.in_flight and pump())
+        rt.every('wifi', WIFI_WATCH_INTERVAL_MS, tracer.traced('wifi', wifi.poll))
+    if commands:
+        poller = build_commands(rt.latest, totals, history, reports_due)
+        rt.every('commands', COMMAND_POLL_INTERVAL_MS, lambda: wifi.up and poller.poll())
+    if file_logs:
+        rt.every('flush', LOG_FLUSH_INTERVAL_MS, flush_logs, LOG_FLUSH_INTERVAL_MS)
+    rt.every('housekeeping', HOUSEKEEPING_INTERVAL_MS, runtime.housekeeping, HOUSEKEEPING_INTERVAL_MS)
+    if PROFILE:
+        rt.every('profile', PROFILE_INTERVAL_MS, lambda: print("Profile:\n" + profiler.report()),
+                 PROFILE_INTERVAL_MS)
+    return rt
 
 # ================================
 #              Main
 # ================================
+def duty_cycle():
+    # Battery mode: one sample per wake, state carried in RTC memory between wakes. All
+    # sinks share one report window, closed at the shortest period among them (not the LCD)
+    periods = [period_ms for kind, _, period_ms in SINKS if kind != 'lcd']
+    report_ms = min(periods) if periods else HEARTBEAT_INTERVAL_S * 1000
+    cycle = DutyCycle(machine.RTC(), DEEP_SLEEP_MS, max(1, report_ms // DEEP_SLEEP_MS),
+                      ChangeFilter(heartbeat_s=HEARTBEAT_INTERVAL_S), WAKE_BUDGET_MS, REPORT_BUDGET_MS,
+                      timer=boot_timer)
+    state = cycle.state
+    summary = cycle.add(read_sensors())
+    cycle.timer.mark('sample')
+
+    # Only report wakes touch flash or the radio; the backlogs are retried then too
+    if summary is not None or (cycle.reporting and state.backlog):
+        outboxes = []
+        for kind, target, _ in SINKS:
+            if kind == 'lcd':
+                continue
+            sink, outbox = open_sink(kind, target)
+            if summary is not None:
+                sink(summary)
+            if outbox is not None:
+                outboxes.append(outbox)
+        flush_logs()  # RAM does not survive deep sleep
+        if outboxes:
+            if state.bssid is not None:
+                wifi.bssid, wifi.channel = state.bssid, state.channel
+            with tracer.span('wifi'):
+                # A cold join takes about 4.4 s; a missing AP must not overrun the budget
+                online = wifi.connect(min(WIFI_TIMEOUT_MS, REPORT_BUDGET_MS - REPORT_SEND_MS))
+            backlog = 0
+            for outbox in outboxes:
+                if online:
+                    outbox.pump()
+                outbox.spill_pending()  # RAM does not survive deep sleep
+                backlog += outbox.spill.pending
+            state.backlog = backlog
+            state.bssid, state.channel = wifi.bssid, wifi.channel
+        cycle.timer.mark('uplink')
+    for kind, _, _ in SINKS:
+        if kind == 'lcd':
+            # Nothing to show while asleep. The LCD stays powered through deep sleep, so
+            # only the first boot needs the init sequence; a wake writes one PCF8574 byte
+            open_lcd(init=machine.reset_cause() != machine.DEEPSLEEP_RESET).backlight_off()
+            break
+    if PROFILE:
+        print("Profile:\n" + profiler.report())
+    cycle.sleep(machine.deepsleep)
+
 def main():
-    connect_to_wifi()
-    lcd.clear()
-    lcd.putstr("Initializing...")
-    time.sleep(2)
-    
-    last_telegram_time = time.time()
-    
-    while True:
-        # Read all sensor values
-        temperature, humidity, pressure, altitude, light_value, rain, air_quality = read_sensors()
-        
-        # Update the LCD with a sequential display of each sensor reading.
-        # This cycle takes about 16 seconds (8 screens x 2 sec each) and repeats continuously.
-        update_lcd(temperature, humidity, pressure, altitude, light_value, rain, air_quality)
-        
-        # Check if it's time to send a Telegram message (every 60 seconds)
-        current_time = time.time()
-        if current_time - last_telegram_time >= 60:
-            message = (
-                f"🌤Weather Station\n"
-                f"------------------------------\n"
-                f"🌡Temperature: {temperature} °C\n"
-                f"💧Humidity: {humidity} %\n"
-                f"📏Pressure: {pressure:.2f} hPa\n"
-                f"🏔Altitude: {altitude:.2f} m\n"
-                f"💡Light Status: {light_value}\n"
-                f"🌧Rain Detected: {'☔️ Yes' if rain=='Yes' else '🌞 No'}\n"
-                f"🌱Air Quality: {'😊 Good' if air_quality=='Good' else '🚫 Bad'}\n"
-                f"------------------------------\n"
-                f"Have a great day! 😊"
-            )
-            send_telegram_message(message)
-            last_telegram_time = current_time
+    if DEEP_SLEEP_MS:
+        duty_cycle()  # Does not return
+    build_runtime().run()  # The 'wifi' task joins in the background
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,136 @@
+"""Streaming statistics over a reporting window of fast samples.
+
+Sampling runs faster than reporting; every sample updates running
+min/max/mean/variance (Welford's method) and the on/off counts in O(1) time,
+and closing the window turns them into one report. Memory use is the same
+for a window of 3 samples or 3000, since no sample is kept. A History keeps
+the last few window summaries, e.g. to answer a /history command.
+"""
+from math import sqrt
+
+from sample import Sample
+
+
+class RunningStats:
+    """Count, min, max, last, mean and variance of a stream of numbers."""
+    __slots__ = ('count', 'min', 'max', 'last', 'mean', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.min = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+
+    def add(self, x):
+        self.count += 1
+        if self.count == 1:
+            self.min = self.max = x
+        elif x < self.min:
+            self.min = x
+        elif x > self.max:
+            self.max = x
+        self.last = x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def snapshot(self):
+        """(count, min, max, last, mean, m2), e.g. to keep across deep sleep."""
+        return self.count, self.min, self.max, self.last, self.mean, self._m2
+
+    def restore(self, snapshot):
+        self.count, self.min, self.max, self.last, self.mean, self._m2 = snapshot
+
+    @property
+    def variance(self):
+        """Sample variance; 0 until there are two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return sqrt(self.variance)
+
+
+class WindowStats:
+    """Per-field RunningStats and flag counts of one window."""
+
+    def __init__(self):
+        self.count = 0
+        self.temperature = RunningStats()
+        self.humidity = RunningStats()
+        self.pressure = RunningStats()
+        self.altitude = RunningStats()
+        self.dark = 0     # Samples with the flag set
+        self.rain = 0
+        self.air_bad = 0
+
+    def add(self, sample):
+        self.count += 1
+        self.temperature.add(sample.temperature)
+        self.humidity.add(sample.humidity)
+        self.pressure.add(sample.pressure)
+        self.altitude.add(sample.altitude)
+        if sample.dark:
+            self.dark += 1
+        if sample.rain:
+            self.rain += 1
+        if sample.air_bad:
+            self.air_bad += 1
+
+
+class SampleWindow:
+    def __init__(self):
+        self.stats = WindowStats()
+        self.last = None  # Newest sample, for the report timestamp and light
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    def add(self, sample):
+        self.stats.add(sample)
+        self.last = sample
+
+    def close(self):
+        """Summarise the window as one Sample and start a new window.
+
+        Numbers are window means. rain and air_bad are set when more than
+        half the samples had them, so a single MQ-135 spike or a splash on
+        the rain sensor is not reported; dark follows the newest sample.
+        Returns None if no sample was added.
+        """
+        stats = self.stats
+        if not stats.count:
+            return None
+        half = stats.count // 2
+        last = self.last
+        report = Sample(stats.temperature.mean, stats.humidity.mean, stats.pressure.mean,
+                        stats.altitude.mean, last.dark, stats.rain > half, stats.air_bad > half,
+                        last.timestamp)
+        report.window = stats
+        self.stats = WindowStats()
+        self.last = None
+        return report
+
+
+class History:
+    """The last `size` samples (e.g. window summaries) in a fixed ring."""
+
+    def __init__(self, size=12):
+        self._slots = [None] * size
+        self._next = 0
+        self.count = 0
+
+    def add(self, sample):
+        self._slots[self._next] = sample
+        self._next = (self._next + 1) % len(self._slots)
+        if self.count < len(self._slots):
+            self.count += 1
+
+    def items(self):
+        """The kept samples, oldest first."""
+        size = len(self._slots)
+        start = self._next - self.count
+        return [self._slots[(start + i) % size] for i in range(self.count)]
@@ -1,21 +1,87 @@
 import struct
 import time
+from array import array
+
+# Compensation backends (datasheet section 8.1 and 8.2)
+COMP_INT64 = 0  # 64-bit integer reference, exact but uses bigints on MicroPython
+COMP_INT32 = 1  # 32-bit integer routine, no 48-bit intermediates, 1 Pa resolution
+COMP_FLOAT = 2  # Double-precision floating point routine
+
+# Power modes (ctrl_meas bits 1:0)
+MODE_SLEEP = 0
+MODE_FORCED = 1
+MODE_NORMAL = 3
+
+# Altitude modes
+ALT_EXACT = 0  # Barometric formula with pow() on every call
+ALT_TABLE = 1  # Linear interpolation in a table built once per sea-level pressure
+
+ALT_EXPONENT = 1 / 5.255
+ALT_TABLE_MIN = 300   # hPa, lower end of the sensor's range
+ALT_TABLE_MAX = 1100  # hPa, upper end of the sensor's range
+ALT_TABLE_STEP = 5    # hPa between table entries, max interpolation error < 0.2 m
+
+# Measurement profiles: (osrs_t, osrs_p, mode, t_sb, filter) register codes.
+# Oversampling codes 1..5 mean x1..x16, filter codes 0..4 mean off..16 and
+# t_sb codes 0..7 mean 0.5, 62.5, 125, 250, 500, 1000, 2000, 4000 ms.
+PROFILES = {
+    'default': (1, 1, MODE_NORMAL, 5, 0),            # Original 0xF4=0x27, 0xF5=0xA0
+    'weather': (1, 1, MODE_FORCED, 0, 0),            # Weather monitoring, one conversion per read
+    'indoor_navigation': (2, 5, MODE_NORMAL, 0, 4),  # x2 / x16, IIR 16, 0.5 ms standby
+    'low_power': (2, 5, MODE_NORMAL, 1, 2),          # Handheld low-power, IIR 4, 62.5 ms standby
+}
+
+class BMP280Sample:
+    """Compensated temperature, pressure and altitude from one burst read."""
+    __slots__ = ('temperature', 'pressure', 'altitude')
+
+    def __init__(self):
+        self.temperature = 0.0
+        self.pressure = 0.0
+        self.altitude = 0.0
 
 class BMP280:
-    def __init__(self, i2c, addr=0x76):
+    def __init__(self, i2c, addr=0x76, no_alloc=False, compensation=COMP_INT64, profile='default',
+                 sea_level_pressure=1013.25, altitude_mode=ALT_EXACT):
         self.i2c = i2c
         self.addr = addr
         self.t_fine = 0
+        self.sample = BMP280Sample()  # Last reading taken by read_all()
+        # With no_alloc, bus reads of up to 6 bytes go through preallocated
+        # buffers, so a steady-state read_all() loop does not touch the heap.
+        self.no_alloc = no_alloc
+        self._rbuf = bytearray(6)
+        self._views = [memoryview(self._rbuf)[:n] for n in range(7)]
+        self._wbuf = bytearray(1)
+        # Pick the compensation backend once instead of branching per sample.
+        if compensation == COMP_INT32:
+            self._compensate_pressure = self._compensate_pressure_int32
+        elif compensation == COMP_FLOAT:
+            self._compensate_temperature = self._compensate_temperature_float
+            self._compensate_pressure = self._compensate_pressure_float
+        elif compensation != COMP_INT64:
+            raise ValueError("Unknown compensation backend")
+        self.altitude_mode = altitude_mode
+        self._altitude_table = None
+        self.set_sea_level_pressure(sea_level_pressure)
         self._read_calibration_data()
-        self._configure_sensor()
+        self.set_profile(profile)
 
     def _read_register(self, register, length=1):
         """Read bytes from a specific register."""
+        if self.no_alloc and length <= 6:
+            view = self._views[length]
+            self.i2c.readfrom_mem_into(self.addr, register, view)
+            return view
         return self.i2c.readfrom_mem(self.addr, register, length)
 
     def _write_register(self, register, value):
         """Write a byte to a specific register."""
-        self.i2c.writeto_mem(self.addr, register, bytes([value]))
+        if self.no_alloc:
+            self._wbuf[0] = value
+            self.i2c.writeto_mem(self.addr, register, self._wbuf)
+        else:
+            self.i2c.writeto_mem(self.addr, register, bytes([value]))
 
     def _read_calibration_data(self):
         """Read and parse calibration data from the sensor."""
@@ -23,10 +89,43 @@ class BMP280:
         self.dig_T1, self.dig_T2, self.dig_T3 = struct.unpack('<Hhh', calib[0:6])
         self.dig_P1, self.dig_P2, self.dig_P3, self.dig_P4, self.dig_P5, self.dig_P6, self.dig_P7, self.dig_P8, self.dig_P9 = struct.unpack('<Hhhhhhhhh', calib[6:24])
 
-    def _configure_sensor(self):
-        """Set up the sensor in normal mode with standard settings."""
-        self._write_register(0xF4, 0x27)  # Normal mode, temp and pressure oversampling x1
-        self._write_register(0xF5, 0xA0)  # Standby time 1000ms, filter coefficient x4
+    def set_profile(self, name):
+        """Apply a measurement profile from PROFILES.
+
+        Also computes the datasheet's maximum measurement time for the
+        profile's oversampling settings, used when waiting on a forced read.
+        """
+        osrs_t, osrs_p, mode, t_sb, iir = PROFILES[name]
+        self.profile = name
+        self.mode = mode
+        self._ctrl_meas = (osrs_t << 5) | (osrs_p << 2)
+        # t_measure,max = 1.25 + 2.3 * T_os + (2.3 * P_os + 0.575) ms
+        self.measurement_time_us = 1250 + 2300 * (1 << osrs_t >> 1)
+        if osrs_p:
+            self.measurement_time_us += 2300 * (1 << osrs_p >> 1) + 575
+        self._write_register(0xF4, self._ctrl_meas)  # Sleep mode, config is only written while asleep
+        self._write_register(0xF5, (t_sb << 5) | (iir << 2))
+        if mode != MODE_FORCED:
+            self._write_register(0xF4, self._ctrl_meas | mode)
+
+    def trigger(self):
+        """Start a single forced-mode conversion."""
+        self._write_register(0xF4, self._ctrl_meas | MODE_FORCED)
+
+    def wait_ready(self):
+        """Wait the profile's max measurement time, then poll the status register."""
+        time.sleep_us(self.measurement_time_us)
+        for _ in range(20):
+            if not self._read_register(0xF3)[0] & 0x08:  # Bit 3: measuring
+                return
+            time.sleep_us(100)
+        raise OSError("BMP280 measurement timed out")
+
+    def _measure(self):
+        """In forced mode, run one conversion so the data registers are fresh."""
+        if self.mode == MODE_FORCED:
+            self.trigger()
+            self.wait_ready()
 
     def _compensate_temperature(self, adc_T):
         """Compensate raw temperature data."""
@@ -53,8 +152,54 @@ class BMP280:
         pressure = ((pressure + var1 + var2) >> 8) + (self.dig_P7 << 4)
         return pressure / 25600
 
+    def _compensate_temperature_float(self, adc_T):
+        """Compensate raw temperature data with the floating point routine."""
+        var1 = (adc_T / 16384.0 - self.dig_T1 / 1024.0) * self.dig_T2
+        var2 = adc_T / 131072.0 - self.dig_T1 / 8192.0
+        var2 = var2 * var2 * self.dig_T3
+        self.t_fine = int(var1 + var2)
+        return (var1 + var2) / 5120.0
+
+    def _compensate_pressure_int32(self, adc_P):
+        """Compensate raw pressure data with the 32-bit integer routine."""
+        var1 = (self.t_fine >> 1) - 64000
+        var2 = (((var1 >> 2) * (var1 >> 2)) >> 11) * self.dig_P6
+        var2 += (var1 * self.dig_P5) << 1
+        var2 = (var2 >> 2) + (self.dig_P4 << 16)
+        var1 = (((self.dig_P3 * (((var1 >> 2) * (var1 >> 2)) >> 13)) >> 3) + ((self.dig_P2 * var1) >> 1)) >> 18
+        var1 = ((32768 + var1) * self.dig_P1) >> 15
+        if var1 == 0:
+            return 0  # Avoid division by zero
+        pressure = ((1048576 - adc_P) - (var2 >> 12)) * 3125
+        if pressure < 0x80000000:
+            pressure = (pressure << 1) // var1
+        else:
+            pressure = (pressure // var1) * 2
+        var1 = (self.dig_P9 * (((pressure >> 3) * (pressure >> 3)) >> 13)) >> 12
+        var2 = ((pressure >> 2) * self.dig_P8) >> 13
+        pressure += (var1 + var2 + self.dig_P7) >> 4
+        return pressure / 100
+
+    def _compensate_pressure_float(self, adc_P):
+        """Compensate raw pressure data with the floating point routine."""
+        var1 = self.t_fine / 2.0 - 64000.0
+        var2 = var1 * var1 * self.dig_P6 / 32768.0
+        var2 += var1 * self.dig_P5 * 2.0
+        var2 = var2 / 4.0 + self.dig_P4 * 65536.0
+        var1 = (self.dig_P3 * var1 * var1 / 524288.0 + self.dig_P2 * var1) / 524288.0
+        var1 = (1.0 + var1 / 32768.0) * self.dig_P1
+        if var1 == 0:
+            return 0  # Avoid division by zero
+        pressure = 1048576.0 - adc_P
+        pressure = (pressure - var2 / 4096.0) * 6250.0 / var1
+        var1 = self.dig_P9 * pressure * pressure / 2147483648.0
+        var2 = pressure * self.dig_P8 / 32768.0
+        pressure += (var1 + var2 + self.dig_P7) / 16.0
+        return pressure / 100
+
     def _read_raw_data(self):
         """Read raw temperature and pressure data from the sensor."""
+        self._measure()
         raw = self._read_register(0xF7, 6)
         adc_P = (raw[0] << 16 | raw[1] << 8 | raw[2]) >> 4
         adc_T = (raw[3] << 16 | raw[4] << 8 | raw[5]) >> 4
@@ -69,10 +214,61 @@ class BMP280:
     @property
     def pressure(self):
         """Get the compensated pressure in hPa."""
-        _, adc_P = self._read_raw_data()
+        adc_T, adc_P = self._read_raw_data()
+        self._compensate_temperature(adc_T)  # Refresh t_fine for this sample
         return self._compensate_pressure(adc_P)
 
-    def altitude(self, sea_level_pressure=1013.25):
-        """Calculate altitude based on pressure and sea level pressure."""
-        pressure = self.pressure  # in hPa
-        return 44330 * (1.0 - (pressure / sea_level_pressure) ** (1 / 5.255))
+    def set_sea_level_pressure(self, sea_level_pressure):
+        """Set the sea-level reference pressure in hPa used for altitude."""
+        self.sea_level_pressure = sea_level_pressure
+        self._inv_sea_level = 1 / sea_level_pressure
+        if self.altitude_mode == ALT_TABLE:
+            self._build_altitude_table()
+
+    def _build_altitude_table(self):
+        """Precompute altitudes over 300..1100 hPa for the current reference."""
+        count = (ALT_TABLE_MAX - ALT_TABLE_MIN) // ALT_TABLE_STEP + 1
+        table = self._altitude_table
+        if table is None:
+            table = array('f', [0.0] * count)
+        for i in range(count):
+            pressure = ALT_TABLE_MIN + i * ALT_TABLE_STEP
+            table[i] = 44330 * (1.0 - (pressure * self._inv_sea_level) ** ALT_EXPONENT)
+        self._altitude_table = table
+
+    def altitude_from_pressure(self, pressure):
+        """Calculate altitude in m from a pressure in hPa, without a bus access."""
+        if self.altitude_mode == ALT_TABLE and ALT_TABLE_MIN <= pressure < ALT_TABLE_MAX:
+            pos = (pressure - ALT_TABLE_MIN) / ALT_TABLE_STEP
+            i = int(pos)
+            lower = self._altitude_table[i]
+            return lower + (self._altitude_table[i + 1] - lower) * (pos - i)
+        return 44330 * (1.0 - (pressure * self._inv_sea_level) ** ALT_EXPONENT)
+
+    def altitude(self, sea_level_pressure=None):
+        """Calculate altitude based on pressure and sea level pressure.
+
+        A sea_level_pressure given here applies to this call only; use
+        set_sea_level_pressure() to change the reference.
+        """
+        pressure = self.pressure
+        if sea_level_pressure is None or sea_level_pressure == self.sea_level_pressure:
+            return self.altitude_from_pressure(pressure)
+        return 44330 * (1.0 - (pressure / sea_level_pressure) ** ALT_EXPONENT)
+
+    def read_all(self):
+        """Read temperature, pressure and altitude with a single burst read.
+
+        Temperature is compensated first so pressure uses a fresh t_fine.
+        The result is stored in ``self.sample``, which is updated in place and
+        returned; it keeps the last reading available without touching the bus.
+        """
+        self._measure()
+        raw = self._read_register(0xF7, 6)  # Decoded inline to avoid a tuple
+        adc_P = (raw[0] << 16 | raw[1] << 8 | raw[2]) >> 4
+        adc_T = (raw[3] << 16 | raw[4] << 8 | raw[5]) >> 4
+        sample = self.sample
+        sample.temperature = self._compensate_temperature(adc_T)
+        sample.pressure = self._compensate_pressure(adc_P)
+        sample.altitude = self.altitude_from_pressure(sample.pressure)
+        return sample
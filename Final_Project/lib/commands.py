@@ -0,0 +1,180 @@
+"""Bot commands (/now, /stats, ...) read with long-polled getUpdates.
+
+The Bot API holds a getUpdates request with a timeout open until a message
+arrives or the timeout ends, so commands are answered within moments while
+the station makes one request per timeout when nobody writes. The request
+is left in flight on the shared TelegramClient and poll(), run as a fast
+task, only checks the socket without blocking, so sampling never waits for
+the long poll. Replies are built by handlers from data the station already
+keeps (the latest sample, window statistics); a command never reads a
+sensor.
+
+A send on the client while a poll is in flight would abandon the poll and
+cost a reconnect, so the two take turns: hold() tells the poller not to
+start the next poll while reports are due, and the report task leaves the
+client alone while client.in_flight. A report waits at most one poll.
+
+The offset of the next update is kept in a small flash file, so commands
+answered before a reset are not answered again after it. It is written
+only when updates arrived.
+
+    handlers = {'now': lambda chat_id: ...}
+    commands = CommandPoller(telegram, handlers, chats=(CHAT_ID,), hold=outbox.due)
+    rt.every('commands', 250, lambda: wifi.up and commands.poll())
+    rt.every('telegram', 1000, lambda: wifi.up and not telegram.in_flight and outbox.pump())
+"""
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+from runtime import ticks_ms, ticks_add, ticks_diff
+
+OFFSET_PATH = 'offset.dat'
+GRACE_S = 10  # Beyond the poll timeout before an unanswered poll counts as lost
+
+
+def load_offset(path):
+    """The stored update offset, or 0 if there is none."""
+    try:
+        with open(path) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return 0
+
+
+def command_name(text, username=None):
+    """'now' for '/now', '/Now 5' or '/now@station_bot'; None if text is not
+    a command, or (with username) is addressed to another bot."""
+    if not text or text[0] != '/':
+        return None
+    word = text[1:].split(None, 1)[0] if len(text) > 1 else ''
+    name, _, bot = word.partition('@')
+    if bot and username is not None and bot.lower() != username.lower():
+        return None
+    return name.lower() or None
+
+
+class CommandPoller:
+    def __init__(self, client, handlers, chats=None, timeout_s=25, limit=10,
+                 offset_path=OFFSET_PATH, username=None, retry_ms=5000, max_retry_ms=300000,
+                 hold=None):
+        """
+        client is the uplink.TelegramClient; replies go out on the same
+        connection. handlers maps a command name (without the slash) to
+        handler(chat_id), which returns a sendMessage body for that chat.
+        chats, if given, are the only chat ids (as str) answered; commands
+        from anywhere else are skipped. timeout_s bounds how long the API
+        holds one poll and limit how many updates one poll returns.
+        username is the bot's, to skip '/cmd@other_bot' in groups.
+        Failed polls are retried after retry_ms, growing with each failure
+        in a row up to max_retry_ms; the first retry is immediate, since a
+        kept-alive connection the server closed fails only once.
+        hold, if given, is called before each new poll; while it returns
+        True no poll is started, leaving the client free for other sends.
+        """
+        self.client = client
+        self.handlers = handlers
+        self.chats = chats
+        self.timeout_s = timeout_s
+        self.limit = limit
+        self.offset_path = offset_path
+        self.username = username
+        self.retry_ms = retry_ms
+        self.max_retry_ms = max_retry_ms
+        self.hold = hold
+        self.offset = load_offset(offset_path)
+        self._failures = 0          # Consecutive failed polls
+        self._retry_at = ticks_ms()
+        self._deadline = 0          # ticks_ms() after which the poll is lost
+        # Counters
+        self.polls = 0      # Polls answered
+        self.answered = 0   # Commands replied to
+        self.ignored = 0    # Updates skipped: not a known command, or another chat
+        self.errors = 0     # Failed polls and replies
+
+    def _request(self):
+        return ('{{"offset":{},"timeout":{},"limit":{},"allowed_updates":["message"]}}'.format(
+            self.offset, self.timeout_s, self.limit)).encode()
+
+    def _failed(self):
+        self.errors += 1
+        self._failures += 1
+        delay = min(self.retry_ms * (self._failures - 1), self.max_retry_ms)
+        self._retry_at = ticks_add(ticks_ms(), delay)
+
+    def poll(self):
+        """Start, check or finish the long poll; never waits for the API.
+
+        Call it often (every few hundred ms) while the link is up; the
+        commands that arrived are answered in the call that sees them.
+        Returns the number of commands answered.
+        """
+        client = self.client
+        now = ticks_ms()
+        if not client.in_flight:  # Not started yet, finished, or abandoned by a send
+            if ticks_diff(now, self._retry_at) < 0 or (self.hold is not None and self.hold()):
+                return 0
+            try:
+                client.begin('getUpdates', self._request())
+            except OSError as e:
+                print("Command poll failed:", e)
+                self._failed()
+                return 0
+            self._deadline = ticks_add(now, (self.timeout_s + GRACE_S) * 1000)
+            return 0
+        if not client.ready():
+            if ticks_diff(now, self._deadline) >= 0:  # No answer, not even a reset
+                client.close()
+                self._failed()
+            return 0
+        try:
+            status, body = client.finish()
+        except OSError as e:
+            print("Command poll failed:", e)
+            self._failed()
+            return 0
+        if status != 200:
+            print("Command poll failed:", status)
+            self._failed()
+            return 0
+        self._failures = 0
+        self.polls += 1
+        return self.handle(json.loads(body)['result'])
+
+    def handle(self, updates):
+        """Answer the commands among updates and confirm them all; returns
+        the number answered."""
+        if not updates:
+            return 0
+        answered = 0
+        for update in updates:
+            self.offset = update['update_id'] + 1
+            message = update.get('message')
+            if message is None:
+                self.ignored += 1
+                continue
+            chat_id = message['chat']['id']
+            handler = self.handlers.get(command_name(message.get('text'), self.username))
+            if handler is None or (self.chats is not None and str(chat_id) not in self.chats):
+                self.ignored += 1
+                continue
+            try:
+                status, _ = self.client.post('sendMessage', handler(chat_id))
+            except OSError as e:
+                print("Command reply failed:", e)
+                status = None
+            if status == 200:
+                answered += 1
+            else:
+                self.errors += 1
+        self.answered += answered
+        self._save()
+        return answered
+
+    def _save(self):
+        try:
+            with open(self.offset_path, 'w') as f:
+                f.write(str(self.offset))
+        except OSError as e:
+            print("Could not save the update offset:", e)
@@ -0,0 +1,54 @@
+"""Report-by-exception: pass a reading on only when it changed meaningfully.
+
+Each numeric field has a deadband around the last *reported* value, so a
+slow drift is reported once it adds up instead of creeping past unnoticed.
+A flip of any watched on/off flag is always reported, and a heartbeat
+forces a report after heartbeat_s of silence so users can tell a quiet
+station from a dead one.
+"""
+
+
+class ChangeFilter:
+    def __init__(self, temperature=0.5, humidity=2, pressure=0.5,
+                 flags=('rain', 'air_bad'), heartbeat_s=1800):
+        """
+        temperature (degC), humidity (%RH) and pressure (hPa) are the
+        deadband half-widths; flags names the Sample booleans that report
+        on any change.
+        """
+        self.bands = (('temperature', temperature), ('humidity', humidity),
+                      ('pressure', pressure))
+        self.flags = flags
+        self.heartbeat_s = heartbeat_s
+        self.last = None     # Last Sample let through
+        self.reason = None   # Why the last one was let through
+        self.passed = 0
+        self.suppressed = 0
+
+    def _change(self, sample):
+        last = self.last
+        if last is None:
+            return 'first'
+        for name, band in self.bands:
+            if abs(getattr(sample, name) - getattr(last, name)) >= band:
+                return name
+        for name in self.flags:
+            if getattr(sample, name) != getattr(last, name):
+                return name
+        if sample.timestamp - last.timestamp >= self.heartbeat_s:
+            return 'heartbeat'
+        return None
+
+    def due(self, sample):
+        """True if sample should be reported; it then becomes the reference."""
+        reason = self._change(sample)
+        if reason is None:
+            self.suppressed += 1
+            return False
+        self.last = sample
+        self.reason = reason
+        self.passed += 1
+        return True
+
+    def __str__(self):
+        return "passed={} suppressed={}".format(self.passed, self.suppressed)
@@ -0,0 +1,126 @@
+"""Deep-sleep duty cycle: wake, sample, report when due, sleep again.
+
+Instead of staying awake with the radio on between reports, the station
+sleeps in machine.deepsleep() and every wake is a fresh boot. What has to
+survive a wake is kept in RTC memory (kept through deep sleep, lost on power
+loss): the report window statistics, the deadband reference, how many
+reports wait in the flash backlog and the Wi-Fi BSSID/channel cache.
+Reports themselves stay in the flash RingLog.
+
+Each wake is timed phase by phase against a budget; overruns are counted in
+RTC memory so they show up in later wakes' reports.
+"""
+import struct
+
+from aggregate import SampleWindow
+from phases import PhaseTimer
+from sample import Sample, RECORD_FMT
+
+MAGIC = b'WSD1'  # Bump when the layout changes, so old contents are ignored
+
+# magic, wakes, backlog, overruns, channel, bssid, has reference,
+# 4 x RunningStats snapshot, flag counts, newest window sample, reference
+_FIELDS = ('temperature', 'humidity', 'pressure', 'altitude')
+_FMT = '<4sIHHB6sB' + 'Hfffff' * len(_FIELDS) + 'HHH' + RECORD_FMT + RECORD_FMT
+_EMPTY = Sample(timestamp=0).to_record()
+
+
+class SleepState:
+    def __init__(self):
+        self.wakes = 0        # Wakes since the RTC memory was last valid
+        self.backlog = 0      # Reports waiting in the flash backlog
+        self.overruns = 0     # Wakes that went over their time budget
+        self.channel = 0      # Wi-Fi cache
+        self.bssid = None
+        self.window = SampleWindow()
+        self.reference = None  # Last reported Sample, for the deadbands
+
+    @classmethod
+    def load(cls, data):
+        """State from RTC memory contents, or a fresh one if they are not ours."""
+        state = cls()
+        if len(data) != struct.calcsize(_FMT) or data[:4] != MAGIC:
+            return state
+        values = struct.unpack(_FMT, data)
+        _, state.wakes, state.backlog, state.overruns, state.channel, bssid, has_reference = values[:7]
+        if state.channel:
+            state.bssid = bssid
+        stats = state.window.stats
+        i = 7
+        for name in _FIELDS:
+            getattr(stats, name).restore(values[i:i + 6])
+            i += 6
+        stats.count = stats.temperature.count
+        stats.dark, stats.rain, stats.air_bad = values[i:i + 3]
+        i += 3
+        record_len = len(_EMPTY)
+        if stats.count:
+            state.window.last = Sample.from_record(values[i:i + record_len])
+        i += record_len
+        if has_reference:
+            state.reference = Sample.from_record(values[i:i + record_len])
+        return state
+
+    def dump(self):
+        stats = self.window.stats
+        values = [MAGIC, self.wakes, self.backlog, self.overruns, self.channel,
+                  self.bssid or bytes(6), self.reference is not None]
+        for name in _FIELDS:
+            values.extend(getattr(stats, name).snapshot())
+        values.extend((stats.dark, stats.rain, stats.air_bad))
+        last = self.window.last
+        values.extend(last.to_record() if last is not None else _EMPTY)
+        values.extend(self.reference.to_record() if self.reference is not None else _EMPTY)
+        return struct.pack(_FMT, *values)
+
+
+class DutyCycle:
+    def __init__(self, rtc, period_ms, report_every, changes, budget_ms=None, report_budget_ms=None,
+                 timer=None):
+        """
+        rtc is machine.RTC() (anything with memory()); period_ms is the
+        wake-to-wake period and report_every how many wakes make one report
+        window. changes is the ChangeFilter that decides what gets reported.
+        budget_ms and report_budget_ms are the wake-to-sleep time allowed for
+        a sample-only wake and for a wake that reports. timer is the
+        script's boot PhaseTimer, so the wake report includes its phases;
+        without one a timer from reset is started here.
+        """
+        if timer is None:
+            timer = PhaseTimer(start_ms=0)  # ticks_ms() restarts on wake
+        timer.budget_ms = budget_ms
+        self.timer = timer
+        self.rtc = rtc
+        self.period_ms = period_ms
+        self.report_every = report_every
+        self.report_budget_ms = report_budget_ms
+        self.changes = changes
+        self.state = SleepState.load(rtc.memory())
+        changes.last = self.state.reference
+        self.reporting = False  # This wake closes a report window
+        self.timer.mark('state')
+
+    def add(self, sample):
+        """Add this wake's sample; returns a summary to report, or None."""
+        state = self.state
+        state.window.add(sample)
+        state.wakes += 1
+        if state.wakes % self.report_every:
+            return None
+        self.reporting = True
+        if self.report_budget_ms is not None:
+            self.timer.budget_ms = self.report_budget_ms
+        summary = state.window.close()
+        if self.changes.due(summary):
+            state.reference = summary
+            return summary
+        return None
+
+    def sleep(self, deepsleep):
+        """Save the state to RTC memory and deep sleep until the next wake."""
+        if self.timer.over_budget:
+            self.state.overruns += 1
+        self.rtc.memory(self.state.dump())
+        self.timer.mark('save')
+        print("Wake {}: {}".format(self.state.wakes, self.timer))
+        deepsleep(max(0, self.period_ms - self.timer.elapsed_ms))
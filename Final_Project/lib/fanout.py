@@ -0,0 +1,84 @@
+"""Fan each reading out to several sinks, each at its own rate.
+
+The sensors are read once per sampling period and Fanout.add() hands the
+reading to every route. A route is one sink, any callable taking a Sample
+(an Outbox's put, a RingLog's append, an LCD page turner, a print), plus
+its rate policy:
+
+  period_ms  how often the sink gets a sample
+  summary    True: the summary (means, statistics in .window) of the
+             samples since the sink's last turn; False: the newest reading
+  changes    optional ChangeFilter, so only samples that left its
+             deadbands (or are due a heartbeat) reach the sink
+
+One set of reads thus feeds a chat every 15 min, a group every hour and
+a serial line every minute, and a slow sink never holds up another: each
+route is its own runtime task. A sink that needs an irregular rate (LCD
+pages with their own dwell) is better off as a coroutine of its own.
+
+    fanout = Fanout(rt.latest)
+    fanout.route('chat', outbox.put, 900000, changes=ChangeFilter())
+    fanout.route('now', print, 60000, summary=False)
+    fanout.schedule(rt)
+    rt.every('sample', 2000, lambda: fanout.add(read_sensors()))
+"""
+from aggregate import SampleWindow
+
+
+class Route:
+    """One sink and its rate policy."""
+
+    def __init__(self, name, sink, period_ms, summary=True, changes=None):
+        self.name = name
+        self.sink = sink
+        self.period_ms = period_ms
+        self.changes = changes
+        self.window = SampleWindow() if summary else None
+        self.delivered = 0  # Samples handed to the sink
+
+    def add(self, sample):
+        if self.window is not None:
+            self.window.add(sample)
+
+    def due(self, latest):
+        """The sample for this turn, or None if the sink gets nothing."""
+        sample = latest if self.window is None else self.window.close()
+        if sample is None or (self.changes is not None and not self.changes.due(sample)):
+            return None
+        return sample
+
+    def run(self, latest):
+        sample = self.due(latest)
+        if sample is not None:
+            self.sink(sample)
+            self.delivered += 1
+
+
+class Fanout:
+    def __init__(self, latest):
+        """latest is the runtime's SampleStore; add() updates it."""
+        self.latest = latest
+        self.routes = []
+
+    def route(self, name, sink, period_ms, summary=True, changes=None):
+        """Add a sink; returns its Route."""
+        route = Route(name, sink, period_ms, summary, changes)
+        self.routes.append(route)
+        return route
+
+    def add(self, sample):
+        """Store one reading as the latest and add it to every route's window."""
+        self.latest.update(sample)
+        for route in self.routes:
+            route.add(sample)
+
+    def schedule(self, rt):
+        """One runtime task per route, named after it.
+
+        Routes of the newest reading start at once; summary routes after
+        one period, so their first summary covers a whole one.
+        """
+        latest = self.latest
+        for route in self.routes:
+            rt.every(route.name, route.period_ms, lambda route=route: route.run(latest.value),
+                     0 if route.window is None else route.period_ms)
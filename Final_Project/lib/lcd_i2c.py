@@ -1,9 +1,9 @@
-from time import sleep_ms
+from time import sleep_ms, sleep_us
 
 class I2cLcd:
     """Implements a HD44780 character LCD connected via PCF8574 on I2C."""
 
-    def __init__(self, i2c, i2c_addr, num_lines, num_columns):
+    def __init__(self, i2c, i2c_addr, num_lines, num_columns, fast=False, init=True):
         self.i2c = i2c
         self.i2c_addr = i2c_addr
         self.num_lines = num_lines
@@ -43,6 +43,29 @@ class I2cLcd:
         self.LCD_5x10_DOTS = 0x04
         self.LCD_5x8_DOTS = 0x00
 
+        # Shadow framebuffer: _frame is what write() asks for, _glass is what
+        # the LCD currently shows, so flush() can send only changed cells.
+        self._blank = b' ' * (num_lines * num_columns)
+        self._frame = bytearray(self._blank)
+        self._glass = bytearray(self._blank)
+        self._cursor = -1  # Framebuffer index of the LCD cursor, -1 if unknown
+
+        # Fast mode packs the EN-high/EN-low sequence for up to one row of
+        # characters into this buffer and sends it with a single writeto.
+        self.fast = False  # The power-on sequence always uses the slow path
+        self._tbuf = bytearray(1 + 4 * num_columns)
+        tview = memoryview(self._tbuf)
+        self._tviews = [tview[:1 + 4 * n] for n in range(num_columns + 1)]  # By characters sent
+        self._one = bytearray(1)
+        self._chars = bytearray(num_columns)  # putstr() encodes into this, a row at a time
+
+        if not init:
+            # The controller stayed powered and configured (e.g. through an ESP32
+            # deep sleep): skip the power-on sequence. What the LCD shows is not
+            # known, so clear() before drawing.
+            self.fast = fast
+            return
+
         self._write_byte(0x00)
         sleep_ms(50)
 
@@ -58,6 +81,7 @@ class I2cLcd:
         self._send_instruction(self.LCD_DISPLAY_CONTROL | self.LCD_DISPLAY_ON | self.LCD_CURSOR_OFF | self.LCD_BLINK_OFF)
         self.clear()
         self._send_instruction(self.LCD_ENTRY_MODE | self.LCD_ENTRY_LEFT | self.LCD_ENTRY_SHIFT_DEC)
+        self.fast = fast
 
     def _write_byte(self, data):
         self.i2c.writeto(self.i2c_addr, bytearray([data | self.backlight]))
@@ -70,6 +94,10 @@ class I2cLcd:
         sleep_ms(1)
 
     def _send_instruction(self, cmd):
+        if self.fast:
+            self._one[0] = cmd
+            self._send_fast(self._one, 0, 0, 1)
+            return
         high_nibble = (cmd & 0xF0)
         low_nibble = ((cmd << 4) & 0xF0)
         self._write_byte(high_nibble)
@@ -80,16 +108,120 @@ class I2cLcd:
     def clear(self):
         self._send_instruction(self.LCD_CLEAR)
         sleep_ms(2)
+        self._glass[:] = self._blank
+        self._cursor = 0
 
     def putstr(self, string):
-        for char in string:
-            self._send_data(ord(char))
+        chars = self._chars
+        size = len(chars)
+        length = len(string)
+        i = n = 0
+        while i < length:
+            chars[n] = ord(string[i]) & 0xFF
+            i += 1
+            n += 1
+            if n == size or i == length:
+                self._send_run(chars, 0, n)
+                j = 0
+                while j < n:
+                    self._track(chars[j])
+                    j += 1
+                n = 0
 
     def set_cursor(self, col, row):
         row_offsets = [0x00, 0x40, 0x14, 0x54]
         self._send_instruction(0x80 | (col + row_offsets[row]))
+        self._cursor = row * self.num_columns + col
+
+    def _track(self, data):
+        # Record a character written at the cursor and advance it. Past the
+        # end of a row the HD44780 address leaves the visible area.
+        cursor = self._cursor
+        if cursor < 0:
+            return
+        self._glass[cursor] = data
+        cursor += 1
+        self._cursor = cursor if cursor % self.num_columns else -1
+
+    def write(self, row, col, text):
+        """Place text in the framebuffer at (col, row); shown by the next flush()."""
+        pos = row * self.num_columns + col
+        for char in text:
+            if col >= self.num_columns:
+                break
+            self._frame[pos] = ord(char) & 0xFF
+            pos += 1
+            col += 1
+
+    def clear_frame(self):
+        """Blank the framebuffer without touching the LCD."""
+        self._frame[:] = self._blank
+
+    def flush(self):
+        """Send only the runs of cells that differ from what is on the glass."""
+        frame = self._frame
+        glass = self._glass
+        cols = self.num_columns
+        for row in range(self.num_lines):
+            base = row * cols
+            col = 0
+            while col < cols:
+                if frame[base + col] == glass[base + col]:
+                    col += 1
+                    continue
+                if self._cursor != base + col:
+                    self.set_cursor(col, row)
+                # Rewriting one unchanged cell costs the same as a cursor
+                # move, so single-cell gaps are bridged instead of skipped.
+                start = base + col
+                while col < cols:
+                    i = base + col
+                    if frame[i] == glass[i] and (col + 1 == cols or frame[i + 1] == glass[i + 1]):
+                        break
+                    col += 1
+                self._send_run(frame, start, base + col)
+                for i in range(start, base + col):
+                    self._track(frame[i])
+
+    def _send_run(self, data, start, stop):
+        # Write data[start:stop] as characters at the cursor
+        if not self.fast:
+            for i in range(start, stop):
+                self._send_data(data[i])
+            return
+        while start < stop:
+            end = min(stop, start + self.num_columns)
+            self._send_fast(data, self.PCF8574_RS, start, end)
+            start = end
+
+    def _send_fast(self, data, rs, start, stop):
+        # One writeto per batch: a setup byte so RS settles before the first
+        # EN pulse, then EN-high/EN-low for each nibble. Every PCF8574 byte
+        # takes >= 22.5 us on the bus (400 kHz), so two bytes separate one
+        # character's final latch from the next one, covering the 37 us
+        # (41 us worst case) HD44780 execution time without sleeping.
+        buf = self._tbuf
+        flags = self.backlight | rs
+        en = self.PCF8574_EN
+        buf[0] = (data[start] & 0xF0) | flags
+        n = 1
+        for i in range(start, stop):
+            byte = data[i]
+            high = (byte & 0xF0) | flags
+            low = ((byte << 4) & 0xF0) | flags
+            buf[n] = high | en
+            buf[n + 1] = high
+            buf[n + 2] = low | en
+            buf[n + 3] = low
+            n += 4
+        self.i2c.writeto(self.i2c_addr, self._tviews[stop - start])
+        sleep_us(37)
 
     def _send_data(self, data):
+        if self.fast:
+            self._one[0] = data
+            self._send_fast(self._one, self.PCF8574_RS, 0, 1)
+            return
         high_nibble = (data & 0xF0) | self.PCF8574_RS
         low_nibble = ((data << 4) & 0xF0) | self.PCF8574_RS
         self._write_byte(high_nibble)
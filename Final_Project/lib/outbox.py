@@ -0,0 +1,136 @@
+"""Bounded outbound queue between sampling and the Telegram uplink.
+
+Reports wait in a fixed ring of slots until a send succeeds. Failed sends are
+retried with exponential backoff, and when a backlog builds up (after an
+outage) several pending reports are coalesced into one message, so recovery
+costs one request instead of one per missed report.
+
+With a spill log (a RingLog), reports that no longer fit in RAM are written
+to flash instead of being dropped, and are replayed in bulk, oldest first,
+once sends succeed again.
+"""
+from runtime import ticks_ms, ticks_add, ticks_diff
+
+
+class Outbox:
+    def __init__(self, send, format_one, format_many, capacity=8, coalesce_at=3,
+                 max_sends=2, base_delay_ms=5000, max_delay_ms=300000, spill=None,
+                 replay_batch=8):
+        """
+        send(message) returns True when the message was delivered.
+        format_one(report) and format_many(reports) build the message; it
+        is sent before the next one is built, so it may live in a reused
+        buffer.
+        max_sends caps the requests made by one pump() call.
+        spill is an optional RingLog for reports evicted from a full queue;
+        replay_batch caps how many spilled reports go into one message.
+        """
+        self._send = send
+        self._format_one = format_one
+        self._format_many = format_many
+        self._slots = [None] * capacity  # Fixed memory, oldest at _head
+        self._head = 0
+        self.count = 0
+        self.coalesce_at = coalesce_at
+        self.max_sends = max_sends
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.spill = spill
+        self.replay_batch = replay_batch
+        self._failures = 0          # Consecutive failed sends
+        self._retry_at = ticks_ms()
+        # Counters
+        self.sent = 0       # Messages delivered
+        self.delivered = 0  # Reports delivered (> sent when coalescing)
+        self.retries = 0    # Failed send attempts
+        self.dropped = 0    # Reports evicted because the queue was full
+        self.spilled = 0    # Evicted reports kept in the spill log instead
+
+    def put(self, report):
+        """Queue a report; when full, the oldest one is spilled or dropped."""
+        capacity = len(self._slots)
+        if self.count == capacity:
+            oldest = self._slots[self._head]
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % capacity
+            self.count -= 1
+            if self.spill is not None:
+                self.spill.append(oldest)
+                self.spilled += 1
+            else:
+                self.dropped += 1
+        self._slots[(self._head + self.count) % capacity] = report
+        self.count += 1
+
+    def _pending(self, n):
+        capacity = len(self._slots)
+        return [self._slots[(self._head + i) % capacity] for i in range(n)]
+
+    def _pop(self, n):
+        capacity = len(self._slots)
+        for _ in range(n):
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % capacity
+        self.count -= n
+
+    def spill_pending(self):
+        """Move every queued report to the spill log, e.g. before deep sleep."""
+        while self.count:
+            self.spill.append(self._slots[self._head])
+            self._pop(1)
+            self.spilled += 1
+        self.spill.flush()
+
+    def due(self):
+        """True when pump() would send now: reports wait and no backoff runs."""
+        if not self.count and not (self.spill is not None and self.spill.pending):
+            return False
+        return ticks_diff(self._retry_at, ticks_ms()) <= 0
+
+    def pump(self):
+        """Send what is due; call this periodically from the uplink task."""
+        sends = 0
+        while sends < self.max_sends:
+            if ticks_diff(self._retry_at, ticks_ms()) > 0:
+                return  # Still backing off
+            replayed = 0
+            if self.spill is not None and self.spill.pending:
+                # Spilled reports are older than anything in RAM, send them first
+                reports, replayed = self.spill.unsent(self.replay_batch)
+                if not reports:
+                    self.spill.ack(replayed)  # Only torn records were left
+                    continue
+                n = 0
+            elif self.count:
+                n = self.count if self.count >= self.coalesce_at else 1
+                reports = self._pending(n)
+            else:
+                return
+            if len(reports) > 1:
+                text = self._format_many(reports)
+            else:
+                text = self._format_one(reports[0])
+            sends += 1
+            try:
+                ok = self._send(text)
+            except Exception as e:
+                print("Outbox send error:", e)
+                ok = False
+            if ok:
+                if replayed:
+                    self.spill.ack(replayed)
+                else:
+                    self._pop(n)
+                self.sent += 1
+                self.delivered += len(reports)
+                self._failures = 0
+            else:
+                self.retries += 1
+                delay = min(self.max_delay_ms, self.base_delay_ms << min(self._failures, 16))
+                self._failures += 1
+                self._retry_at = ticks_add(ticks_ms(), delay)
+                return
+
+    def __str__(self):
+        return "pending={} sent={} delivered={} retries={} dropped={} spilled={}".format(
+            self.count, self.sent, self.delivered, self.retries, self.dropped, self.spilled)
@@ -0,0 +1,47 @@
+"""Per-phase timing of a boot or wake, checked against a budget.
+
+mark(name) closes the phase that ran since the previous mark. On the device
+ticks_ms() starts at 0 on every reset and deep-sleep wake, so a timer
+created with start_ms=0 also counts the time before the script started.
+
+Kept free of other imports so a script can start a timer before importing
+anything else.
+"""
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:  # CPython host runs
+    from time import monotonic
+
+    def ticks_ms():
+        return int(monotonic() * 1000)
+
+    def ticks_diff(end, start):
+        return end - start
+
+
+class PhaseTimer:
+    def __init__(self, budget_ms=None, start_ms=None):
+        self.budget_ms = budget_ms
+        self.start = ticks_ms() if start_ms is None else start_ms
+        self._last = self.start
+        self.phases = []  # (name, ms)
+
+    def mark(self, name):
+        now = ticks_ms()
+        self.phases.append((name, ticks_diff(now, self._last)))
+        self._last = now
+
+    @property
+    def elapsed_ms(self):
+        return ticks_diff(ticks_ms(), self.start)
+
+    @property
+    def over_budget(self):
+        return self.budget_ms is not None and self.elapsed_ms > self.budget_ms
+
+    def __str__(self):
+        parts = ["{} {}".format(name, ms) for name, ms in self.phases]
+        text = "{} ms ({})".format(self.elapsed_ms, ", ".join(parts))
+        if self.budget_ms is not None:
+            text += " budget {} ms{}".format(self.budget_ms, " EXCEEDED" if self.over_budget else "")
+        return text
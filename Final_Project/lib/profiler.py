@@ -0,0 +1,97 @@
+"""Time and heap allocation of the station's stages, kept in fixed buffers.
+
+profiler.stage(name) decorates a function so that every call records how
+long it took (ticks_us) and how many bytes it allocated (gc.mem_alloc()
+before and after). The last `window` calls of each stage are kept in
+preallocated arrays, so profiling does not allocate once a stage exists.
+
+A call during which a garbage collection ran shows a negative allocation;
+it is counted under gc= and left out of the byte averages.
+
+A disabled Profiler hands back the undecorated function, so turning
+profiling off leaves no cost on the call path.
+"""
+import gc
+from array import array
+
+from runtime import ticks_us, ticks_diff
+
+_GC_RAN = -1  # Stored instead of a byte count when a collection hid it
+
+
+class StageStats:
+    """Rolling durations (us) and allocations (bytes) of one stage."""
+
+    def __init__(self, window):
+        self.us = array('i', bytes(4 * window))
+        self.alloc = array('i', bytes(4 * window))
+        self.count = 0     # Calls since boot
+        self.gc = 0        # ... during which a collection ran
+        self.max_us = 0    # Since boot
+        self.max_alloc = 0
+
+    def record(self, us, alloc):
+        i = self.count % len(self.us)
+        self.count += 1
+        self.us[i] = us
+        if us > self.max_us:
+            self.max_us = us
+        if alloc < 0:
+            self.gc += 1
+            alloc = _GC_RAN
+        elif alloc > self.max_alloc:
+            self.max_alloc = alloc
+        self.alloc[i] = alloc
+
+    def means(self):
+        """Mean us and bytes over the buffered calls."""
+        n = min(self.count, len(self.us))
+        total_us = total_alloc = counted = 0
+        for i in range(n):
+            total_us += self.us[i]
+            if self.alloc[i] != _GC_RAN:
+                total_alloc += self.alloc[i]
+                counted += 1
+        return (total_us // n if n else 0), (total_alloc // counted if counted else 0)
+
+
+class Profiler:
+    def __init__(self, enabled=True, window=32):
+        """window is how many recent calls per stage the means cover."""
+        self.enabled = enabled
+        self.window = window
+        self.stages = {}  # Stage name -> StageStats
+        self._mem_alloc = getattr(gc, 'mem_alloc', None) or (lambda: 0)  # MicroPython only
+
+    def stage(self, name):
+        """Decorator recording each call of the function under name."""
+        if not self.enabled:
+            return lambda fn: fn
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(self.window)
+        mem_alloc = self._mem_alloc
+
+        def decorate(fn):
+            def profiled(*args, **kwargs):
+                before = mem_alloc()
+                start = ticks_us()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    stats.record(ticks_diff(ticks_us(), start), mem_alloc() - before)
+            return profiled
+        return decorate
+
+    def report(self):
+        """One line per stage: calls, mean/max time and allocation, plus the heap."""
+        lines = []
+        for name, stats in self.stages.items():
+            mean_us, mean_alloc = stats.means()
+            lines.append("{}: n={} {:.1f}/{:.1f}ms {}/{}B gc={}".format(
+                name, stats.count, mean_us / 1000, stats.max_us / 1000,
+                mean_alloc, stats.max_alloc, stats.gc))
+        mem_free = getattr(gc, 'mem_free', None)
+        if mem_free is not None:
+            lines.append("heap: free={}B alloc={}B".format(mem_free(), self._mem_alloc()))
+        return "\n".join(lines)
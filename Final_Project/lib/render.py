@@ -0,0 +1,199 @@
+"""Render Telegram messages straight into one reusable JSON request body.
+
+Building a report as an f-string and then json.dumps()-ing a dict around it
+makes several large short-lived strings just before the TLS work, which
+needs the most heap. A Template instead lists the message as literal text
+and field formatters. The literals are JSON-escaped and encoded once, when
+the Template is built, and Renderer.render() writes the whole
+sendMessage body, envelope included, into a bytearray that is reused for
+every message.
+
+    MESSAGE = Template("Temperature: ", Fixed(lambda s: s.temperature, 1), " °C\\n",
+                       "Rain: ", Choice(lambda s: s.rain, "Yes", "No"))
+    body = Renderer(chat_id).render(MESSAGE, sample)  # memoryview, valid until the next render
+"""
+_SCALES = (1, 10, 100, 1000, 10000)
+MAX_CHATS = 8  # Envelope prefixes kept per Renderer, for render(..., chat_id)
+_ESCAPES = {'"': '\\"', '\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def _escape(text):
+    """JSON string contents for text, as UTF-8 bytes."""
+    out = []
+    for ch in text:
+        if ch in _ESCAPES:
+            out.append(_ESCAPES[ch])
+        elif ord(ch) < 0x20:
+            out.append('\\u{:04x}'.format(ord(ch)))
+        else:
+            out.append(ch)
+    return ''.join(out).encode()
+
+
+def _compile(parts):
+    # Strings become escaped bytes, neighbouring literals are merged
+    compiled = []
+    for part in parts:
+        if isinstance(part, str):
+            part = _escape(part)
+        if isinstance(part, bytes) and compiled and isinstance(compiled[-1], bytes):
+            compiled[-1] += part
+        else:
+            compiled.append(part)
+    return tuple(compiled)
+
+
+class Fixed:
+    """A number with a fixed count of decimals (at most 4), rounded half away from zero."""
+
+    def __init__(self, get, decimals=0):
+        self.get = get
+        self.decimals = decimals
+
+    def write(self, renderer, obj):
+        renderer.fixed(self.get(obj), self.decimals)
+
+
+class Choice:
+    """One of two literals, picked by the truth of get(obj)."""
+
+    def __init__(self, get, yes, no):
+        self.get = get
+        self.yes = _escape(yes)
+        self.no = _escape(no)
+
+    def write(self, renderer, obj):
+        renderer.put(self.yes if self.get(obj) else self.no)
+
+
+class Text:
+    """A str from get(obj), escaped as it is rendered; allocates, unlike the others."""
+
+    def __init__(self, get):
+        self.get = get
+
+    def write(self, renderer, obj):
+        renderer.put(_escape(self.get(obj)))
+
+
+class When:
+    """parts rendered against get(obj), or nothing if that is None/false."""
+
+    def __init__(self, get, *parts):
+        self.get = get
+        self.parts = _compile(parts)
+
+    def write(self, renderer, obj):
+        value = self.get(obj)
+        if value:
+            renderer.write_parts(self.parts, value)
+
+
+class Each:
+    """parts rendered once per item of get(obj)."""
+
+    def __init__(self, get, *parts):
+        self.get = get
+        self.parts = _compile(parts)
+
+    def write(self, renderer, obj):
+        for item in self.get(obj):
+            renderer.write_parts(self.parts, item)
+
+
+class Template:
+    def __init__(self, *parts):
+        self.parts = _compile(parts)
+
+
+class Renderer:
+    def __init__(self, chat_id, parse_mode='HTML', size=1024):
+        """Renders sendMessage bodies for chat_id into a size-byte buffer.
+
+        The buffer is grown once if a message does not fit. The envelope
+        prefix of another chat passed to render() is built on first use
+        and kept, for up to MAX_CHATS chats.
+        """
+        self._prefix = self._envelope(chat_id)
+        self._prefixes = {}  # chat_id as passed to render() -> prefix
+        self._suffix = (b'","parse_mode":"' + _escape(parse_mode) +
+                        b'","disable_web_page_preview":true}')
+        self._buf = bytearray(size)
+        self._n = 0
+
+    @staticmethod
+    def _envelope(chat_id):
+        return b'{"chat_id":"' + _escape(str(chat_id)) + b'","text":"'
+
+    def _reserve(self, size):
+        if self._n + size > len(self._buf):
+            buf = bytearray(max(2 * len(self._buf), self._n + size))
+            buf[:self._n] = memoryview(self._buf)[:self._n]
+            self._buf = buf
+
+    def put(self, data):
+        """Append encoded, already escaped bytes."""
+        self._reserve(len(data))
+        self._buf[self._n:self._n + len(data)] = data
+        self._n += len(data)
+
+    def fixed(self, value, decimals=0):
+        """Append value with decimals digits after the point, without a str."""
+        scale = _SCALES[decimals]
+        n = int(value * scale + (0.5 if value >= 0 else -0.5))
+        self._reserve(32)
+        buf = self._buf
+        if n < 0:
+            buf[self._n] = 45  # '-'
+            self._n += 1
+            n = -n
+        whole = n // scale
+        digits = 1
+        rest = whole // 10
+        while rest:
+            digits += 1
+            rest //= 10
+        i = self._n + digits
+        self._n = i
+        while digits:
+            i -= 1
+            buf[i] = 48 + whole % 10
+            whole //= 10
+            digits -= 1
+        if decimals:
+            buf[self._n] = 46  # '.'
+            frac = n % scale
+            i = self._n + decimals + 1
+            self._n = i
+            for _ in range(decimals):
+                i -= 1
+                buf[i] = 48 + frac % 10
+                frac //= 10
+
+    def write_parts(self, parts, obj):
+        for part in parts:
+            if isinstance(part, bytes):
+                self.put(part)
+            else:
+                part.write(self, obj)
+
+    def render(self, template, obj, chat_id=None):
+        """The request body for template filled from obj.
+
+        chat_id sends this one message to another chat, e.g. as a reply to
+        a command. The returned memoryview is only valid until the next
+        render().
+        """
+        self._n = 0
+        if chat_id is None:
+            prefix = self._prefix
+        else:
+            prefix = self._prefixes.get(chat_id)
+            if prefix is None:
+                prefix = self._envelope(chat_id)
+                if len(self._prefixes) < MAX_CHATS:
+                    self._prefixes[chat_id] = prefix
+        self.put(prefix)
+        self.write_parts(template.parts, obj)
+        self.put(self._suffix)
+        return memoryview(self._buf)[:self._n]
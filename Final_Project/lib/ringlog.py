@@ -0,0 +1,122 @@
+"""Append-only ring log of fixed-width records on the device filesystem.
+
+Records are struct-packed as (seq, payload..., check). Sequence numbers map
+to slots as (seq - 1) % capacity, so the write position is recovered at boot
+by scanning for the highest valid sequence number; no index is rewritten on
+every append. Appends are collected in a RAM block and written in one
+block-sized flush, and wrapping around the file spreads wear over all of it.
+
+A flush cut short by power loss leaves at most one partial record at the
+tail. Its check byte (or missing bytes) makes recovery ignore it.
+"""
+import struct
+
+
+class RingLog:
+    def __init__(self, path, fmt, capacity=256, block_size=512, encode=None, decode=None):
+        """
+        fmt is the struct format of the payload (without byte order prefix).
+        encode(item) -> payload tuple and decode(payload) -> item convert
+        between stored records and the caller's objects.
+        """
+        self.path = path
+        self.capacity = capacity
+        self._fmt = '<I' + fmt  # The check byte follows the packed fields
+        self.record_size = struct.calcsize(self._fmt) + 1
+        self._encode = encode
+        self._decode = decode
+        per_block = max(1, block_size // self.record_size)
+        self._buf = bytearray(per_block * self.record_size)
+        self._view = memoryview(self._buf)
+        self._buffered = 0
+        self.last_seq = 0    # Highest sequence number appended
+        self.acked_seq = 0   # Highest sequence number replayed successfully
+        self.flushes = 0
+        self._recover()
+
+    @staticmethod
+    def _check(data, end):
+        # Sum of the record bytes; the offset makes an all-zero record invalid
+        total = 0xA5
+        for i in range(end):
+            total += data[i]
+        return total & 0xFF
+
+    def _recover(self):
+        size = self.record_size
+        record = bytearray(size)
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            open(self.path, 'wb').close()
+            f = None
+        if f is not None:
+            with f:
+                while f.readinto(record) == size:
+                    seq = struct.unpack_from('<I', record)[0]
+                    if record[size - 1] == self._check(record, size - 1) and seq > self.last_seq:
+                        self.last_seq = seq
+        try:
+            with open(self.path + '.ack', 'rb') as f:
+                self.acked_seq = min(struct.unpack('<I', f.read(4))[0], self.last_seq)
+        except (OSError, ValueError, struct.error):
+            self.acked_seq = 0
+
+    def append(self, item):
+        """Buffer one record; the block is written out once it is full."""
+        self.last_seq += 1
+        payload = self._encode(item) if self._encode else item
+        offset = self._buffered * self.record_size
+        struct.pack_into(self._fmt, self._buf, offset, self.last_seq, *payload)
+        end = offset + self.record_size - 1
+        self._buf[end] = self._check(self._view[offset:end], end - offset)
+        self._buffered += 1
+        if self._buffered * self.record_size == len(self._buf):
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to the file in as few writes as possible."""
+        if not self._buffered:
+            return
+        size = self.record_size
+        slot = (self.last_seq - self._buffered) % self.capacity
+        first = min(self._buffered, self.capacity - slot)  # Records before the wrap
+        with open(self.path, 'r+b') as f:
+            f.seek(slot * size)
+            f.write(self._view[:first * size])
+            if first < self._buffered:
+                f.seek(0)
+                f.write(self._view[first * size:self._buffered * size])
+        self._buffered = 0
+        self.flushes += 1
+
+    @property
+    def pending(self):
+        """Records appended but not yet acknowledged (and not overwritten)."""
+        return self.last_seq - max(self.acked_seq, self.last_seq - self.capacity)
+
+    def unsent(self, limit):
+        """Return (items, last_seq) for up to limit of the oldest pending records."""
+        self.flush()
+        size = self.record_size
+        record = bytearray(size)
+        items = []
+        seq = max(self.acked_seq, self.last_seq - self.capacity)
+        with open(self.path, 'rb') as f:
+            while seq < self.last_seq and len(items) < limit:
+                seq += 1
+                f.seek(((seq - 1) % self.capacity) * size)
+                if f.readinto(record) != size or record[size - 1] != self._check(record, size - 1):
+                    continue  # Torn record, skip it
+                values = struct.unpack_from(self._fmt, record)
+                if values[0] != seq:
+                    continue
+                payload = values[1:]
+                items.append(self._decode(payload) if self._decode else payload)
+        return items, seq
+
+    def ack(self, seq):
+        """Mark records up to seq as delivered; one small write per replay."""
+        self.acked_seq = seq
+        with open(self.path + '.ack', 'wb') as f:
+            f.write(struct.pack('<I', seq))
@@ -0,0 +1,141 @@
+"""Cooperative task runtime for the weather station firmware.
+
+Sampling, display, uplink and housekeeping run as uasyncio tasks at their own
+rates and share the newest reading through a SampleStore, so one task's
+schedule does not depend on how long the others take.
+
+The tasks are cooperative: a call that blocks, such as an uplink request on
+a socket, holds up every other task for as long as it blocks. Keep the
+blocking work of one turn small (the station sends at most one message per
+turn, with a short socket timeout); JitterStats shows how late each task
+started.
+"""
+import gc
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+try:
+    from time import ticks_ms, ticks_us, ticks_add, ticks_diff
+except ImportError:  # CPython host runs; the other modules import these from here
+    from time import monotonic, perf_counter
+
+    def ticks_ms():
+        return int(monotonic() * 1000)
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    def ticks_diff(end, start):
+        return end - start
+
+
+class SampleStore:
+    """Holds the latest reading and when it was taken."""
+
+    def __init__(self):
+        self.value = None
+        self.seq = 0      # Incremented on every update
+        self.ticks = 0    # ticks_ms() of the last update
+
+    def update(self, value):
+        self.value = value
+        self.seq += 1
+        self.ticks = ticks_ms()
+
+
+class JitterStats:
+    """Running lateness of a periodic job against its schedule, in ms."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, late_ms):
+        self.count += 1
+        self.total += late_ms
+        if late_ms > self.max:
+            self.max = late_ms
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+
+class Runtime:
+    """Runs periodic jobs and free-running coroutines on one event loop."""
+
+    def __init__(self):
+        self.latest = SampleStore()
+        self.jitter = {}    # Job name -> JitterStats
+        self._coros = []
+        self._stop = False
+
+    def every(self, name, period_ms, fn, start_ms=0):
+        """Call fn() every period_ms, first after start_ms.
+
+        Deadlines advance by the period rather than from when fn() returned,
+        so a slow call delays one run without drifting the whole schedule.
+        """
+        stats = self.jitter[name] = JitterStats()
+        self._coros.append(self._periodic(period_ms, fn, start_ms, stats))
+
+    def spawn(self, coro):
+        """Run a coroutine alongside the periodic jobs."""
+        self._coros.append(coro)
+
+    async def _periodic(self, period_ms, fn, start_ms, stats):
+        deadline = ticks_add(ticks_ms(), start_ms)
+        while not self._stop:
+            delay = ticks_diff(deadline, ticks_ms())
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            else:
+                await asyncio.sleep(0)
+            stats.record(-ticks_diff(deadline, ticks_ms()))
+            try:
+                fn()
+            except Exception as e:
+                print("Task error:", e)
+            deadline = ticks_add(deadline, period_ms)
+            if ticks_diff(ticks_ms(), deadline) > period_ms:
+                deadline = ticks_ms()  # Fell a whole period behind, resync
+
+    async def _main(self, duration_ms):
+        for coro in self._coros:
+            asyncio.create_task(coro)
+        if duration_ms is None:
+            while True:
+                await asyncio.sleep(3600)
+        await asyncio.sleep(duration_ms / 1000)
+        self._stop = True
+
+    def run(self, duration_ms=None):
+        """Start all jobs; returns after duration_ms, or never if None."""
+        asyncio.run(self._main(duration_ms))
+
+    def report(self):
+        """One line per job: runs, mean and max lateness in ms."""
+        lines = []
+        for name, stats in self.jitter.items():
+            lines.append("{}: n={} late mean={:.1f}ms max={}ms".format(
+                name, stats.count, stats.mean, stats.max))
+        return "\n".join(lines)
+
+
+def housekeeping(headroom=4):
+    """Collect garbage between bursts of work; the link is watched by wifi.py.
+
+    Afterwards the automatic collection is moved out to 1/headroom of the
+    free heap (gc.threshold), so collections happen here in idle time
+    rather than in the middle of a sensor read or a send.
+    """
+    gc.collect()
+    try:
+        gc.threshold(gc.mem_free() // headroom)
+    except AttributeError:  # CPython has neither
+        pass
@@ -0,0 +1,59 @@
+"""One station reading as raw numbers and flags.
+
+Measurements stay in their natural units and the on/off sensors are plain
+booleans, so nothing downstream compares display strings and taking a
+reading allocates no text. The emoji wording is produced by the sinks that
+show it (Telegram messages, LCD pages). __slots__ keeps each instance to a
+fixed set of fields without a per-instance dict.
+
+A report built by aggregate.SampleWindow is also a Sample (window means and
+majority flags) and carries the window's statistics in .window.
+
+For the flash ring log a Sample packs into 17 bytes little-endian: seconds
+since the epoch, scaled integers for the measurements and one flag byte.
+RingLog adds its sequence number and check byte, 22 bytes per record.
+"""
+import time
+
+# time, temperature x10, humidity x10, pressure in Pa, altitude in dm, flags.
+# No byte order prefix: users prepend '<' (struct.calcsize('<IhhIiB') == 17)
+RECORD_FMT = 'IhhIiB'
+
+DARK = 1
+RAIN = 2
+AIR_BAD = 4
+
+
+class Sample:
+    __slots__ = ('timestamp', 'temperature', 'humidity', 'pressure', 'altitude',
+                 'dark', 'rain', 'air_bad', 'window')
+
+    def __init__(self, temperature=0, humidity=0, pressure=0.0, altitude=0.0,
+                 dark=False, rain=False, air_bad=False, timestamp=None):
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+        self.temperature = temperature  # degC
+        self.humidity = humidity        # %RH
+        self.pressure = pressure        # hPa
+        self.altitude = altitude        # m
+        self.dark = dark
+        self.rain = rain
+        self.air_bad = air_bad
+        self.window = None  # WindowStats when this summarises a report window
+
+    def to_record(self):
+        """Payload tuple for RingLog (see RECORD_FMT)."""
+        flags = 0
+        if self.dark:
+            flags |= DARK
+        if self.rain:
+            flags |= RAIN
+        if self.air_bad:
+            flags |= AIR_BAD
+        return (self.timestamp, round(self.temperature * 10), round(self.humidity * 10),
+                round(self.pressure * 100), round(self.altitude * 10), flags)
+
+    @classmethod
+    def from_record(cls, payload):
+        timestamp, temperature, humidity, pressure, altitude, flags = payload
+        return cls(temperature / 10, humidity / 10, pressure / 100, altitude / 10,
+                   bool(flags & DARK), bool(flags & RAIN), bool(flags & AIR_BAD), timestamp)
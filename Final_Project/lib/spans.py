@@ -0,0 +1,127 @@
+"""Latency tracing: named spans recorded into fixed-bucket histograms.
+
+    dht_span = tracer.span('dht')  # Once, at startup
+    with dht_span:
+        dht_sensor.measure()
+
+Each span counts its durations (ticks_us) in a preallocated array of
+buckets whose upper edges run 1-2-5 from 100 us to 50 s, and keeps the
+count and the exact maximum. Recording a span does not allocate, so spans
+can sit on the sampling path; create them once and reuse them. A span
+does not nest inside itself.
+
+p50 and p95 are read from the buckets: the upper edge of the bucket the
+percentile falls in, capped at the maximum. report() gives one line per
+span, for the REPL (print(tracer.report())) or to attach to a message.
+"""
+from array import array
+
+from runtime import ticks_us, ticks_diff
+
+EDGES_US = (100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000, 500000,
+            1000000, 2000000, 5000000, 10000000, 20000000, 50000000)
+
+
+class Span:
+    """Duration histogram of one traced stage; a context manager."""
+
+    def __init__(self, name):
+        self.name = name
+        self.buckets = array('I', bytes(4 * (len(EDGES_US) + 1)))  # Last one: over 50 s
+        self.count = 0
+        self.max_us = 0
+        self._start = 0
+
+    def __enter__(self):
+        self._start = ticks_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record(ticks_diff(ticks_us(), self._start))
+        return False
+
+    def record(self, us):
+        i = 0
+        last = len(EDGES_US)
+        while i < last and us > EDGES_US[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, fraction):
+        """Upper bound in us of the given fraction (0..1) of the durations."""
+        if not self.count:
+            return 0
+        rank = int(fraction * self.count + 0.999999) or 1
+        seen = 0
+        for i in range(len(EDGES_US)):
+            seen += self.buckets[i]
+            if seen >= rank:
+                return min(EDGES_US[i], self.max_us)
+        return self.max_us
+
+    def reset(self):
+        for i in range(len(self.buckets)):
+            self.buckets[i] = 0
+        self.count = 0
+        self.max_us = 0
+
+    def __str__(self):
+        return "{}: n={} p50={:.1f} p95={:.1f} max={:.1f} ms".format(
+            self.name, self.count, self.percentile(0.5) / 1000, self.percentile(0.95) / 1000,
+            self.max_us / 1000)
+
+
+class _NullSpan:
+    # Handed out by a disabled Tracer, so `with span:` still works
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.spans = {}  # Span name -> Span, in creation order
+
+    def span(self, name):
+        """The span called name, created on first use."""
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = Span(name)
+        return span
+
+    def traced(self, name, fn=None):
+        """fn (taking no arguments) with every call traced as name.
+
+        Without fn, a decorator. A disabled Tracer returns fn unchanged.
+        """
+        if fn is None:
+            return lambda fn: self.traced(name, fn)
+        if not self.enabled:
+            return fn
+        span = self.span(name)
+
+        def traced():
+            with span:
+                return fn()
+        return traced
+
+    def reset(self):
+        for span in self.spans.values():
+            span.reset()
+
+    def report(self):
+        """One line per span that has run: count, p50, p95 and max."""
+        if not self.enabled:
+            return "tracing off"
+        return "\n".join(str(span) for span in self.spans.values() if span.count)
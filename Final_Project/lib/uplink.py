@@ -0,0 +1,265 @@
+"""Keep-alive HTTP/1.1 client for the Telegram Bot API.
+
+One connection to the API host is opened on first use and reused for every
+request, so the DNS lookup, TCP connect and TLS handshake are paid once rather
+than every cycle. A dropped connection is re-opened transparently.
+
+A request can also be left in flight, for getUpdates long polling: begin()
+sends it, ready() polls the socket without blocking and finish() reads the
+response once it has arrived. A post() meanwhile abandons the in-flight
+request, because the connection's next response would be its answer.
+
+The socket, TLS and JSON modules are imported on first use, so importing
+this module at boot costs next to nothing when no uplink is due yet.
+"""
+socket = ssl = json = select = None
+
+
+def _import_network():
+    global socket, ssl, json, select
+    try:
+        import usocket as socket
+    except ImportError:
+        import socket
+    try:
+        import ussl as ssl
+    except ImportError:
+        import ssl
+    try:
+        import ujson as json
+    except ImportError:
+        import json
+    try:
+        import uselect as select
+    except ImportError:
+        import select
+
+
+class UplinkStats:
+    """Connection reuse counters."""
+
+    def __init__(self):
+        self.connects = 0    # Connections opened (TCP + TLS handshakes)
+        self.requests = 0    # Requests that got a response
+        self.reused = 0      # Requests sent on an already open connection
+        self.reconnects = 0  # Open connections found dead and re-opened
+        self.failures = 0    # Requests that failed even after a reconnect
+        self.abandoned = 0   # In-flight requests dropped for a post()
+
+    def __str__(self):
+        return "connects={} requests={} reused={} reconnects={} failures={} abandoned={}".format(
+            self.connects, self.requests, self.reused, self.reconnects, self.failures,
+            self.abandoned)
+
+
+class TelegramClient:
+    def __init__(self, token, host='api.telegram.org', port=443, use_tls=True, timeout=10):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.stats = UplinkStats()
+        self._sock = None
+        self._stream = None
+        self._poll = None         # Readiness poller of the in-flight request
+        self.in_flight = False    # A begin() request awaits finish()
+        self._reused = False      # ... and it went out on an open connection
+        # Request head pieces are encoded once. Each request is assembled in
+        # the same send buffer and goes out in a single write, which also
+        # keeps Nagle's algorithm from holding back a separate body segment.
+        self._prefix = ('POST /bot' + token + '/').encode()
+        self._headers = (' HTTP/1.1\r\nHost: ' + host +
+                         '\r\nContent-Type: application/json'
+                         '\r\nConnection: keep-alive\r\nContent-Length: ').encode()
+        self._buf = bytearray(1024)  # Grown once if a request does not fit
+
+    def _connect(self):
+        if socket is None:
+            _import_network()
+        addr = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)[0][-1]
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(addr)
+            if self.use_tls:
+                if hasattr(ssl, 'create_default_context'):
+                    sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+                else:
+                    sock = ssl.wrap_socket(sock, server_hostname=self.host)
+        except Exception:
+            sock.close()
+            raise
+        self._sock = sock
+        # CPython sockets need a file wrapper; MicroPython sockets are streams
+        self._stream = sock.makefile('rwb', 0) if hasattr(sock, 'makefile') else sock
+        self.stats.connects += 1
+
+    def close(self):
+        """Drop the connection; the next request opens a new one."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._stream = None
+        self._poll = None
+        self.in_flight = False
+
+    def _write(self, data):
+        view = memoryview(data)
+        while len(view):
+            sent = self._stream.write(view)
+            if sent is None:  # MicroPython streams write everything
+                return
+            view = view[sent:]
+
+    def _build_request(self, method, body):
+        parts = (self._prefix, method, self._headers, str(len(body)).encode(), b'\r\n\r\n', body)
+        size = 0
+        for part in parts:
+            size += len(part)
+        if size > len(self._buf):
+            self._buf = bytearray(size)
+        buf = self._buf
+        n = 0
+        for part in parts:
+            buf[n:n + len(part)] = part
+            n += len(part)
+        return memoryview(buf)[:n]
+
+    def _exchange(self, method, body):
+        self._write(self._build_request(method, body))
+        return self._read_response()
+
+    def _read_response(self):
+        status_line = self._stream.readline()
+        if not status_line:
+            raise OSError("Connection closed by server")
+        status = int(status_line.split(None, 2)[1])
+        length = -1
+        keep_alive = True
+        while True:
+            line = self._stream.readline()
+            if not line or line == b'\r\n':
+                break
+            name, value = line.split(b':', 1)
+            name = name.strip().lower()
+            if name == b'content-length':
+                length = int(value)
+            elif name == b'connection' and value.strip().lower() == b'close':
+                keep_alive = False
+
+        if length < 0:  # No length: the body runs until the server closes
+            chunks = []
+            while True:
+                chunk = self._stream.read(512)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b''.join(chunks)
+            keep_alive = False
+        else:
+            data = bytearray(length)
+            view = memoryview(data)
+            got = 0
+            while got < length:
+                n = self._stream.readinto(view[got:])
+                if not n:
+                    raise OSError("Connection closed mid-response")
+                got += n
+        if not keep_alive:
+            self.close()
+        return status, data
+
+    def post(self, method, body):
+        """POST a JSON body (bytes, or a memoryview from render.Renderer) to a
+        Bot API method; returns (status, body)."""
+        if isinstance(method, str):
+            method = method.encode()
+        if self.in_flight:
+            self.close()
+            self.stats.abandoned += 1
+        for attempt in range(2):
+            reused = self._sock is not None
+            try:
+                if not reused:
+                    self._connect()
+                result = self._exchange(method, body)
+            except OSError:
+                self.close()
+                if reused and attempt == 0:
+                    # The server or a middlebox dropped the idle connection
+                    self.stats.reconnects += 1
+                    continue
+                self.stats.failures += 1
+                raise
+            self.stats.requests += 1
+            if reused:
+                self.stats.reused += 1
+            return result
+
+    def begin(self, method, body):
+        """Send a request and return without waiting for the response.
+
+        Raises OSError if it could not be sent. A dead kept-alive connection
+        often only shows when the response is read, so finish() can fail
+        where post() would have reconnected; send again then.
+        """
+        if isinstance(method, str):
+            method = method.encode()
+        if self.in_flight:
+            self.close()
+            self.stats.abandoned += 1
+        self._reused = self._sock is not None
+        try:
+            if not self._reused:
+                self._connect()
+            self._write(self._build_request(method, body))
+        except OSError:
+            self.close()
+            self.stats.failures += 1
+            raise
+        self._poll = select.poll()
+        self._poll.register(self._sock, select.POLLIN)
+        self.in_flight = True
+
+    def ready(self):
+        """True once the in-flight request can be finished without blocking
+        (its response has started to arrive, or the connection broke)."""
+        return self.in_flight and bool(self._poll.poll(0))
+
+    def finish(self):
+        """Read the response to the in-flight request; returns (status, body).
+
+        Blocks (up to the socket timeout) if called before ready().
+        """
+        if not self.in_flight:
+            raise OSError("No request in flight")
+        self._poll = None
+        self.in_flight = False
+        try:
+            result = self._read_response()
+        except OSError:
+            self.close()
+            if self._reused:
+                self.stats.reconnects += 1
+            else:
+                self.stats.failures += 1
+            raise
+        self.stats.requests += 1
+        if self._reused:
+            self.stats.reused += 1
+        return result
+
+    def send_message(self, chat_id, text, parse_mode='HTML'):
+        """Send a text message; returns (status, response body)."""
+        if json is None:
+            _import_network()
+        body = json.dumps({
+            'chat_id': chat_id,
+            'text': text,
+            'parse_mode': parse_mode,
+            'disable_web_page_preview': True,
+        })
+        return self.post('sendMessage', body.encode())
@@ -0,0 +1,205 @@
+"""Wi-Fi station link manager with fast reconnect and backoff.
+
+The first join scans once for the strongest access point with our SSID and
+caches its BSSID and channel on flash; later joins (after a drop or a reboot)
+connect straight to that BSSID and skip the scan. If a cached join fails the
+cache is dropped and the next attempt scans again. An optional static IP
+skips DHCP as well.
+
+Every attempt has a timeout, failed attempts back off exponentially, and
+poll() is cheap enough to run every second from the task runtime to watch
+the link and bring it back when it drops.
+"""
+from runtime import ticks_ms, ticks_add, ticks_diff
+try:
+    from time import sleep_ms
+except ImportError:  # CPython host runs
+    from time import sleep
+
+    def sleep_ms(ms):
+        sleep(ms / 1000)
+
+DOWN = 0
+CONNECTING = 1
+UP = 2
+
+
+class WifiStats:
+    """Join attempts and time-to-connect, in ms."""
+
+    def __init__(self):
+        self.attempts = 0   # Joins started
+        self.connects = 0   # Joins that came up
+        self.fast = 0       # ... of which used the cached BSSID
+        self.failures = 0   # Joins that timed out
+        self.drops = 0      # Established links that went down
+        self.last_ms = 0    # Time to connect of the latest join
+        self.total_ms = 0
+        self.max_ms = 0
+
+    def record(self, connect_ms, fast):
+        self.connects += 1
+        if fast:
+            self.fast += 1
+        self.last_ms = connect_ms
+        self.total_ms += connect_ms
+        if connect_ms > self.max_ms:
+            self.max_ms = connect_ms
+
+    def __str__(self):
+        mean = self.total_ms // self.connects if self.connects else 0
+        return "attempts={} connects={} fast={} failures={} drops={} last={}ms mean={}ms max={}ms".format(
+            self.attempts, self.connects, self.fast, self.failures, self.drops,
+            self.last_ms, mean, self.max_ms)
+
+
+class WifiManager:
+    def __init__(self, ssid, password, static_ip=None, timeout_ms=15000,
+                 base_backoff_ms=2000, max_backoff_ms=300000, cache_path='wifi.cache', wlan=None):
+        """
+        static_ip is an (ip, netmask, gateway, dns) tuple, or None for DHCP.
+        wlan defaults to the station interface; pass a stand-in to test.
+        The network module is only imported when the link is first used.
+        """
+        self._wlan = wlan
+        self.ssid = ssid
+        self.password = password
+        self.static_ip = static_ip
+        self.timeout_ms = timeout_ms
+        self.base_backoff_ms = base_backoff_ms
+        self.max_backoff_ms = max_backoff_ms
+        self.cache_path = cache_path
+        self.stats = WifiStats()
+        self.state = DOWN
+        self.bssid = None    # Cached access point, from flash or the last scan
+        self.channel = 0
+        self._fast = False   # Current attempt uses the cached BSSID
+        self._started = ticks_ms()  # Link already up (e.g. after a soft reset) counts from here
+        self._failures = 0   # Consecutive failed joins
+        self._retry_at = ticks_ms()
+        self._load_cache()
+
+    @property
+    def wlan(self):
+        if self._wlan is None:
+            import network
+            self._wlan = network.WLAN(network.STA_IF)
+        return self._wlan
+
+    @property
+    def up(self):
+        return self.state == UP
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        if len(data) == 7:
+            self.channel = data[0]
+            self.bssid = bytes(data[1:])
+
+    def _save_cache(self):
+        try:
+            with open(self.cache_path, 'wb') as f:
+                f.write(bytes((self.channel,)) + self.bssid)
+        except OSError as e:
+            print("WiFi cache not saved:", e)
+
+    def _drop_cache(self):
+        self.bssid = None
+        self.channel = 0
+        try:
+            import os
+            os.remove(self.cache_path)
+        except OSError:
+            pass
+
+    def _scan(self):
+        # Strongest access point broadcasting our SSID, as (bssid, channel)
+        best = None
+        ssid = self.ssid.encode()
+        for ap in self.wlan.scan():
+            found_ssid, bssid, channel, rssi = ap[:4]
+            if found_ssid == ssid and (best is None or rssi > best[2]):
+                best = (bssid, channel, rssi)
+        return best
+
+    def _start(self, now):
+        wlan = self.wlan
+        wlan.active(True)
+        if self.static_ip is not None:
+            wlan.ifconfig(self.static_ip)
+        self.stats.attempts += 1
+        self._started = now
+        self._fast = self.bssid is not None
+        if not self._fast:
+            best = self._scan()
+            if best is not None:
+                self.bssid, self.channel = bytes(best[0]), best[1]
+        if self._fast and self.channel:
+            try:
+                wlan.config(channel=self.channel)  # Hint only; not every port takes it
+            except (OSError, ValueError, TypeError):
+                pass
+        self.state = CONNECTING
+        try:
+            if self.bssid is not None:
+                wlan.connect(self.ssid, self.password, bssid=self.bssid)
+            else:
+                wlan.connect(self.ssid, self.password)  # Not seen in the scan; let the driver look
+        except OSError as e:
+            print("WiFi connect error:", e)  # Handled like a join that never comes up
+
+    def _on_up(self, now):
+        connect_ms = ticks_diff(now, self._started)
+        self.stats.record(connect_ms, self._fast)
+        if not self._fast and self.bssid is not None:
+            self._save_cache()
+        self._failures = 0
+        self.state = UP
+        print("Connected to WiFi in {} ms{}".format(connect_ms, " (cached BSSID)" if self._fast else ""))
+
+    def _on_timeout(self, now):
+        self.stats.failures += 1
+        try:
+            self.wlan.disconnect()
+        except OSError:
+            pass
+        if self._fast:
+            self._drop_cache()  # The AP may have moved channel or gone; scan next time
+        delay = min(self.max_backoff_ms, self.base_backoff_ms << min(self._failures, 16))
+        self._failures += 1
+        self._retry_at = ticks_add(now, delay)
+        self.state = DOWN
+        print("WiFi join timed out, retrying in {} ms".format(delay))
+
+    def poll(self):
+        """Advance the link state machine; returns True while the link is up."""
+        now = ticks_ms()
+        if self.wlan.isconnected():
+            if self.state != UP:
+                self._on_up(now)
+            return True
+        if self.state == UP:
+            print("WiFi link lost")
+            self.stats.drops += 1
+            self.state = DOWN
+            self._retry_at = now  # Try the cached BSSID straight away
+        elif self.state == CONNECTING:
+            if ticks_diff(now, self._started) < self.timeout_ms:
+                return False
+            self._on_timeout(now)
+        if ticks_diff(now, self._retry_at) >= 0:
+            self._start(now)
+        return False
+
+    def connect(self, timeout_ms=None):
+        """Block until the link is up or timeout_ms (default: one join) passes."""
+        deadline = ticks_add(ticks_ms(), self.timeout_ms if timeout_ms is None else timeout_ms)
+        while not self.poll():
+            if ticks_diff(deadline, ticks_ms()) <= 0:
+                return False
+            sleep_ms(50)
+        return True
@@ -0,0 +1,11 @@
+# Freeze the station library into a custom ESP32 firmware. Frozen modules run
+# as bytecode straight from flash: nothing is parsed or compiled at boot and
+# their code takes no heap.
+#
+#   cd micropython/ports/esp32
+#   make BOARD=ESP32_GENERIC FROZEN_MANIFEST=/path/to/Final_Project/manifest.py
+#
+# sys.path searches the current directory before .frozen, and .frozen before
+# /lib, so delete old copies of these modules from / on the board.
+include("$(PORT_DIR)/boards/manifest.py")
+freeze("lib")
@@ -0,0 +1,147 @@
+"""Check that the BMP280 no_alloc read path does not allocate.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/bmp280_alloc.py
+
+A fake I2C bus (sim.devices.BMP280Registers) serves the datasheet
+calibration and raw values. Like machine.I2C, its readfrom_mem() returns a
+new bytes object per call, and here it also records every buffer the driver
+hands it. After a warm-up, the sensor runs
+in the 'weather' profile (forced mode: trigger, status poll, burst read)
+and the script measures the bytes one call allocates: the tracemalloc peak
+of a single call on CPython, less that of an empty call, and gc.mem_alloc()
+(collector off) over 500 calls on MicroPython. It checks that:
+
+  buffers  with no_alloc, every bus transfer used one of the driver's
+           preallocated buffers and readfrom_mem() was never called
+  bus      the bus transfers of one read allocate nothing with no_alloc,
+           and something without it, so the measurement can tell them apart
+  read     read_all() with no_alloc allocates less than without it; both
+           allocate for the compensation arithmetic (big ints on CPython,
+           boxed floats on MicroPython), which no_alloc does not cover
+
+Exits with status 1 if a check fails.
+"""
+import gc
+import sys
+import time
+
+sys.path[:0] = ['Final_Project/lib', '.']
+import bmp280
+from sim.devices import BMP280Registers
+
+if not hasattr(time, 'sleep_us'):  # CPython: the forced-mode wait is not what is measured
+    time.sleep_us = lambda us: None
+
+MICROPYTHON = sys.implementation.name == 'micropython'
+if not MICROPYTHON:
+    import tracemalloc
+
+WARMUP = 50
+CALLS = 500  # Calls per measurement on MicroPython
+
+
+class RecordingI2C(BMP280Registers):
+    """Serves the BMP280 registers and remembers the buffers it was given."""
+
+    def __init__(self):
+        super().__init__()
+        self.recording = False  # Off while allocations are measured
+        self.buffers = {}    # id() -> buffer, so the ids stay unique
+        self.new_bytes = 0   # readfrom_mem() calls, each returning a new object
+
+    def readfrom_mem(self, addr, register, length):
+        self.new_bytes += 1
+        return BMP280Registers.readfrom_mem(self, addr, register, length)
+
+    def readfrom_mem_into(self, addr, register, buf):
+        if self.recording:
+            self.buffers[id(buf)] = buf
+        BMP280Registers.readfrom_mem_into(self, addr, register, buf)  # super() would allocate
+
+    def writeto_mem(self, addr, register, data):
+        if self.recording:
+            self.buffers[id(data)] = data
+
+
+def allocated(op):
+    """Bytes one call of op allocates."""
+    if MICROPYTHON:
+        gc.collect()
+        gc.disable()
+        before = gc.mem_alloc()
+        for _ in range(CALLS):
+            op()
+        used = gc.mem_alloc() - before
+        gc.enable()
+        return used // CALLS
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return max(0, peak - before - _overhead)
+
+
+_overhead = 0
+if not MICROPYTHON:
+    _overhead = allocated(lambda: None)  # The call and tracemalloc's own bookkeeping
+
+
+def bus_path(sensor):
+    # The transfers of one forced-mode read_all(), without the compensation maths
+    def transfers():
+        sensor.trigger()
+        sensor._read_register(0xF3)
+        sensor._read_register(0xF7, 6)
+    return transfers
+
+
+def measure(no_alloc):
+    i2c = RecordingI2C()
+    sensor = bmp280.BMP280(i2c, no_alloc=no_alloc, profile='weather')
+    for _ in range(WARMUP):
+        sensor.read_all()
+    i2c.recording = True
+    i2c.new_bytes = 0
+    for _ in range(WARMUP):
+        sensor.read_all()
+    i2c.recording = False
+    return {
+        'buffers': len(i2c.buffers),
+        'new_bytes': i2c.new_bytes,
+        'bus': allocated(bus_path(sensor)),
+        'read_all': allocated(sensor.read_all),
+    }
+
+
+def main():
+    failures = []
+    print('bytes per call on {}'.format(sys.implementation.name))
+    print('mode      buffers  readfrom_mem  bus B  read_all B')
+    results = {}
+    for no_alloc in (False, True):
+        r = results[no_alloc] = measure(no_alloc)
+        print('{:<8}  {:>7}  {:>12}  {:>5}  {:>10}'.format(
+            'no_alloc' if no_alloc else 'default', r['buffers'], r['new_bytes'], r['bus'], r['read_all']))
+    default, r = results[False], results[True]
+    if r['new_bytes']:
+        failures.append('readfrom_mem() called {} times'.format(r['new_bytes']))
+    if r['buffers'] > 3:  # 1-byte view, 6-byte view, write byte
+        failures.append('{} distinct bus buffers, expected at most 3'.format(r['buffers']))
+    if r['bus']:
+        failures.append('no_alloc bus transfers allocated {} B'.format(r['bus']))
+    if not default['bus']:
+        failures.append('default bus transfers allocated nothing; the measurement is blind')
+    if r['read_all'] >= default['read_all']:
+        failures.append('no_alloc read_all() allocated {} B, default {} B'.format(
+            r['read_all'], default['read_all']))
+    for failure in failures:
+        print('FAIL', failure)
+    sys.exit(1 if failures else 0)
+
+
+main()
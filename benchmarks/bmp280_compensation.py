@@ -0,0 +1,103 @@
+"""Per-sample cost of the BMP280 compensation backends.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/bmp280_compensation.py
+
+Before timing, every backend is checked with the datasheet calibration
+example against reference values it did not compute: the example's published
+result (section 8.2), and readings across the sensor's range run through the
+datasheet's floating-point formulas as written in the simulated BMP280
+(sim/devices.py).
+"""
+import sys
+
+sys.path[:0] = ['Final_Project/lib', '.']
+import bmp280
+from sim import devices
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+# (adc_T, adc_P) from cold and high to warm and low
+READINGS = (
+    (470000, 350000),
+    (560000, 500000),
+    (450000, 580000),
+    (430000, 760000),
+    (500000, 800000),
+)
+
+
+def reference():
+    """(adc_T, adc_P, temperature degC, pressure hPa) to check against."""
+    adc_T, adc_P, temperature, pressure = devices.DATASHEET_EXAMPLE
+    golden = [(adc_T, adc_P, temperature, pressure / 100)]
+    model = devices.BMP280(None, None)
+    for adc_T, adc_P in READINGS:
+        t_fine = model._t_fine(adc_T)
+        golden.append((adc_T, adc_P, t_fine / 5120.0, model._pressure_pa(adc_P, t_fine) / 100))
+    return golden
+
+
+GOLDEN = reference()
+
+# Largest accepted deviation from the reference, per backend. The integer
+# routines return 0.01 degC steps, and the datasheet rounds its example to
+# 0.01 degC, so every backend is allowed half a step in temperature.
+TOLERANCE = {
+    bmp280.COMP_INT64: (0.005, 0.001),  # 1/256 Pa resolution
+    bmp280.COMP_INT32: (0.005, 0.05),   # 1 Pa resolution, coarser intermediates
+    bmp280.COMP_FLOAT: (0.005, 0.001),
+}
+
+NAMES = {
+    bmp280.COMP_INT64: 'int64',
+    bmp280.COMP_INT32: 'int32',
+    bmp280.COMP_FLOAT: 'float',
+}
+
+ITERATIONS = 2000
+
+
+def check(sensor, backend):
+    t_tol, p_tol = TOLERANCE[backend]
+    worst_t = worst_p = 0.0
+    for adc_T, adc_P, temperature, pressure in GOLDEN:
+        worst_t = max(worst_t, abs(sensor._compensate_temperature(adc_T) - temperature))
+        worst_p = max(worst_p, abs(sensor._compensate_pressure(adc_P) - pressure))
+    ok = worst_t <= t_tol + 1e-9 and worst_p <= p_tol + 1e-9
+    return ok, worst_t, worst_p
+
+
+def bench(sensor):
+    start = ticks_us()
+    for i in range(ITERATIONS):
+        adc_T, adc_P = GOLDEN[i % len(GOLDEN)][:2]
+        sensor._compensate_temperature(adc_T)
+        sensor._compensate_pressure(adc_P)
+    return ticks_diff(ticks_us(), start) / ITERATIONS
+
+
+def main():
+    failed = False
+    print('backend  max dT (C)  max dP (hPa)  us/sample')
+    for backend in (bmp280.COMP_INT64, bmp280.COMP_INT32, bmp280.COMP_FLOAT):
+        sensor = bmp280.BMP280(devices.BMP280Registers(), compensation=backend)
+        ok, worst_t, worst_p = check(sensor, backend)
+        failed = failed or not ok
+        print('{:<8} {:>10.4f}  {:>12.4f}  {:>9.2f}{}'.format(
+            NAMES[backend], worst_t, worst_p, bench(sensor), '' if ok else '  OUT OF TOLERANCE'))
+    if failed:
+        sys.exit(1)
+
+
+main()
@@ -0,0 +1,65 @@
+"""Check that command long polling and reports share one Telegram connection.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/commands_connection.py [Final_Project/boot.py]
+
+Runs the station script on the simulated board (sim/) for HOURS of virtual
+time with its default sinks, once with COMMANDS off and once with it on,
+while someone sends /now a few times. A report sent while the getUpdates
+long poll is in flight would abandon the poll and reconnect, a TLS
+handshake each time. The script checks that with commands on:
+
+  - the client opens no more connections than with commands off, and
+    abandons no request
+  - every report still goes out and every /now is answered
+
+Exits with status 1 if a check fails. Files are written to a temporary
+directory.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+import sim
+
+HOURS = 4
+CHAT_ID = '1706011784'
+COMMANDS_AT_S = (600, 3600, 9000, 12600)
+
+
+def run(path, commands):
+    os.chdir(tempfile.mkdtemp())  # Backlog, log and offset files land here
+    board = sim.station()
+    for at in COMMANDS_AT_S:
+        board.clock.at(at, lambda: board.telegram.push_update('/now', CHAT_ID))
+    sim.run(path, seconds=HOURS * 3600, board=board, quiet=True, config={'COMMANDS': commands})
+    return board
+
+
+def main():
+    path = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else 'Final_Project/boot.py')
+    failures = []
+    print('commands  messages  client stats')
+    runs = {}
+    for commands in (False, True):
+        board = run(path, commands)
+        stats = board.script.telegram.stats
+        runs[commands] = (stats, len(board.telegram.messages))
+        print('{:<8}  {:>8}  {}'.format('on' if commands else 'off', len(board.telegram.messages), stats))
+    (base, reports), (stats, messages) = runs[False], runs[True]
+    if stats.connects > base.connects:
+        failures.append('{} connects with commands on, {} without'.format(stats.connects, base.connects))
+    if stats.abandoned:
+        failures.append('{} requests abandoned'.format(stats.abandoned))
+    if messages != reports + len(COMMANDS_AT_S):
+        failures.append('{} messages, expected {} reports and {} replies'.format(
+            messages, reports, len(COMMANDS_AT_S)))
+    for failure in failures:
+        print('FAIL', failure)
+    sys.exit(1 if failures else 0)
+
+
+main()
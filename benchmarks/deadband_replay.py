@@ -0,0 +1,86 @@
+"""Replay a sample trace through deadband.ChangeFilter and count suppressed sends.
+
+    python benchmarks/deadband_replay.py [trace.csv]
+
+A trace is one reading per line:
+
+    timestamp,temperature,humidity,pressure,altitude,dark,rain,air_bad
+
+(the flags as 0/1), e.g. collected from the station's serial output. Without
+a file, a synthetic 24 h trace at the 60 s report cadence is generated: a
+diurnal temperature and humidity swing quantised to whole units like the
+DHT11, with +-1 flicker, a slow pressure front, an afternoon of rain and
+a few bad-air spells.
+"""
+import math
+import random
+import sys
+
+sys.path.insert(0, 'Final_Project/lib')
+from deadband import ChangeFilter
+from sample import Sample
+
+PERIOD_S = 60
+HOURS = 24
+
+
+def synthetic_trace():
+    random.seed(7)
+    samples = []
+    for i in range(HOURS * 3600 // PERIOD_S):
+        t = i * PERIOD_S
+        day = math.sin(2 * math.pi * (t / 86400 - 0.25))  # Peak mid afternoon
+        temperature = round(24 + 5 * day + random.choice((-1, 0, 0, 0, 1)))
+        humidity = round(55 - 15 * day + random.choice((-1, 0, 0, 0, 1)))
+        pressure = 1012 - 4 * t / 86400 + random.uniform(-0.12, 0.12)
+        hour = t // 3600
+        samples.append(Sample(temperature, humidity, pressure, 44.3 * (1013.25 - pressure) / 5.3,
+                              dark=hour < 6 or hour >= 19, rain=14 <= hour < 17,
+                              air_bad=hour in (8, 18) and t % 3600 < 1200, timestamp=t))
+    return samples
+
+
+def load_trace(path):
+    samples = []
+    with open(path) as f:
+        for line in f:
+            fields = line.strip().split(',')
+            if len(fields) != 8 or not fields[0].isdigit():
+                continue  # Header or blank line
+            ts, temperature, humidity, pressure, altitude = fields[:5]
+            dark, rain, air_bad = (flag.strip() == '1' for flag in fields[5:])
+            samples.append(Sample(float(temperature), float(humidity), float(pressure),
+                                  float(altitude), dark, rain, air_bad, int(ts)))
+    return samples
+
+
+# (label, ChangeFilter arguments). The DHT11 reports whole degrees and
+# percent, so a 0.5 degC band passes every one-count flicker.
+CONFIGS = (
+    ('default bands', {}),
+    ('DHT11 bands', {'temperature': 1.5, 'humidity': 3}),
+)
+
+
+def replay(samples, **bands):
+    changes = ChangeFilter(**bands)
+    reasons = {}
+    for sample in samples:
+        if changes.due(sample):
+            reasons[changes.reason] = reasons.get(changes.reason, 0) + 1
+    return changes, reasons
+
+
+def main():
+    samples = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    total = len(samples)
+    for label, bands in CONFIGS:
+        changes, reasons = replay(samples, **bands)
+        print('{}: {} readings, {} sent, {} suppressed ({:.0f}% fewer messages)'.format(
+            label, total, changes.passed, changes.suppressed,
+            100 * changes.suppressed / total if total else 0))
+        for reason in sorted(reasons):
+            print('  {:<12} {}'.format(reason, reasons[reason]))
+
+
+main()
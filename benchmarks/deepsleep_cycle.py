@@ -0,0 +1,108 @@
+"""Simulate a station script in deep-sleep mode and check its wake budget.
+
+    python benchmarks/deepsleep_cycle.py [Final_Project/boot.py]
+
+The script runs unchanged on the simulated board (sim/): every wake
+re-imports it and its lib modules, like a deep-sleep reset, and RTC memory
+is kept between wakes. The virtual clock counts the host's own run time
+plus every simulated wait: the DHT11 read, BMP280 conversions, the Wi-Fi
+join and each Telegram request. The DHT11 temperature steps every wake so
+that every report passes the deadbands. One report wake runs with the
+access point down, so the backlog has to carry over to the next report;
+that wake waits out the script's own Wi-Fi timeout, which has to fit in
+its report budget. Reports go to two chats and a serial log, and each chat has to get every
+report. The LCD sink only has its backlight switched off before each
+sleep; after the first boot's init no wake may send it an instruction.
+
+The script prints the awake time of every wake and exits non-zero if a
+wake went over WAKE_BUDGET_MS / REPORT_BUDGET_MS or the carried state is
+wrong. Files are written to a temporary directory.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+import sim
+
+WAKES = 24
+DEEP_SLEEP_MS = 10000
+SEND_INTERVAL_MS = 60000
+OUTAGE_REPORT = 2       # The report wake (counted from 1) that finds no AP
+CHATS = ('1706011784', '-1002342228163')
+SINKS = tuple(('telegram', chat, SEND_INTERVAL_MS) for chat in CHATS) + (
+    ('serial', None, SEND_INTERVAL_MS), ('lcd', None, None))
+
+
+def main():
+    path = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else 'Final_Project/boot.py')
+    os.chdir(tempfile.mkdtemp())  # Backlog and Wi-Fi cache files land here
+    per_report = SEND_INTERVAL_MS // DEEP_SLEEP_MS
+
+    board = sim.station(sim.Clock(cpu_scale=1.0))
+    board.dht[23].temperature = lambda t: 15 + int(t * 1000 // DEEP_SLEEP_MS) % 12
+    ap = board.access_points[0]
+    lcd = board.device(0, 0x3F)
+    instructions = []  # LCD instructions sent before each boot
+
+    def configure(station):
+        instructions.append(lcd.instructions)
+
+    def outage(down):
+        def switch():
+            ap.reachable = not down
+        return switch
+
+    # Wake n starts about (n - 1) sleep periods in; take the AP away around that report
+    outage_s = (OUTAGE_REPORT * per_report - 1) * DEEP_SLEEP_MS / 1000
+    board.clock.at(outage_s - DEEP_SLEEP_MS / 2000, outage(True))
+    board.clock.at(outage_s + DEEP_SLEEP_MS / 2000, outage(False))
+    sim.run(path, wakes=WAKES, board=board, quiet=True, setup=configure,
+            config={'DEEP_SLEEP_MS': DEEP_SLEEP_MS, 'SINKS': SINKS})
+    station = board.script
+
+    failures = []
+    awake_total = 0
+    print('wake  kind    awake ms  budget  sleep ms')
+    for wake, (awake, slept_ms) in enumerate(board.sleeps, 1):
+        awake = int(awake)
+        awake_total += awake
+        reporting = wake % per_report == 0
+        budget = station.REPORT_BUDGET_MS if reporting else station.WAKE_BUDGET_MS
+        kind = 'report' if reporting else 'sample'
+        if reporting and wake // per_report == OUTAGE_REPORT:
+            kind = 'no AP'
+        print('{:>4}  {:<6}  {:>8}  {:>6}  {:>8}'.format(wake, kind, awake, budget, slept_ms))
+        if awake > budget:
+            failures.append('wake {}: {} ms awake, budget {} ms'.format(wake, awake, budget))
+    if len(board.sleeps) != WAKES:
+        failures.append('{} deep sleeps, expected {}'.format(len(board.sleeps), WAKES))
+
+    from dutycycle import SleepState
+    state = SleepState.load(board.rtc_memory)
+    reports = WAKES // per_report
+    messages = board.telegram.messages
+    print('{} wakes, {} messages for {} reports to {} chats, {:.1f}% awake, {} bytes of RTC memory'.format(
+        state.wakes, len(messages), reports, len(CHATS), 100 * awake_total / (WAKES * DEEP_SLEEP_MS),
+        len(board.rtc_memory)))
+    if state.wakes != WAKES:
+        failures.append('RTC state counted {} wakes'.format(state.wakes))
+    if state.overruns:
+        failures.append('RTC state counted {} budget overruns'.format(state.overruns))
+    if state.backlog:
+        failures.append('{} reports left in the backlog'.format(state.backlog))
+    woken = [after - before for before, after in zip(instructions[1:], instructions[2:] + [lcd.instructions])]
+    if any(woken) or lcd.backlight:
+        failures.append('LCD sent {} instructions after the first wake, backlight {}'.format(
+            sum(woken), 'on' if lcd.backlight else 'off'))
+    for chat in CHATS:  # The outage report is replayed before the next one
+        sent = len([message for message in messages if message['chat_id'] == chat])
+        if sent != reports:
+            failures.append('{} messages sent to {}, expected {}'.format(sent, chat, reports))
+    for failure in failures:
+        print('FAIL', failure)
+    sys.exit(1 if failures else 0)
+
+
+main()
@@ -0,0 +1,239 @@
+"""Micro-benchmarks of the driver and pipeline hot paths, with a regression gate.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/hotpaths.py [--update] [--threshold 0.25] [--only PREFIX] [BASELINE]
+
+Every case runs against the simulated board (sim/), so bus traffic goes
+through the BMP280 and LCD models and driver sleeps cost virtual time, not
+host time. For each case the suite prints:
+
+  ops/s   host operations per second, best of REPEATS timed runs
+  B/op    heap allocated per operation: gc.mem_alloc() growth with the
+          collector off on MicroPython, the tracemalloc peak of one
+          operation on CPython
+  bus/op  I2C transactions per operation
+
+Results are compared with BASELINE (default benchmarks/baseline.json),
+which holds one set of numbers per implementation (cpython, micropython)
+and the default threshold. A case regresses when ops/s drops, or B/op
+grows, by more than the threshold, or when it needs any extra bus
+transaction, and still does when measured again; the suite then exits
+with status 1. --update writes the current numbers as the new baseline
+instead. ops/s depends on the host, so refresh the baseline on the
+machine that runs the gate.
+"""
+import gc
+import json
+import sys
+
+try:
+    from time import ticks_us, ticks_diff  # Taken before sim replaces time
+except ImportError:
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(end, start):
+        return end - start
+
+sys.path[:0] = ['Final_Project/lib', '.']  # The firmware's drivers, then sim/
+import sim
+
+MICROPYTHON = sys.implementation.name == 'micropython'
+if not MICROPYTHON:
+    import tracemalloc
+
+BASELINE = 'benchmarks/baseline.json'
+THRESHOLD = 0.25      # Used when the baseline file has none
+MIN_RUN_US = 20000    # Each timed run lasts at least this long
+REPEATS = 15          # Best run wins: short runs dodge scheduler noise
+ALLOC_OPS = 50        # Operations per allocation measurement
+BYTES_SLACK = 16      # B/op changes below this are never a regression
+TEXT = 'Temperature: 25C'  # One full 16-character LCD row
+
+
+def cases(board):
+    """(name, operation) pairs; each operation is a no-argument callable."""
+    import bmp280
+    from lcd_i2c import I2cLcd
+    from machine import I2C
+    from aggregate import SampleWindow
+    from sample import Sample
+
+    adc_t, adc_p = 519888, 415148  # Datasheet example raw values
+    for name, backend in (('int64', bmp280.COMP_INT64), ('int32', bmp280.COMP_INT32),
+                          ('float', bmp280.COMP_FLOAT)):
+        sensor = bmp280.BMP280(I2C(1), compensation=backend)
+        sensor._compensate_temperature(adc_t)  # Sets t_fine
+        yield 'bmp280.compensate_pressure.' + name, lambda c=sensor._compensate_pressure: c(adc_p)
+
+    sensor = bmp280.BMP280(I2C(1), no_alloc=True, profile='weather')
+    yield 'bmp280.read_all', sensor.read_all
+
+    for mode, fast in (('slow', False), ('fast', True)):
+        lcd = I2cLcd(I2C(0), 0x3F, 2, 16, fast=fast)
+        yield 'lcd.putstr.' + mode, lambda lcd=lcd: lcd.putstr(TEXT)
+
+    station = sim.load('Final_Project/boot.py', board)
+    window = SampleWindow()
+    for i in range(30):
+        window.add(Sample(22 + i % 3, 55 + i % 5, 1012.8 + i / 100, 120.3, rain=i > 20))
+    summary = window.close()
+    batch = [Sample(20 + i, 50 + i, 1010 + i, 120.3) for i in range(5)]
+    chat_id = station.GROUP_CHAT_ID  # The outboxes render for their chat, not the Renderer's default
+    yield 'render.message', lambda: station.format_message(summary, chat_id)
+    yield 'render.batch', lambda: station.format_batch(batch, chat_id)
+    yield 'station.read_render', lambda: station.format_message(station.read_sensors(), chat_id)
+
+
+def transactions(board):
+    return sum(stats.transactions for stats in board.bus_stats.values())
+
+
+def timed(op, count):
+    start = ticks_us()
+    for _ in range(count):
+        op()
+    return ticks_diff(ticks_us(), start)
+
+
+def allocated(op):
+    if MICROPYTHON:
+        gc.collect()
+        gc.disable()
+        before = gc.mem_alloc()
+        for _ in range(ALLOC_OPS):
+            op()
+        used = gc.mem_alloc() - before
+        gc.enable()
+        return used / ALLOC_OPS
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def measure(board, op):
+    op()  # Warm up buffers and caches
+    count = 1
+    while True:
+        us = timed(op, count)
+        if us >= MIN_RUN_US:
+            break
+        count *= 2
+    best = us
+    for _ in range(REPEATS - 1):
+        best = min(best, timed(op, count))
+    before = transactions(board)
+    op()
+    bus = transactions(board) - before
+    return {
+        'ops_per_s': int(count * 1000000 / max(best, 1)),
+        'bytes_per_op': round(allocated(op), 1),
+        'bus_per_op': bus,
+    }
+
+
+def compare(result, base, threshold):
+    """Regressions of result against base, as short notes."""
+    notes = []
+    if result['ops_per_s'] < base['ops_per_s'] * (1 - threshold):
+        notes.append('ops/s {} < {}'.format(result['ops_per_s'], base['ops_per_s']))
+    if result['bytes_per_op'] > base['bytes_per_op'] * (1 + threshold) + BYTES_SLACK:
+        notes.append('B/op {} > {}'.format(result['bytes_per_op'], base['bytes_per_op']))
+    if result['bus_per_op'] > base['bus_per_op']:
+        notes.append('bus/op {} > {}'.format(result['bus_per_op'], base['bus_per_op']))
+    return notes
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except OSError:
+        return {}
+
+
+def save_baseline(path, baseline):
+    # One case per line, so a baseline update reads well in a diff
+    lines = ['{', '  "threshold": {},'.format(json.dumps(baseline.get('threshold', THRESHOLD)))]
+    keys = [key for key in sorted(baseline) if key != 'threshold']
+    for i, key in enumerate(keys):
+        lines.append('  {}: {{'.format(json.dumps(key)))
+        names = sorted(baseline[key])
+        for j, name in enumerate(names):
+            r = baseline[key][name]
+            lines.append('    {}: {{"ops_per_s": {}, "bytes_per_op": {}, "bus_per_op": {}}}{}'.format(
+                json.dumps(name), r['ops_per_s'], r['bytes_per_op'], r['bus_per_op'],
+                ',' if j < len(names) - 1 else ''))
+        lines.append('  }' + (',' if i < len(keys) - 1 else ''))
+    lines.append('}')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def main(argv):
+    path = BASELINE
+    update = False
+    threshold = None
+    only = ''
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--update':
+            update = True
+        elif arg == '--threshold':
+            threshold = float(args.pop(0))
+        elif arg == '--only':
+            only = args.pop(0)
+        elif arg.startswith('-'):
+            sys.exit(__doc__)
+        else:
+            path = arg
+
+    baseline = load_baseline(path)
+    if threshold is None:
+        threshold = baseline.get('threshold', THRESHOLD)
+    implementation = sys.implementation.name
+    base = baseline.get(implementation, {})
+
+    board = sim.install()
+    results = {}
+    regressions = 0
+    print('{:<34} {:>9} {:>8} {:>6}  vs baseline ({}, threshold {}%)'.format(
+        'case', 'ops/s', 'B/op', 'bus/op', implementation, round(threshold * 100)))
+    for name, op in cases(board):
+        if not name.startswith(only):
+            continue
+        result = results[name] = measure(board, op)
+        if name not in base:
+            verdict = 'new'
+        else:
+            notes = compare(result, base[name], threshold)
+            if notes:  # Timing noise rarely strikes twice; a real regression does
+                result = results[name] = measure(board, op)
+                notes = compare(result, base[name], threshold)
+            change = round(100 * (result['ops_per_s'] / max(base[name]['ops_per_s'], 1) - 1))
+            verdict = '{}{}% ops/s'.format('+' if change >= 0 else '', change)
+            if notes:
+                regressions += 1
+                verdict += '  REGRESSION: ' + ', '.join(notes)
+        print('{:<34} {:>9} {:>8} {:>6}  {}'.format(
+            name, result['ops_per_s'], result['bytes_per_op'], result['bus_per_op'], verdict))
+
+    if update:
+        base.update(results)
+        baseline[implementation] = base
+        baseline.setdefault('threshold', threshold)
+        save_baseline(path, baseline)
+        print('baseline written to', path)
+        return 0
+    return 1 if regressions else 0
+
+
+sys.exit(main(sys.argv[1:]))
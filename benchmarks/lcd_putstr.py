@@ -0,0 +1,63 @@
+"""Bus transactions and sleep time per I2cLcd.putstr(), slow vs fast mode.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/lcd_putstr.py
+
+The fake bus only counts writeto calls; sleeps are counted instead of taken,
+so the reported time is what the driver would spend sleeping on the device.
+"""
+import sys
+import time
+
+if not hasattr(time, 'sleep_ms'):  # CPython: give lcd_i2c something to import
+    time.sleep_ms = lambda ms: None
+    time.sleep_us = lambda us: None
+
+sys.path.insert(0, 'Final_Project/lib')
+import lcd_i2c
+
+TEXT = 'Temperature: 25C'  # One full 16-character row
+
+
+class CountingI2C:
+    def __init__(self):
+        self.transactions = 0
+        self.bytes = 0
+
+    def writeto(self, addr, buf):
+        self.transactions += 1
+        self.bytes += len(buf)
+
+
+class SleepCounter:
+    def __init__(self):
+        self.us = 0
+
+    def sleep_ms(self, ms):
+        self.us += ms * 1000
+
+    def sleep_us(self, us):
+        self.us += us
+
+
+def measure(fast):
+    bus = CountingI2C()
+    lcd = lcd_i2c.I2cLcd(bus, 0x27, 2, 16, fast=fast)
+    sleeps = SleepCounter()
+    lcd_i2c.sleep_ms = sleeps.sleep_ms
+    lcd_i2c.sleep_us = sleeps.sleep_us
+    bus.transactions = bus.bytes = 0
+    lcd.set_cursor(0, 0)
+    lcd.putstr(TEXT)
+    return bus.transactions, bus.bytes, sleeps.us
+
+
+def main():
+    print('mode  writeto  bytes  sleep (us)   per {}-char putstr'.format(len(TEXT)))
+    for fast in (False, True):
+        transactions, nbytes, slept = measure(fast)
+        print('{:<5} {:>7}  {:>5}  {:>10}'.format('fast' if fast else 'slow', transactions, nbytes, slept))
+
+
+main()
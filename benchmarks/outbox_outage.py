@@ -0,0 +1,136 @@
+"""Check Outbox retries, coalescing and spilling through a Bot API outage.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/outbox_outage.py
+
+An Outbox sends through uplink.TelegramClient to the simulated Bot API
+(sim/), whose fail(n) answers the next n requests with 502. A report is
+queued every REPORT_MS and the outbox pumped every STEP_MS of virtual
+time until the API recovers. The script checks, with and without a spill
+log:
+
+  backoff   each retry starts base_delay_ms << (failures - 1) after the
+            failed request returned (within one pump step)
+  recovery  the RAM backlog goes out as one coalesced message, oldest
+            report first; with a spill log the spilled reports are
+            replayed first, in one message of their own
+  counters  sent, delivered and retries match, and reports evicted from
+            the full queue are counted as dropped, or as spilled when
+            there is a spill log
+
+Exits with status 1 if a check fails. Spill files go to a temporary
+directory.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+import sim
+
+sim.install()
+sys.path.insert(0, 'Final_Project/lib')
+import network
+import outbox
+import ringlog
+import uplink
+
+CHAT_ID = '1706011784'
+FAILURES = 4       # Requests the API answers with 502
+REPORTS = 8        # Reports queued during the outage
+REPORT_MS = 10000
+STEP_MS = 100
+CAPACITY = 4
+BASE_DELAY_MS = 5000
+
+
+def online(board):
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    wlan.connect(board.access_points[0].ssid)
+    while not wlan.isconnected():
+        board.clock.advance(STEP_MS)
+
+
+def run(spill):
+    board = sim.install(sim.station())
+    clock = board.clock
+    online(board)
+    client = uplink.TelegramClient('TOKEN')
+    attempts = []  # (start ms, end ms, delivered)
+
+    def send(text):
+        start = clock.now_ms()
+        status, _ = client.send_message(CHAT_ID, text)
+        attempts.append((start, clock.now_ms(), status == 200))
+        return status == 200
+
+    box = outbox.Outbox(send, lambda n: 'report {}'.format(n),
+                        lambda reports: 'reports ' + ' '.join(str(n) for n in reports),
+                        capacity=CAPACITY, base_delay_ms=BASE_DELAY_MS, spill=spill)
+    board.telegram.fail(FAILURES)
+    start = clock.now_ms()
+    queued = 0
+    while not (queued == REPORTS and box.count == 0 and not (spill and spill.pending)):
+        if queued < REPORTS and clock.now_ms() - start >= queued * REPORT_MS:
+            box.put(queued)
+            queued += 1
+        box.pump()
+        clock.advance(STEP_MS)
+        if clock.now_ms() - start > 3600000:
+            break  # Never recovered; the checks below report it
+    return box, attempts, board.telegram.texts()
+
+
+def check(name, box, attempts, texts, spill):
+    failures = []
+    failed = [a for a in attempts if not a[2]]
+    if len(failed) != FAILURES:
+        failures.append('{} failed requests, expected {}'.format(len(failed), FAILURES))
+    for i in range(1, min(len(attempts), FAILURES + 1)):
+        expected = BASE_DELAY_MS << (i - 1)
+        waited = attempts[i][0] - attempts[i - 1][1]
+        print('  retry {}: {:>6.0f} ms after the failure, backoff {} ms'.format(i, waited, expected))
+        if not expected <= waited <= expected + STEP_MS:
+            failures.append('retry {} after {:.0f} ms, expected {} ms'.format(i, waited, expected))
+
+    evicted = REPORTS - CAPACITY
+    oldest_kept = list(range(evicted, REPORTS))
+    if spill is None:
+        expected_texts = ['reports ' + ' '.join(str(n) for n in oldest_kept)]
+        counters = {'sent': 1, 'delivered': CAPACITY, 'dropped': evicted, 'spilled': 0}
+    else:
+        expected_texts = ['reports ' + ' '.join(str(n) for n in range(evicted)),
+                          'reports ' + ' '.join(str(n) for n in oldest_kept)]
+        counters = {'sent': 2, 'delivered': REPORTS, 'dropped': 0, 'spilled': evicted}
+        if spill.pending:
+            failures.append('{} reports left in the spill log'.format(spill.pending))
+    counters['retries'] = FAILURES
+    print('  messages: {}'.format(texts))
+    print('  outbox:   {}'.format(box))
+    if texts != expected_texts:
+        failures.append('messages {}, expected {}'.format(texts, expected_texts))
+    for counter, expected in counters.items():
+        if getattr(box, counter) != expected:
+            failures.append('{} = {}, expected {}'.format(counter, getattr(box, counter), expected))
+    return [name + ': ' + failure for failure in failures]
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    failures = []
+    for name in ('no spill', 'spill'):
+        spill = None
+        if name == 'spill':
+            spill = ringlog.RingLog('backlog.bin', 'i', 16,
+                                    encode=lambda n: (n,), decode=lambda payload: payload[0])
+        print(name)
+        box, attempts, texts = run(spill)
+        failures += check(name, box, attempts, texts, spill)
+    for failure in failures:
+        print('FAIL', failure)
+    sys.exit(1 if failures else 0)
+
+
+main()
@@ -0,0 +1,57 @@
+"""Cost of profiler.stage() wrapping, and a sample stage report.
+
+    python benchmarks/profiler_overhead.py
+
+Times CALLS calls of a small function bare, under a disabled Profiler and
+under an enabled one, then profiles a few lib stages (building a Sample,
+adding it to a SampleWindow, packing a flash record). CPython has no
+gc.mem_alloc(), so tracemalloc stands in for it; byte counts are CPython's
+and only comparable with each other, not with the ESP32. CPython also
+frees memory as soon as it is unreferenced, so a stage that drops as much
+as it allocates shows up under gc= here.
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, 'Final_Project/lib')
+from aggregate import SampleWindow
+from profiler import Profiler
+from sample import Sample
+
+CALLS = 200000
+
+
+def work(x):
+    return x + 1
+
+
+def per_call_ns(fn):
+    start = time.perf_counter()
+    for i in range(CALLS):
+        fn(i)
+    return (time.perf_counter() - start) * 1e9 / CALLS
+
+
+def main():
+    bare = per_call_ns(work)
+    off = per_call_ns(Profiler(enabled=False).stage('work')(work))
+    on = per_call_ns(Profiler().stage('work')(work))
+    print('per call: bare {:.0f} ns, disabled {:.0f} ns, enabled {:.0f} ns'.format(bare, off, on))
+
+    tracemalloc.start()
+    gc.mem_alloc = lambda: tracemalloc.get_traced_memory()[0]
+    profiler = Profiler()
+    window = SampleWindow()
+    make = profiler.stage('sample')(lambda i: Sample(20 + i % 5, 50, 1013.25, 12.0, rain=i % 7 == 0))
+    add = profiler.stage('window')(window.add)
+    pack = profiler.stage('record')(Sample.to_record)
+    for i in range(1000):
+        sample = make(i)
+        add(sample)
+        pack(sample)
+    print(profiler.report())
+
+
+main()
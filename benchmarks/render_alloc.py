@@ -0,0 +1,142 @@
+"""Heap and time per report: f-string + json.dumps versus render.Renderer.
+
+    python benchmarks/render_alloc.py
+
+The old path formats the station message as an f-string, wraps it in a dict
+and serialises it with json.dumps (ensure_ascii=False, as ujson does), then
+encodes it; the new one renders the same text, envelope included, into the
+Renderer's reused buffer. For each path the script prints the mean time per
+report, the peak of short-lived heap during one report (tracemalloc) and the
+bytes still held afterwards. Byte counts are CPython's; on the ESP32 the
+objects are smaller but the ratio between the paths is what matters.
+
+The station's outboxes render for their own chat (render(..., chat_id)),
+so that path is measured too. Its envelope prefix is a short-lived bytes
+object that the peak does not show, so the script also counts envelopes
+built per report once the chat has been seen, and exits with status 1
+unless that is 0.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, 'Final_Project/lib')
+import render
+from aggregate import SampleWindow
+from render import Renderer, Template, Fixed, Choice, When
+from sample import Sample
+
+RUNS = 20000
+CHAT_ID = '1706011784'
+GROUP_CHAT_ID = '-1002342228163'
+
+
+def spread_text(sample, field):
+    if sample.window is None:
+        return ""
+    stats = getattr(sample.window, field)
+    return f" ({stats.min:.1f}–{stats.max:.1f}, σ {stats.stddev:.1f})"
+
+
+def fstring_json(sample):
+    text = (f"🌤Weather Station\n"
+            f"------------------------------\n"
+            f"🌡Temperature: {sample.temperature:.1f} °C{spread_text(sample, 'temperature')}\n"
+            f"💧Humidity: {sample.humidity:.0f} %{spread_text(sample, 'humidity')}\n"
+            f"📏Pressure: {sample.pressure:.2f} hPa{spread_text(sample, 'pressure')}\n"
+            f"🏔Altitude: {sample.altitude:.2f} m\n"
+            f"💡Light Status: {'🌙 Dark' if sample.dark else '☀️ Light'}\n"
+            f"🌧Rain Detected: {'☔️ Yes' if sample.rain else '🌞 No'}\n"
+            f"🌱Air Quality: {'🚫 Bad' if sample.air_bad else '😊 Good'}\n"
+            f"------------------------------\n"
+            f"Have a great day! 😊")
+    body = json.dumps({
+        'chat_id': CHAT_ID,
+        'text': text,
+        'parse_mode': 'HTML',
+        'disable_web_page_preview': True,
+    }, ensure_ascii=False)
+    return body.encode()
+
+
+def spread(field):
+    return When(lambda sample: sample.window and getattr(sample.window, field),
+                " (", Fixed(lambda stats: stats.min, 1), "–", Fixed(lambda stats: stats.max, 1),
+                ", σ ", Fixed(lambda stats: stats.stddev, 1), ")")
+
+
+MESSAGE = Template(
+    "🌤Weather Station\n"
+    "------------------------------\n"
+    "🌡Temperature: ", Fixed(lambda s: s.temperature, 1), " °C", spread('temperature'),
+    "\n💧Humidity: ", Fixed(lambda s: s.humidity, 0), " %", spread('humidity'),
+    "\n📏Pressure: ", Fixed(lambda s: s.pressure, 2), " hPa", spread('pressure'),
+    "\n🏔Altitude: ", Fixed(lambda s: s.altitude, 2), " m"
+    "\n💡Light Status: ", Choice(lambda s: s.dark, "🌙 Dark", "☀️ Light"),
+    "\n🌧Rain Detected: ", Choice(lambda s: s.rain, "☔️ Yes", "🌞 No"),
+    "\n🌱Air Quality: ", Choice(lambda s: s.air_bad, "🚫 Bad", "😊 Good"),
+    "\n------------------------------\n"
+    "Have a great day! 😊")
+
+
+def summary():
+    window = SampleWindow()
+    for i in range(30):
+        window.add(Sample(22 + i % 3, 55 + i % 5, 1012.8 + i / 100, 120.3, rain=i > 20))
+    return window.close()
+
+
+def measure(label, render, sample):
+    render(sample)  # Warm up caches and the renderer buffer
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        render(sample)
+    us = (time.perf_counter() - start) * 1e6 / RUNS
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    body = render(sample)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<16} {:>7.1f} us  peak {:>5} B  held {:>5} B  body {} B'.format(
+        label, us, peak - before, current - before, len(body)))
+    return bytes(body)
+
+
+def envelopes(renderer, sample):
+    # JSON escapes (render._escape calls) in one report for GROUP_CHAT_ID
+    escape = render._escape
+    count = [0]
+
+    def counting(text):
+        count[0] += 1
+        return escape(text)
+    render._escape = counting
+    try:
+        renderer.render(MESSAGE, sample, GROUP_CHAT_ID)
+    finally:
+        render._escape = escape
+    return count[0]
+
+
+def main():
+    failed = False
+    renderer = Renderer(CHAT_ID)
+    for name, sample in (('reading', Sample(24, 40, 1013.27, 12.5, dark=True)), ('window', summary())):
+        print(name)
+        old = measure('  f-string+json', fstring_json, sample)
+        new = measure('  Renderer', lambda s: renderer.render(MESSAGE, s), sample)
+        if json.loads(old) != json.loads(new):
+            print('  bodies differ:\n  {}\n  {}'.format(old, new))
+            failed = True
+        measure('  Renderer, chat', lambda s: renderer.render(MESSAGE, s, GROUP_CHAT_ID), sample)
+        built = envelopes(renderer, sample)
+        print('  envelopes built per chat report: {}'.format(built))
+        if built:
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+main()
@@ -0,0 +1,104 @@
+"""Check that RingLog recovers from a write cut short by power loss.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/ringlog_powerloss.py
+
+Power loss during a flush leaves the log file cut somewhere in the block
+being written. Each case writes records, cuts or damages the file the way
+such a flush would, reopens the log as a boot does and checks last_seq,
+pending and what unsent() replays:
+
+  mid-record  the file ends inside the last record; that record is lost,
+              acked records stay acked
+  mid-block   the file ends after a few records of a block; those survive,
+              and appends after the reboot continue from them
+  wrapped     a record torn while overwriting an old slot; recovery falls
+              back to the previous one and replay skips the slot
+
+Exits with status 1 if a check fails. Files go to a temporary directory.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, 'Final_Project/lib')
+import ringlog
+
+BLOCK_SIZE = 64  # Seven 9-byte records per block
+
+
+def open_log(capacity):
+    return ringlog.RingLog('log.bin', 'i', capacity, BLOCK_SIZE,
+                           encode=lambda n: (n,), decode=lambda payload: payload[0])
+
+
+def fresh(capacity, count):
+    """A new log with records 1..count written to flash."""
+    for path in ('log.bin', 'log.bin.ack'):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    log = open_log(capacity)
+    for n in range(1, count + 1):
+        log.append(n)
+    log.flush()
+    return log
+
+
+def cut(size):
+    # What is on flash when the write stopped after size bytes
+    with open('log.bin', 'rb') as f:
+        data = f.read()
+    with open('log.bin', 'wb') as f:
+        f.write(data[:size])
+
+
+def damage(offset):
+    with open('log.bin', 'rb') as f:
+        data = bytearray(f.read())
+    data[offset] ^= 0xFF
+    with open('log.bin', 'wb') as f:
+        f.write(data)
+
+
+def expect(name, log, last_seq, pending, items, failures):
+    replay = log.unsent(log.capacity)
+    print('{:<22} last_seq={:<3} pending={:<3} unsent={}'.format(name, log.last_seq, log.pending, replay[0]))
+    if log.last_seq != last_seq:
+        failures.append('{}: last_seq {}, expected {}'.format(name, log.last_seq, last_seq))
+    if log.pending != pending:
+        failures.append('{}: pending {}, expected {}'.format(name, log.pending, pending))
+    if replay != (items, last_seq):
+        failures.append('{}: unsent() {}, expected {}'.format(name, replay, (items, last_seq)))
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    failures = []
+
+    log = fresh(32, 10)
+    size = log.record_size
+    log.ack(4)
+    cut(9 * size + size // 2)
+    expect('mid-record', open_log(32), 9, 5, [5, 6, 7, 8, 9], failures)
+
+    fresh(32, 14)  # Two full blocks
+    cut(10 * size + 5)  # Power lost three records and a bit into the second
+    log = open_log(32)
+    expect('mid-block', log, 10, 10, list(range(1, 11)), failures)
+    log.append(11)  # Lands on the torn slot
+    log.flush()
+    expect('mid-block, rebooted', open_log(32), 11, 11, list(range(1, 12)), failures)
+
+    fresh(8, 12)  # Record 12 went to the slot of record 4
+    damage(3 * size + size - 1)
+    expect('wrapped', open_log(8), 11, 8, list(range(5, 12)), failures)
+
+    for failure in failures:
+        print('FAIL', failure)
+    sys.exit(1 if failures else 0)
+
+
+main()
@@ -0,0 +1,147 @@
+"""Run a station script's task runtime on CPython and report sampling jitter.
+
+    python benchmarks/runtime_jitter.py [Final_Project/boot.py]
+
+machine, network and dht are replaced by small stand-ins before the script is
+imported, and its Telegram client by one whose send blocks for SLOW_POST_S to
+mimic a slow TLS handshake. All periods are scaled down so a run takes a few
+seconds. The report shows how late each periodic job started against its
+schedule.
+
+A blocking post holds up the whole loop, so jobs may start up to one post
+late, but no more: the station sends one message per turn of its uplink
+task. The script exits with status 1 if a job started more than
+SLOW_POST_S + LATE_SLACK_MS late.
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, '.')
+from sim.devices import BMP280Registers  # Serves BMP280 reads, swallows LCD writes
+
+RUN_MS = 5000
+SLOW_POST_S = 0.3
+SAMPLE_INTERVAL_MS = 200
+SEND_INTERVAL_MS = 1000
+OUTBOX_INTERVAL_MS = 500  # Longer than a post, as on the device
+HOUSEKEEPING_INTERVAL_MS = 500
+PAGE_DWELL_MS = 100
+LATE_SLACK_MS = 60   # Beyond one blocking post
+
+class Pin:
+    IN = 0
+    OUT = 1
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def value(self, *args):
+        return 1
+
+
+class ADC:
+    def __init__(self, pin):
+        pass
+
+    def read(self):
+        return 1000
+
+
+class WLAN:
+    def __init__(self, interface):
+        pass
+
+    def active(self, *args):
+        return True
+
+    def connect(self, *args, **kwargs):
+        pass
+
+    def isconnected(self):
+        return True
+
+
+class DHT11:
+    def __init__(self, pin):
+        pass
+
+    def measure(self):
+        pass
+
+    def temperature(self):
+        return 24
+
+    def humidity(self):
+        return 40
+
+
+class SlowTelegramClient:
+    stats = ''
+    in_flight = False  # No long poll (COMMANDS is off)
+
+    def post(self, method, body):
+        time.sleep(SLOW_POST_S)  # Blocks the whole loop, like a TLS handshake
+        return 200, b'{"ok":true}'
+
+
+def install_stubs():
+    modules = {
+        'machine': {'I2C': BMP280Registers, 'Pin': Pin, 'ADC': ADC},
+        'network': {'WLAN': WLAN, 'STA_IF': 0},
+        'dht': {'DHT11': DHT11},
+    }
+    for name, attrs in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+    time.sleep_ms = lambda ms: None
+    time.sleep_us = lambda us: None
+    import gc
+    if not hasattr(gc, 'mem_free'):
+        gc.mem_free = lambda: 0
+
+
+def load(path):
+    sys.path.insert(0, 'Final_Project/lib')
+    spec = importlib.util.spec_from_file_location('station', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else 'Final_Project/boot.py'
+    install_stubs()
+    station = load(path)
+    station.print = lambda *args, **kwargs: None  # Keep the report readable
+    station.telegram = SlowTelegramClient()
+    station.SAMPLE_INTERVAL_MS = SAMPLE_INTERVAL_MS
+    station.OUTBOX_INTERVAL_MS = OUTBOX_INTERVAL_MS
+    station.HOUSEKEEPING_INTERVAL_MS = HOUSEKEEPING_INTERVAL_MS
+    folder = tempfile.mkdtemp()  # Keep the tree clean
+    station.BACKLOG_PATH = os.path.join(folder, 'backlog{}.bin')
+    station.COMMANDS = False  # Long polling needs real sockets; sim/ covers it
+    # Every sink at a scaled-down rate; files go to the temporary folder
+    station.SINKS = tuple(
+        (kind, os.path.join(folder, target) if kind == 'file' else target,
+         None if kind == 'lcd' else SEND_INTERVAL_MS)
+        for kind, target, _ in station.SINKS)
+    station.PAGES = tuple((title, value, PAGE_DWELL_MS / 1000) for title, value, _ in station.PAGES)
+
+    rt = station.build_runtime()
+    rt.run(RUN_MS)
+    print('{}: {} ms run, {} ms blocking post, {} samples taken'.format(
+        path, RUN_MS, int(SLOW_POST_S * 1000), rt.latest.seq))
+    print(rt.report())
+    bound = SLOW_POST_S * 1000 + LATE_SLACK_MS
+    late = [name for name, stats in rt.jitter.items() if stats.max > bound]
+    for name in late:
+        print('FAIL {} started {} ms late, bound {:.0f} ms'.format(name, rt.jitter[name].max, bound))
+    sys.exit(1 if late else 0)
+
+
+main()
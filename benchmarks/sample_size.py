@@ -0,0 +1,90 @@
+"""Memory cost of one reading: the old 7-tuple against sample.Sample.
+
+Run from the repository root on CPython or the MicroPython unix port:
+
+    python benchmarks/sample_size.py
+
+For each representation the script builds READINGS readings the way
+read_sensors() does and keeps them alive (as a queue would), then reports
+heap bytes per reading and the time to build one. Heap use comes from
+gc.mem_alloc() on MicroPython and tracemalloc on CPython. The flash record
+size used by the ring log is printed for comparison.
+"""
+import gc
+import struct
+import sys
+
+sys.path.insert(0, 'Final_Project/lib')
+from sample import Sample, RECORD_FMT
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+READINGS = 500
+
+# Raw inputs as the sensors deliver them: DHT11 integers, BMP280 floats,
+# LDR / rain pins and the MQ-135 ADC value
+DHT_T, DHT_H = 24, 40
+PRESSURE, ALTITUDE = 1006.5325390625, 55.53
+LDR, RAIN_PIN, ADC = 1, 0, 1000
+
+
+def as_tuple():
+    # read_sensors() before the Sample type
+    rain = "Yes" if RAIN_PIN == 0 else "No"
+    light_value = "🌙 Dark" if LDR == 1 else "☀️ Light"
+    air_quality = "Good" if ADC < 300000 else "Bad"
+    return DHT_T, DHT_H, PRESSURE * 1.0, ALTITUDE * 1.0, light_value, rain, air_quality
+
+
+def as_sample():
+    return Sample(DHT_T, DHT_H, PRESSURE * 1.0, ALTITUDE * 1.0,
+                  dark=LDR == 1, rain=RAIN_PIN == 0, air_bad=ADC >= 300000)
+
+
+def heap_per_reading(build):
+    readings = [None] * READINGS
+    gc.collect()
+    if tracemalloc is not None:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+    else:
+        before = gc.mem_alloc()
+    for i in range(READINGS):
+        readings[i] = build()
+    if tracemalloc is not None:
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        after = gc.mem_alloc()
+    return (after - before) / READINGS
+
+
+def us_per_reading(build):
+    start = ticks_us()
+    for _ in range(READINGS):
+        build()
+    return ticks_diff(ticks_us(), start) / READINGS
+
+
+def main():
+    print('representation   heap bytes/reading  us/reading')
+    for name, build in (('7-tuple', as_tuple), ('Sample', as_sample)):
+        print('{:<16} {:>18.0f}  {:>10.2f}'.format(name, heap_per_reading(build), us_per_reading(build)))
+    print('flash record     {:>18}'.format(struct.calcsize('<I' + RECORD_FMT) + 1))
+
+
+main()
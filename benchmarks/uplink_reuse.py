@@ -0,0 +1,76 @@
+"""Connection reuse of uplink.TelegramClient against a local stand-in Bot API.
+
+    python benchmarks/uplink_reuse.py
+
+Starts an HTTP/1.1 server on localhost that counts TCP connections, then
+sends the same messages with a reused connection and with a fresh connection
+per message. Halfway through, the server drops the idle connection once to
+show the transparent reconnect. CPython only (uses http.server).
+"""
+import http.server
+import sys
+import threading
+import time
+
+sys.path.insert(0, 'Final_Project/lib')
+import uplink
+
+MESSAGES = 50
+
+
+class StandInBotAPI(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # Header and body are separate writes
+    connections = 0
+    requests = 0
+    drop_after = None  # Close the connection after this many requests
+
+    def setup(self):
+        StandInBotAPI.connections += 1
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        StandInBotAPI.requests += 1
+        body = b'{"ok":true,"result":{}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if StandInBotAPI.requests == StandInBotAPI.drop_after:
+            self.close_connection = True  # Silent drop, like an idle timeout
+
+    def log_message(self, *args):
+        pass
+
+
+def run(server, reuse):
+    StandInBotAPI.connections = StandInBotAPI.requests = 0
+    StandInBotAPI.drop_after = MESSAGES // 2 if reuse else None
+    client = uplink.TelegramClient('TOKEN', host='127.0.0.1', port=server.server_port, use_tls=False)
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        client.send_message('1', 'Weather Station reading {}'.format(i))
+        if not reuse:
+            client.close()
+    elapsed = time.perf_counter() - start
+    client.close()
+    return StandInBotAPI.connections, elapsed * 1000000 / MESSAGES, client.stats
+
+
+def main():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StandInBotAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print('mode        server conns  us/message  client stats')
+        for reuse in (False, True):
+            connections, per_message, stats = run(server, reuse)
+            print('{:<11} {:>12}  {:>10.0f}  {}'.format(
+                'keep-alive' if reuse else 'fresh', connections, per_message, stats))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+main()
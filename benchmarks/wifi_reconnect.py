@@ -0,0 +1,130 @@
+"""Time-to-connect of wifi.WifiManager against a simulated access point.
+
+    python benchmarks/wifi_reconnect.py
+
+FakeWLAN stands in for network.WLAN: a scan takes SCAN_MS, association
+takes FULL_JOIN_MS without a BSSID and CACHED_JOIN_MS with the right one,
+and DHCP adds DHCP_MS unless a static IP is set. Delays are scaled down
+about 10x from typical ESP32 figures so a run takes a few seconds. The
+script walks through a cold boot, link drops, an access point that moves to
+a new BSSID and an outage, and prints the manager's stats after each step.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, 'Final_Project/lib')
+from wifi import WifiManager
+
+SCAN_MS = 250
+FULL_JOIN_MS = 300
+CACHED_JOIN_MS = 80
+DHCP_MS = 120
+TIMEOUT_MS = 800
+
+SSID = 'station'
+
+
+def now_ms():
+    return int(time.monotonic() * 1000)
+
+
+class FakeWLAN:
+    def __init__(self):
+        self.bssid = b'\x11\x22\x33\x44\x55\x66'
+        self.channel = 6
+        self.reachable = True
+        self.static = False
+        self.scans = 0
+        self._ready_at = None  # When the pending join completes
+
+    def active(self, *args):
+        return True
+
+    def ifconfig(self, config=None):
+        self.static = config is not None
+
+    def config(self, **kwargs):
+        pass
+
+    def scan(self):
+        self.scans += 1
+        time.sleep(SCAN_MS / 1000)  # Blocking, like the real driver
+        if not self.reachable:
+            return []
+        return [(b'neighbour', b'\x00' * 6, 1, -80, 3, False),
+                (SSID.encode(), self.bssid, self.channel, -55, 3, False)]
+
+    def connect(self, ssid, password, bssid=None):
+        if not self.reachable or (bssid is not None and bssid != self.bssid):
+            self._ready_at = None  # Never associates
+            return
+        delay = CACHED_JOIN_MS if bssid is not None else FULL_JOIN_MS
+        if not self.static:
+            delay += DHCP_MS
+        self._ready_at = now_ms() + delay
+
+    def disconnect(self):
+        self._ready_at = None
+
+    def isconnected(self):
+        return self._ready_at is not None and now_ms() >= self._ready_at
+
+    def drop(self):
+        self._ready_at = None
+
+
+def settle(wifi, limit_ms=10000):
+    """Poll like the runtime's 'wifi' task until the link is up."""
+    start = now_ms()
+    while not wifi.poll() and now_ms() - start < limit_ms:
+        time.sleep(0.01)
+
+
+def main():
+    cache = os.path.join(tempfile.mkdtemp(), 'wifi.cache')
+    wlan = FakeWLAN()
+    wifi = WifiManager(SSID, 'secret', timeout_ms=TIMEOUT_MS, base_backoff_ms=100,
+                       cache_path=cache, wlan=wlan)
+
+    def step(label):
+        print('{:<28} scans={} {}'.format(label, wlan.scans, wifi.stats))
+
+    wifi.connect()
+    step('cold boot (scan + DHCP)')
+
+    for _ in range(3):
+        wlan.drop()
+        settle(wifi)
+    step('3 drops (cached BSSID)')
+
+    wifi = WifiManager(SSID, 'secret', timeout_ms=TIMEOUT_MS, base_backoff_ms=100,
+                       cache_path=cache, wlan=wlan)
+    wlan.drop()
+    wifi.connect()
+    step('reboot (cache from flash)')
+
+    wlan.bssid = b'\x66\x55\x44\x33\x22\x11'  # Access point replaced
+    wlan.drop()
+    settle(wifi)
+    step('AP moved (timeout, rescan)')
+
+    wlan.reachable = False
+    wlan.drop()
+    outage_end = now_ms() + 2500
+    while now_ms() < outage_end:
+        wifi.poll()
+        time.sleep(0.01)
+    wlan.reachable = True
+    settle(wifi)
+    step('2.5 s outage (backoff)')
+
+    wifi = WifiManager(SSID, 'secret', ('192.168.1.50', '255.255.255.0', '192.168.1.1', '192.168.1.1'),
+                       timeout_ms=TIMEOUT_MS, cache_path=cache, wlan=wlan)
+    wlan.drop()
+    wifi.connect()
+    step('reboot, static IP')
+
+
+main()
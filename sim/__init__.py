@@ -0,0 +1,192 @@
+"""Host-side simulation of the weather station's ESP32 board.
+
+install() puts fakes for machine, network, dht, time, uasyncio, usocket,
+uselect, ussl and urequests into sys.modules, all acting on one Board: I2C buses
+with a BMP280 and the PCF8574/HD44780 LCD, a DHT11, pins and ADCs driven by
+waveforms, a Wi-Fi access point and the Telegram Bot API, on a virtual
+clock. run() then boots a station script unchanged:
+
+    board = sim.run('Final_Project/boot.py', seconds=3600)
+    print(board.telegram.texts(), board.device(0, 0x3F).lines())
+
+or from the shell: python -m sim -t 3600 Final_Project/boot.py
+
+Works on CPython and the MicroPython unix port. Nothing here is imported
+by the firmware.
+"""
+import sys
+
+from sim import board as _board
+from sim.board import Board, AccessPoint, station
+from sim.clock import Clock, Stop
+
+_MODULES = {
+    'machine': 'sim.machine',
+    'network': 'sim.network',
+    'dht': 'sim.dht',
+    'time': 'sim.vtime',
+    'utime': 'sim.vtime',
+    'uasyncio': 'sim.uasyncio',
+    'usocket': 'sim.usocket',
+    'uselect': 'sim.uselect',
+    'ussl': 'sim.ussl',
+    'urequests': 'sim.urequests',
+}
+_saved = None  # sys.modules entries replaced by install()
+
+_here = __file__.replace('\\', '/').rsplit('/', 1)[0]
+ROOT = _here.rsplit('/', 1)[0] if '/' in _here else '.'
+LIB = ROOT + '/Final_Project/lib'
+
+
+def _gc_shims():
+    # MicroPython's heap queries, for scripts and the profiler on CPython
+    import gc
+    if hasattr(gc, 'mem_free'):
+        return
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+
+    def mem_alloc():
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    gc.mem_alloc = mem_alloc
+    gc.mem_free = lambda: max(0, _board.current.heap_size - mem_alloc())
+
+
+def install(board=None):
+    """Make board (default: station()) current and install the fake modules.
+
+    Returns the board. Safe to call again to swap in another board.
+    """
+    global _saved
+    if board is None:
+        board = station()
+    _board.current = board
+    if _saved is None:
+        _saved = {name: sys.modules.get(name) for name in _MODULES}
+        _gc_shims()
+        for name, module in _MODULES.items():
+            __import__(module)
+            sys.modules[name] = sys.modules[module]
+    return board
+
+
+def uninstall():
+    """Put back the modules install() replaced."""
+    global _saved
+    if _saved is None:
+        return
+    for name, module in _saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved = None
+
+
+class Script:
+    """A script's module namespace; attributes read and write its globals."""
+
+    def __init__(self, namespace):
+        object.__setattr__(self, '_namespace', namespace)
+
+    def __getattr__(self, name):
+        try:
+            return self._namespace[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self._namespace[name] = value
+
+
+def _script_path(path):
+    path = path.replace('\\', '/')
+    folder = path.rsplit('/', 1)[0] if '/' in path else '.'
+    for entry in (LIB, folder + '/lib', folder):
+        if entry not in sys.path:
+            sys.path.insert(0, entry)
+
+
+def _exec(path, script):
+    with open(path) as f:
+        source = f.read()
+    exec(compile(source, path, 'exec'), script._namespace)
+    return script
+
+
+def _script(path, name):
+    return Script({'__name__': name, '__file__': path})
+
+
+def load(path, board=None):
+    """Import a station script without running main(); returns a Script."""
+    install(board or _board.current)
+    _script_path(path)
+    return _exec(path, _script(path, 'station'))
+
+
+def run(path, seconds=None, wakes=None, board=None, config=None, setup=None, quiet=False):
+    """Boot path on board and let it run.
+
+    Stops after `seconds` of virtual time or `wakes` deep-sleep wakes,
+    whichever comes first, or when the script returns. A deep sleep lets
+    its time pass and boots the script again with fresh modules; the
+    board (RTC memory, LCD, files) stays. config overrides the script's
+    settings, e.g. {'DEEP_SLEEP_MS': 10000}: the script is imported,
+    patched and then main() is called; setup(script), if given, runs
+    after config on every boot for changes a dict cannot make. quiet
+    silences print(). Returns the board; board.script is the last boot's
+    namespace and board.sleeps has (awake ms, sleep ms) per deep sleep.
+    """
+    from sim.machine import DeepSleep, Reset, DEEPSLEEP_RESET, HARD_RESET
+    board = install(board)
+    clock = board.clock
+    if seconds is not None:
+        clock.stop_at = clock.now_ms() + seconds * 1000
+    _script_path(path)
+    preloaded = set(sys.modules)
+    import builtins
+    real_print = builtins.print
+    if quiet:
+        builtins.print = lambda *args, **kwargs: None
+    try:
+        while True:
+            board.boots += 1
+            board.wlans = []
+            try:
+                # Set first, so the namespace can be inspected even if the run stops inside it
+                patched = config or setup
+                board.script = _script(path, 'station' if patched else '__main__')
+                _exec(path, board.script)
+                if patched:
+                    for name, value in (config or {}).items():
+                        setattr(board.script, name, value)
+                    if setup is not None:
+                        setup(board.script)
+                    board.script.main()
+                return board  # The script ended on its own
+            except DeepSleep as e:
+                sleep_ms = e.args[0] if e.args else 0
+                board.wakes += 1
+                board.sleeps.append((clock.uptime_ms(), sleep_ms))
+                if wakes is not None and board.wakes >= wakes:
+                    return board
+                clock.advance(sleep_ms)
+                board.reset_cause = DEEPSLEEP_RESET
+            except Reset:
+                board.reset_cause = HARD_RESET
+            clock.reset()
+            for name in list(sys.modules):
+                if name not in preloaded:
+                    del sys.modules[name]  # Every boot imports afresh, like the device
+    except Stop:
+        return board
+    finally:
+        builtins.print = real_print
+        clock.stop_at = None
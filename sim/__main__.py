@@ -0,0 +1,55 @@
+"""python -m sim [-t seconds] [-w wakes] [-s deep_sleep_ms] [-q] script.py
+
+Boots a station script on the simulated board in a scratch directory and
+prints what happened: virtual time, boots, messages sent, the LCD and the
+I2C traffic per bus.
+"""
+import os
+import sys
+import tempfile
+
+import sim
+
+
+def main(argv):
+    seconds = 600
+    wakes = None
+    config = {}
+    quiet = False
+    args = list(argv)
+    path = None
+    while args:
+        arg = args.pop(0)
+        if arg == '-t':
+            seconds = float(args.pop(0))
+        elif arg == '-w':
+            wakes = int(args.pop(0))
+        elif arg == '-s':
+            config['DEEP_SLEEP_MS'] = int(args.pop(0))
+        elif arg == '-q':
+            quiet = True
+        elif arg.startswith('-'):
+            sys.exit(__doc__)
+        else:
+            path = os.path.abspath(arg)
+    if path is None:
+        sys.exit(__doc__)
+
+    os.chdir(tempfile.mkdtemp())  # Backlog and Wi-Fi cache files land here
+    board = sim.run(path, seconds=seconds, wakes=wakes, config=config, quiet=quiet)
+
+    print('--- {:.1f} s virtual time, {} boots, {} deep sleeps'.format(
+        board.clock.now_ms() / 1000, board.boots, board.wakes))
+    texts = board.telegram.texts()
+    print('{} messages sent, {} API requests'.format(len(texts), board.telegram.requests))
+    if texts:
+        print('last message:\n' + texts[-1])
+    for bus, devices in sorted(board.i2c.items()):
+        print('I2C {}: {}'.format(bus, board.stats(bus)))
+        for address, device in sorted(devices.items()):
+            if hasattr(device, 'lines'):
+                print('  LCD 0x{:02X}: {!r} ({} ignored while busy)'.format(
+                    address, device.lines(), device.violations))
+
+
+main(sys.argv[1:])
@@ -0,0 +1,129 @@
+"""The simulated board: clock, wiring, radio and cloud, shared by the fakes.
+
+sim.install(board) makes a Board the current one; the fake machine,
+network, dht, socket and time modules all act on `current`.
+station() wires a board the way the weather station is built.
+"""
+from sim import waveform
+from sim.clock import Clock
+from sim.devices import BMP280, CharacterLcd, Dht
+from sim.telegram import TelegramServer
+
+current = None
+
+
+class BusStats:
+    """Traffic on one I2C bus."""
+
+    def __init__(self):
+        self.transactions = 0
+        self.bytes = 0   # Address, register and data bytes
+        self.busy_us = 0.0
+
+    def __str__(self):
+        return "transactions={} bytes={} busy={:.1f}ms".format(self.transactions, self.bytes, self.busy_us / 1000)
+
+
+class AccessPoint:
+    """The Wi-Fi network the station joins.
+
+    Delays are typical ESP32 figures: an active scan of all channels, a
+    join that has to find the AP first, one straight to a known BSSID, and
+    DHCP unless the station sets a static IP.
+    """
+
+    def __init__(self, ssid, password=None, bssid=b'\x24\x0a\xc4\x12\x34\x56', channel=6, rssi=-60,
+                 scan_ms=2100, join_ms=1500, cached_join_ms=300, dhcp_ms=800):
+        self.ssid = ssid
+        self.password = password  # None accepts any
+        self.bssid = bssid
+        self.channel = channel
+        self.rssi = rssi
+        self.scan_ms = scan_ms
+        self.join_ms = join_ms
+        self.cached_join_ms = cached_join_ms
+        self.dhcp_ms = dhcp_ms
+        self.reachable = True
+        self.generation = 0  # Bumped by drop(), so stations see the link go
+
+    def drop(self):
+        """Disconnect every station, e.g. the AP rebooted."""
+        self.generation += 1
+
+
+class Board:
+    def __init__(self, clock=None):
+        self.clock = clock or Clock()
+        self.i2c = {}         # Bus id -> {address: device}
+        self.bus_stats = {}   # Bus id -> BusStats
+        self.pins = {}        # GPIO -> waveform of the input level
+        self.adc = {}         # GPIO -> waveform of the raw 12-bit reading
+        self.dht = {}         # GPIO -> Dht
+        self.access_points = []
+        self.telegram = TelegramServer()
+        self.internet = True  # False: the AP is up but nothing behind it answers
+        self.dns_ms = 40
+        self.connect_ms = 80  # TCP handshake
+        self.tls_ms = 1200    # mbedTLS handshake on the ESP32
+        self.rtt_ms = 150     # One HTTPS request and response
+        self.keepalive_ms = None  # Server closes connections idle this long; None: never
+        self.rtc_memory = b''  # Kept through deep sleep
+        self.reset_cause = 1   # machine.PWRON_RESET
+        self.heap_size = 111000  # ESP32 MicroPython heap without PSRAM
+        self.wlans = []        # network.WLAN objects created this boot
+        self.boots = 0         # Script starts, counting every wake
+        self.wakes = 0         # Deep sleeps taken
+        self.sleeps = []       # (awake ms, sleep ms) of every deep sleep
+        self.script = None     # sim.Script of the latest boot
+
+    def attach(self, bus, address, device):
+        """Put an I2C device on a bus."""
+        self.i2c.setdefault(bus, {})[address] = device
+        return device
+
+    def device(self, bus, address):
+        return self.i2c.get(bus, {}).get(address)
+
+    def stats(self, bus):
+        stats = self.bus_stats.get(bus)
+        if stats is None:
+            stats = self.bus_stats[bus] = BusStats()
+        return stats
+
+    def link(self):
+        """The connected station interface, or None."""
+        for wlan in self.wlans:
+            if wlan.isconnected():
+                return wlan
+        return None
+
+    def online(self):
+        """True while some station interface is connected and the internet answers."""
+        return self.internet and self.link() is not None
+
+    def t(self):
+        """Simulation time in seconds, for waveforms."""
+        return self.clock.now_ms() / 1000
+
+
+def station(clock=None, ssid='lokimux', password=None):
+    """A board wired like the weather station.
+
+    BMP280 at 0x76 on I2C 1, the 16x2 LCD backpack at 0x3F on I2C 0, a DHT11
+    on GPIO 23, the rain sensor on 34 (low when wet), the LDR on 35 (high
+    when dark) and the MQ-135 on 32 (analog) and 14 (digital, low when
+    bad). Weather follows a daily cycle with light noise; it rains from
+    hour 3 to hour 4.
+    """
+    board = Board(clock)
+    day = 86400
+    temperature = waveform.noise(waveform.sine(22, 4, day, -day / 4), 0.2, seed=1)
+    board.attach(1, 0x76, BMP280(temperature, waveform.noise(waveform.sine(1012, 3, day / 2), 0.05, seed=2)))
+    board.attach(0, 0x3F, CharacterLcd(16, 2))
+    board.dht[23] = Dht(temperature, waveform.noise(waveform.sine(60, 15, day, day / 4), 1, seed=3))
+    board.pins[34] = waveform.steps(((3 * 3600, 0), (4 * 3600, 1)), before=1)
+    board.pins[35] = waveform.square(0, 1, day, duty=0.5, phase_s=-day / 4)  # Light 06:00-18:00
+    board.adc[32] = waveform.noise(waveform.constant(1200), 40, seed=4)
+    board.pins[14] = waveform.constant(1)
+    board.access_points.append(AccessPoint(ssid, password))
+    return board
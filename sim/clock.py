@@ -0,0 +1,91 @@
+"""Virtual time for the simulated board.
+
+Time only moves when something waits: time.sleep*(), a DHT11 read, an I2C
+transfer, a Wi-Fi scan, a TLS handshake, or the scheduler jumping to the
+next task. A run of hours takes seconds and is the same on every run.
+
+With cpu_scale > 0 the host's own run time is added as well (scaled), for
+budgets that should include the cost of the Python code.
+"""
+try:
+    from time import perf_counter
+
+    def _host_us():
+        return perf_counter() * 1000000
+except ImportError:  # MicroPython unix port
+    from time import ticks_us as _host_us
+
+TICKS_PERIOD = 1 << 30  # MicroPython's ticks_*() wrap at this value
+
+
+class Stop(BaseException):
+    """Raised when the simulation reaches its time limit.
+
+    A BaseException, so the firmware's own `except Exception` handlers
+    do not swallow it.
+    """
+
+
+class Clock:
+    def __init__(self, start_s=0, cpu_scale=0.0, ticks_start_ms=0):
+        """
+        start_s is time.time() at the start (seconds since 2000, as on the
+        ESP32; 0 is an RTC that was never set). ticks_start_ms offsets
+        ticks_ms() after every reset, to test wraparound.
+        """
+        self.start_s = start_s
+        self.cpu_scale = cpu_scale
+        self.ticks_start_ms = ticks_start_ms
+        self.stop_at = None    # now_ms() at which Stop is raised
+        self.events = []       # [(ms, seq, fn)] from at(), in time order
+        self._now = 0.0        # ms since the simulation started
+        self._reset_at = 0.0   # _now at the last reset or deep-sleep wake
+        self._host = _host_us()
+        self._seq = 0
+
+    def now_ms(self):
+        """ms since the simulation started, across resets and deep sleep."""
+        if self.cpu_scale:
+            host = _host_us()
+            self._now += (host - self._host) * self.cpu_scale / 1000
+            self._host = host
+        return self._now
+
+    def advance(self, ms):
+        """Let ms pass, as a blocking wait on the device does."""
+        self.advance_to(self.now_ms() + ms)
+
+    def at(self, seconds, fn):
+        """Call fn() when the simulation reaches seconds, e.g. to drop the AP."""
+        self._seq += 1
+        self.events.append((seconds * 1000, self._seq, fn))
+        self.events.sort()
+
+    def advance_to(self, ms):
+        limit = ms if self.stop_at is None else min(ms, self.stop_at)
+        while self.events and self.events[0][0] <= limit:
+            when, _, fn = self.events.pop(0)
+            if when > self._now:
+                self._now = when
+            fn()
+        if self.stop_at is not None and ms > self.stop_at:
+            self._now = max(self._now, self.stop_at)
+            raise Stop()
+        if ms > self._now:
+            self._now = ms
+
+    def reset(self):
+        """A reset or deep-sleep wake: ticks start again, time() keeps going."""
+        self._reset_at = self.now_ms()
+
+    def uptime_ms(self):
+        return self.now_ms() - self._reset_at
+
+    def ticks_ms(self):
+        return (int(self.uptime_ms()) + self.ticks_start_ms) % TICKS_PERIOD
+
+    def ticks_us(self):
+        return (int(self.uptime_ms() * 1000) + self.ticks_start_ms * 1000) % TICKS_PERIOD
+
+    def time(self):
+        return self.start_s + self.now_ms() / 1000
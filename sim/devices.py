@@ -0,0 +1,353 @@
+"""Peripheral models: BMP280 on I2C, HD44780 LCD on a PCF8574 backpack, DHT11.
+
+I2C devices get every transfer from the simulated bus with its timing:
+write(data, t_us, byte_us) and read(n, t_us), where t_us is the time the
+first data byte finished and byte_us the time per byte on the bus.
+Register devices also take the bus's memory transfers directly, as
+write_mem(register, data, t_us, byte_us) and read_into(register, buf, t_us).
+
+BMP280Registers is not on a board: it stands in for machine.I2C itself, for
+scripts that exercise the BMP280 driver without the simulated bus.
+"""
+import struct
+
+# Datasheet section 8.2 example calibration: dig_T1..T3, dig_P1..P9
+DATASHEET_CALIBRATION = (27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000)
+# The example's readings and what they compensate to: adc_T, adc_P, deg C, Pa
+DATASHEET_EXAMPLE = (519888, 415148, 25.08, 100653.27)
+
+
+class RegisterDevice:
+    """An I2C device with a register pointer that auto-increments."""
+
+    def __init__(self):
+        self.regs = bytearray(256)
+        self.pointer = 0
+        self.reads = 0    # Read transfers
+        self.writes = 0   # Write transfers
+
+    def write(self, data, t_us, byte_us):
+        if len(data):
+            self.write_mem(data[0], memoryview(data)[1:], t_us + byte_us, byte_us)
+
+    def read(self, n, t_us):
+        buf = bytearray(n)
+        self.read_into(self.pointer, buf, t_us)
+        return bytes(buf)
+
+    def write_mem(self, register, data, t_us, byte_us):
+        """Register pointer set to register, then data written from there."""
+        self.writes += 1
+        for i in range(len(data)):
+            self.write_register(register, data[i], t_us + i * byte_us)
+            register = (register + 1) & 0xFF
+        self.pointer = register
+
+    def read_into(self, register, buf, t_us):
+        """Fill buf from register onwards."""
+        self.reads += 1
+        for i in range(len(buf)):
+            buf[i] = self.read_register(register, t_us)
+            register = (register + 1) & 0xFF
+        self.pointer = register
+
+    def write_register(self, register, value, t_us):
+        self.regs[register] = value
+
+    def read_register(self, register, t_us):
+        return self.regs[register]
+
+
+class BMP280(RegisterDevice):
+    """Bosch BMP280 register map with forced and normal mode conversions.
+
+    temperature (deg C) and pressure (hPa) are waveforms of the time in
+    seconds. Raw ADC values are found by inverting the datasheet's
+    floating-point compensation for the configured calibration, truncated
+    to the resolution of the oversampling setting, so any compensation
+    routine in the driver reads the waveform back within its resolution.
+    A forced conversion takes the datasheet's typical measurement time.
+    """
+    CHIP_ID = 0x58
+
+    def __init__(self, temperature, pressure, calibration=DATASHEET_CALIBRATION):
+        super().__init__()
+        self.temperature = temperature
+        self.pressure = pressure
+        self.t1, self.t2, self.t3 = calibration[:3]
+        self.p = calibration[3:]
+        self.regs[0x88:0xA0] = struct.pack('<HhhHhhhhhhhh', *calibration)
+        self.conversions = 0
+        self._ready_us = None  # End of the forced conversion in progress
+        self._filtered = None  # IIR filter state (adc_T, adc_P)
+        self._reset()
+
+    def _reset(self):
+        self.regs[0xD0] = self.CHIP_ID
+        self.regs[0xF4] = 0
+        self.regs[0xF5] = 0
+        self.regs[0xF7:0xFD] = b'\x80\x00\x00\x80\x00\x00'
+        self._ready_us = None
+        self._filtered = None
+
+    def _t_fine(self, adc_t):
+        var1 = (adc_t / 16384.0 - self.t1 / 1024.0) * self.t2
+        var2 = adc_t / 131072.0 - self.t1 / 8192.0
+        return var1 + var2 * var2 * self.t3
+
+    def _pressure_pa(self, adc_p, t_fine):
+        p1, p2, p3, p4, p5, p6, p7, p8, p9 = self.p
+        var1 = t_fine / 2.0 - 64000.0
+        var2 = var1 * var1 * p6 / 32768.0 + var1 * p5 * 2.0
+        var2 = var2 / 4.0 + p4 * 65536.0
+        var1 = (p3 * var1 * var1 / 524288.0 + p2 * var1) / 524288.0
+        var1 = (1.0 + var1 / 32768.0) * p1
+        pressure = (1048576.0 - adc_p - var2 / 4096.0) * 6250.0 / var1
+        return pressure + (p9 * pressure * pressure / 2147483648.0 + pressure * p8 / 32768.0 + p7) / 16.0
+
+    @staticmethod
+    def _invert(f, target, rising):
+        # Smallest 20-bit adc whose f(adc) passes target
+        low, high = 0, (1 << 20) - 1
+        while low < high:
+            mid = (low + high) // 2
+            value = f(mid)
+            if (value < target) if rising else (value > target):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _convert(self, t_us):
+        ctrl = self.regs[0xF4]
+        osrs_t = (ctrl >> 5) & 7
+        osrs_p = (ctrl >> 2) & 7
+        t = t_us / 1000000
+        adc_t = adc_p = 0x80000  # Skipped measurement
+        if osrs_t:
+            adc_t = self._invert(self._t_fine, self.temperature(t) * 5120.0, True)
+            adc_t &= ~((1 << (5 - min(osrs_t, 5))) - 1)  # x1 is 16 bits, x16 is 20 bits
+        if osrs_p:
+            t_fine = self._t_fine(adc_t)
+            target = self.pressure(t) * 100
+            adc_p = self._invert(lambda adc: self._pressure_pa(adc, t_fine), target, False)
+            adc_p &= ~((1 << (5 - min(osrs_p, 5))) - 1)
+        coefficient = (1, 2, 4, 8, 16, 16, 16, 16)[(self.regs[0xF5] >> 2) & 7]
+        if coefficient > 1 and self._filtered is not None:
+            old_t, old_p = self._filtered
+            adc_t = (old_t * (coefficient - 1) + adc_t) // coefficient
+            adc_p = (old_p * (coefficient - 1) + adc_p) // coefficient
+        self._filtered = (adc_t, adc_p)
+        self.regs[0xF7:0xFA] = bytes(((adc_p >> 12) & 0xFF, (adc_p >> 4) & 0xFF, (adc_p << 4) & 0xF0))
+        self.regs[0xFA:0xFD] = bytes(((adc_t >> 12) & 0xFF, (adc_t >> 4) & 0xFF, (adc_t << 4) & 0xF0))
+        self.conversions += 1
+
+    def measurement_us(self):
+        """Typical conversion time for the current oversampling (datasheet 3.8.1)."""
+        ctrl = self.regs[0xF4]
+        osrs_t = (ctrl >> 5) & 7
+        osrs_p = (ctrl >> 2) & 7
+        us = 1000 + 2000 * (1 << osrs_t >> 1)
+        if osrs_p:
+            us += 2000 * (1 << osrs_p >> 1) + 500
+        return us
+
+    def _settle(self, t_us):
+        # Finish a forced conversion whose time is up; it returns to sleep mode
+        if self._ready_us is not None and t_us >= self._ready_us:
+            self._convert(self._ready_us)
+            self._ready_us = None
+            self.regs[0xF4] &= 0xFC
+
+    def write_register(self, register, value, t_us):
+        self._settle(t_us)
+        if register == 0xE0:
+            if value == 0xB6:
+                self._reset()
+            return
+        if register in (0xF4, 0xF5):
+            self.regs[register] = value
+            if register == 0xF4 and value & 3 in (1, 2):
+                self._ready_us = t_us + self.measurement_us()
+
+    def read_register(self, register, t_us):
+        self._settle(t_us)
+        if register == 0xF3:
+            return 0x08 if self._ready_us is not None else 0x00  # Bit 3: measuring
+        if register == 0xF7 and self.regs[0xF4] & 3 == 3:
+            self._convert(t_us)  # Normal mode: the newest conversion
+        return self.regs[register]
+
+
+class BMP280Registers:
+    """A machine.I2C stand-in holding one BMP280's registers, with no timing.
+
+    The calibration block and the data registers hold the datasheet example,
+    or the given calibration and adc_T, adc_P, and never change: status
+    reads as idle and writes are ignored. readfrom_mem() returns a new bytes
+    object like machine.I2C; readfrom_mem_into() allocates nothing.
+    """
+
+    def __init__(self, *args, calibration=DATASHEET_CALIBRATION, adc=DATASHEET_EXAMPLE[:2], **kwargs):
+        self.regs = bytearray(256)
+        self.regs[0x88:0xA0] = struct.pack('<HhhHhhhhhhhh', *calibration)
+        self.regs[0xD0] = BMP280.CHIP_ID
+        adc_t, adc_p = adc
+        self.regs[0xF7:0xFD] = bytes((adc_p >> 12, (adc_p >> 4) & 0xFF, (adc_p & 0xF) << 4,
+                                      adc_t >> 12, (adc_t >> 4) & 0xFF, (adc_t & 0xF) << 4))
+
+    def readfrom_mem(self, addr, register, length):
+        return bytes(self.regs[register:register + length])
+
+    def readfrom_mem_into(self, addr, register, buf):
+        regs = self.regs
+        i = 0
+        while i < len(buf):
+            buf[i] = regs[(register + i) & 0xFF]
+            i += 1
+
+    def writeto_mem(self, addr, register, data):
+        pass
+
+    def writeto(self, addr, data):
+        pass
+
+
+class CharacterLcd:
+    """HD44780 character LCD driven through a PCF8574 I/O expander.
+
+    Port bits: P0 RS, P1 RW, P2 EN, P3 backlight, P4-P7 D4-D7. The
+    controller latches on the falling edge of EN, starts in 8-bit mode
+    and follows the datasheet's instruction set for DDRAM addressing.
+    A latch that arrives while the previous instruction is still running
+    (37 us, 1.52 ms for clear and home) is ignored, like on the real part,
+    and counted in violations.
+    """
+    RS = 0x01
+    EN = 0x04
+    BACKLIGHT = 0x08
+    ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+
+    def __init__(self, columns=16, lines=2):
+        self.columns = columns
+        self.num_lines = lines
+        self.ddram = bytearray(b' ' * 0x80)
+        self.address = 0
+        self.increment = True
+        self.display_on = False
+        self.backlight = False
+        self.eight_bit = True  # Power-on state
+        self.two_line = lines > 1
+        self.port = 0
+        self.busy_until = 0
+        self.writes = 0        # I2C write transfers
+        self.instructions = 0
+        self.characters = 0
+        self.violations = 0
+        self._high = None      # First nibble of a 4-bit transfer
+        self._cgram = False
+
+    def write(self, data, t_us, byte_us):
+        self.writes += 1
+        port = self.port
+        for i in range(len(data)):
+            byte = data[i]
+            if port & self.EN and not byte & self.EN:
+                self._latch(byte, t_us + i * byte_us)
+            port = byte
+        self.port = port
+        self.backlight = bool(port & self.BACKLIGHT)
+
+    def read(self, n, t_us):
+        return bytes((self.port,)) * n
+
+    def _latch(self, byte, t_us):
+        if t_us < self.busy_until:
+            self.violations += 1
+            return
+        nibble = byte & 0xF0
+        rs = byte & self.RS
+        if self.eight_bit:
+            self._execute(nibble, rs, t_us)
+        elif self._high is None:
+            self._high = nibble
+        else:
+            value = self._high | (nibble >> 4)
+            self._high = None
+            self._execute(value, rs, t_us)
+
+    def _step(self, delta):
+        address = self.address + delta
+        if self.two_line:
+            if address == 0x28:
+                address = 0x40
+            elif address == 0x68:
+                address = 0x00
+            elif address == -1:
+                address = 0x67
+            elif address == 0x3F:
+                address = 0x27
+        else:
+            address %= 0x50
+        self.address = address
+
+    def _execute(self, value, rs, t_us):
+        exec_us = 37
+        if rs:
+            if not self._cgram:
+                self.ddram[self.address] = value
+                self.characters += 1
+                self._step(1 if self.increment else -1)
+            self.busy_until = t_us + exec_us + 4
+            return
+        self.instructions += 1
+        if value & 0x80:
+            self.address = value & 0x7F
+            self._cgram = False
+        elif value & 0x40:
+            self._cgram = True
+        elif value & 0x20:
+            self.eight_bit = bool(value & 0x10)
+            self.two_line = bool(value & 0x08)
+        elif value & 0x10:
+            if not value & 0x08:  # Cursor move; display shift is not modelled
+                self._step(1 if value & 0x04 else -1)
+        elif value & 0x08:
+            self.display_on = bool(value & 0x04)
+        elif value & 0x04:
+            self.increment = bool(value & 0x02)
+        elif value & 0x02:
+            self.address = 0
+            exec_us = 1520
+        elif value & 0x01:
+            self.ddram[:] = b' ' * len(self.ddram)
+            self.address = 0
+            self.increment = True
+            exec_us = 1520
+        else:
+            return  # 0x00 is not an instruction
+        self.busy_until = t_us + exec_us
+
+    def lines(self):
+        """The visible characters, one string per row."""
+        rows = []
+        for row in range(self.num_lines):
+            start = self.ROW_OFFSETS[row]
+            rows.append(''.join(chr(c) for c in self.ddram[start:start + self.columns]))
+        return rows
+
+
+class Dht:
+    """A DHT11/DHT22 on one GPIO: values come from waveforms of the time.
+
+    A read blocks for latency_ms (start signal plus 40 bits). With
+    fail_every=n every n-th read times out with OSError, as a noisy line
+    does.
+    """
+
+    def __init__(self, temperature, humidity, latency_ms=23, fail_every=0):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.latency_ms = latency_ms
+        self.fail_every = fail_every
+        self.reads = 0
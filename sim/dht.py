@@ -0,0 +1,41 @@
+"""MicroPython's dht module for the sensors wired on the simulated board."""
+from sim import board as _board
+
+
+class _Sensor:
+    def __init__(self, pin):
+        self.pin = pin.id if hasattr(pin, 'id') else pin
+        self._temperature = self._humidity = None
+
+    def measure(self):
+        """Blocks for the sensor's read time; OSError if nothing answers."""
+        board = _board.current
+        sensor = board.dht.get(self.pin)
+        if sensor is None:
+            board.clock.advance(5)
+            raise OSError(110)  # ETIMEDOUT: no response to the start signal
+        board.clock.advance(sensor.latency_ms)
+        sensor.reads += 1
+        if sensor.fail_every and sensor.reads % sensor.fail_every == 0:
+            raise OSError(110)
+        t = board.t()
+        self._temperature = self._quantize(sensor.temperature(t))
+        self._humidity = self._quantize(sensor.humidity(t))
+
+    def temperature(self):
+        return self._temperature
+
+    def humidity(self):
+        return self._humidity
+
+
+class DHT11(_Sensor):
+    @staticmethod
+    def _quantize(value):
+        return int(value + 0.5) if value >= 0 else -int(-value + 0.5)  # Whole degrees and percent
+
+
+class DHT22(_Sensor):
+    @staticmethod
+    def _quantize(value):
+        return round(value, 1)
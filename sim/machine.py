@@ -0,0 +1,237 @@
+"""MicroPython's machine module for the simulated ESP32.
+
+Installed as `machine` by sim.install(). Pins, ADCs and I2C buses are
+looked up in the current board's wiring when they are used.
+"""
+from sim import board as _board
+
+PWRON_RESET = 1
+HARD_RESET = 2
+WDT_RESET = 3
+DEEPSLEEP_RESET = 4
+SOFT_RESET = 5
+
+
+class DeepSleep(BaseException):
+    """machine.deepsleep() was called; args[0] is the sleep time in ms.
+
+    The simulation catches it, lets the time pass and boots the script
+    again, as the chip would.
+    """
+
+
+class Reset(BaseException):
+    """machine.reset() was called."""
+
+
+def _pin_id(pin):
+    return pin.id if isinstance(pin, Pin) else pin
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        self._out = value or 0
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self._out = value
+
+    def value(self, level=None):
+        if level is not None:
+            self._out = 1 if level else 0
+            return None
+        if self.mode == self.OUT:
+            return self._out
+        wave = _board.current.pins.get(self.id)
+        if wave is None:
+            return 1 if self.pull == self.PULL_UP else 0
+        return 1 if wave(_board.current.t()) else 0
+
+    __call__ = value
+
+    def on(self):
+        self._out = 1
+
+    def off(self):
+        self._out = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        return None  # Edges are not simulated
+
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+    WIDTH_9BIT = 0
+    WIDTH_10BIT = 1
+    WIDTH_11BIT = 2
+    WIDTH_12BIT = 3
+
+    def __init__(self, pin, atten=None):
+        self.id = _pin_id(pin)
+
+    def atten(self, value):
+        pass
+
+    def width(self, value):
+        pass
+
+    def read(self):
+        """Raw 12-bit reading from the pin's waveform."""
+        wave = _board.current.adc.get(self.id)
+        if wave is None:
+            return 0
+        return max(0, min(4095, int(wave(_board.current.t()))))
+
+    def read_u16(self):
+        return self.read() * 65535 // 4095
+
+    def read_uv(self):
+        return self.read() * 3300000 // 4095
+
+
+class I2C:
+    """Transfers go to the devices attached to this bus id on the board.
+
+    Each transfer takes its time on the virtual clock: 9 bit times per byte
+    (address, register and data) at freq.
+    """
+
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        self.id = id
+        self.freq = freq
+
+    def init(self, scl=None, sda=None, freq=400000):
+        self.freq = freq
+
+    def _device(self, addr):
+        device = _board.current.device(self.id, addr)
+        if device is None:
+            raise OSError(19)  # ENODEV, as for a missing ACK
+        return device
+
+    def _transfer(self, size):
+        # Account size bytes on the bus; returns (start us, us per byte)
+        board = _board.current
+        byte_us = 9000000 / self.freq
+        stats = board.stats(self.id)
+        stats.transactions += 1
+        stats.bytes += size
+        stats.busy_us += size * byte_us
+        start_us = board.clock.now_ms() * 1000
+        board.clock.advance(size * byte_us / 1000)
+        return start_us, byte_us
+
+    def scan(self):
+        return sorted(_board.current.i2c.get(self.id, {}))
+
+    def writeto(self, addr, buf, stop=True):
+        device = self._device(addr)
+        start_us, byte_us = self._transfer(1 + len(buf))
+        device.write(buf, start_us + 2 * byte_us, byte_us)
+        return len(buf)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        device = self._device(addr)
+        start_us, _ = self._transfer(1 + nbytes)
+        return device.read(nbytes, start_us)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.readfrom(addr, len(buf))
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        device = self._device(addr)
+        start_us, byte_us = self._transfer(2 + len(buf))
+        device.write_mem(memaddr, buf, start_us + 3 * byte_us, byte_us)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(addr, memaddr, buf)
+        return bytes(buf)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        device = self._device(addr)
+        start_us, byte_us = self._transfer(3 + len(buf))
+        device.read_into(memaddr, buf, start_us + 4 * byte_us)
+
+
+SoftI2C = I2C
+
+
+class RTC:
+    def __init__(self, id=0):
+        pass
+
+    def memory(self, data=None):
+        """RTC slow memory: kept through deep sleep, lost on power-on."""
+        if data is None:
+            return _board.current.rtc_memory
+        _board.current.rtc_memory = bytes(data)
+
+    def datetime(self, value=None):
+        if value is not None:
+            return None  # The virtual clock is not settable
+        import time
+        t = time.localtime()
+        return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+
+
+class WDT:
+    def __init__(self, id=0, timeout=5000):
+        self.timeout = timeout
+
+    def feed(self):
+        pass
+
+
+def deepsleep(time_ms=0):
+    raise DeepSleep(time_ms)
+
+
+def lightsleep(time_ms=0):
+    _board.current.clock.advance(time_ms)
+
+
+def reset():
+    raise Reset()
+
+
+def soft_reset():
+    raise Reset()
+
+
+def reset_cause():
+    return _board.current.reset_cause
+
+
+def wake_reason():
+    return 4 if _board.current.reset_cause == DEEPSLEEP_RESET else 0  # 4: timer
+
+
+def freq(hz=None):
+    return None if hz is not None else 240000000
+
+
+def unique_id():
+    return b'\x24\x0a\xc4\x12\x34\x56'
+
+
+def idle():
+    pass
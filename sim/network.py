@@ -0,0 +1,117 @@
+"""MicroPython's network module: a station interface on the simulated radio.
+
+Installed as `network` by sim.install(). connect() does not block, as on
+the ESP32: isconnected() turns True once the access point's join delay
+(plus DHCP, unless ifconfig() set a static address) has passed.
+"""
+from sim import board as _board
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_GOT_IP = 1010
+STAT_NO_AP_FOUND = 201
+STAT_WRONG_PASSWORD = 202
+
+_DHCP_CONFIG = ('192.168.1.50', '255.255.255.0', '192.168.1.1', '192.168.1.1')
+
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self.interface = interface
+        self._board = _board.current
+        self._active = False
+        self._ap = None          # Access point being joined or joined
+        self._generation = 0     # Its generation at the join
+        self._ready_at = None    # now_ms() at which the link comes up
+        self._static = None
+        self._status = STAT_IDLE
+        self.joins = 0           # connect() calls that found the AP; sockets die with their join
+        self._board.wlans.append(self)
+
+    def active(self, state=None):
+        if state is None:
+            return self._active
+        self._active = bool(state)
+        if not self._active:
+            self.disconnect()
+
+    def _find(self, ssid, bssid=None):
+        for ap in self._board.access_points:
+            if ap.reachable and ap.ssid == ssid and (bssid is None or bytes(bssid) == ap.bssid):
+                return ap
+        return None
+
+    def scan(self):
+        """Blocks for the access points' scan time, like the active scan it is."""
+        if not self._active:
+            raise OSError("STA must be active")
+        points = self._board.access_points
+        self._board.clock.advance(max([ap.scan_ms for ap in points] or [2100]))
+        return [(ap.ssid.encode(), ap.bssid, ap.channel, ap.rssi, 3, False)
+                for ap in points if ap.reachable]
+
+    def connect(self, ssid=None, key=None, *, bssid=None):
+        if not self._active:
+            raise OSError("STA must be active")
+        ap = self._find(ssid, bssid)
+        self._ap = None
+        self._ready_at = None
+        if ap is None:
+            self._status = STAT_NO_AP_FOUND
+            return
+        if ap.password is not None and key != ap.password:
+            self._status = STAT_WRONG_PASSWORD
+            return
+        delay = ap.cached_join_ms if bssid is not None else ap.join_ms
+        if self._static is None:
+            delay += ap.dhcp_ms
+        self._ap = ap
+        self._generation = ap.generation
+        self._ready_at = self._board.clock.now_ms() + delay
+        self.joins += 1
+        self._status = STAT_CONNECTING
+
+    def disconnect(self):
+        self._ap = None
+        self._ready_at = None
+        self._status = STAT_IDLE
+
+    def isconnected(self):
+        ap = self._ap
+        if ap is None or not ap.reachable or ap.generation != self._generation:
+            if ap is not None:
+                self.disconnect()
+            return False
+        if self._board.clock.now_ms() < self._ready_at:
+            return False
+        self._status = STAT_GOT_IP
+        return True
+
+    def status(self, param=None):
+        if param == 'rssi':
+            return self._ap.rssi if self.isconnected() else 0
+        self.isconnected()
+        return self._status
+
+    def ifconfig(self, config=None):
+        if config is not None:
+            self._static = tuple(config)
+            return None
+        if self._static is not None:
+            return self._static
+        return _DHCP_CONFIG if self.isconnected() else ('0.0.0.0',) * 4
+
+    def config(self, *args, **kwargs):
+        if kwargs:
+            return None  # channel, txpower, ... are accepted and ignored
+        name = args[0]
+        if name == 'mac':
+            return b'\x24\x0a\xc4\x12\x34\x57'
+        if name in ('essid', 'ssid'):
+            return self._ap.ssid if self._ap is not None else ''
+        if name == 'channel':
+            return self._ap.channel if self._ap is not None else 0
+        raise ValueError("unknown config param")
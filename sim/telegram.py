@@ -0,0 +1,78 @@
+"""A stand-in for the Telegram Bot API behind the simulated sockets.
+
+Requests arrive as parsed (method, JSON payload) pairs. sendMessage is
+recorded in `messages`; getUpdates serves updates queued with
+push_update() (the socket layer holds a long poll while pending() is
+false); any other method answers ok. fail(n) makes the next n
+requests answer 502, as the API does during an outage.
+"""
+import json
+
+
+class TelegramServer:
+    def __init__(self):
+        self.messages = []   # sendMessage payloads, oldest first
+        self.requests = 0
+        self.updates = []    # Pending updates, as the API returns them
+        self._update_id = 100000
+        self._message_id = 0
+        self._fail = 0
+        self._fail_status = 502
+
+    def fail(self, count, status=502):
+        """Answer the next count requests with an error status."""
+        self._fail = count
+        self._fail_status = status
+
+    def push_update(self, text, chat_id=1, user='station-user', chat_type=None):
+        """Queue an incoming message, as if someone wrote to the bot.
+
+        chat_type defaults to 'group' for negative (group) chat ids.
+        """
+        if chat_type is None:
+            chat_type = 'group' if int(chat_id) < 0 else 'private'
+        self._update_id += 1
+        self._message_id += 1
+        self.updates.append({
+            'update_id': self._update_id,
+            'message': {
+                'message_id': self._message_id,
+                'from': {'id': abs(int(chat_id)), 'is_bot': False, 'first_name': user},
+                'chat': {'id': int(chat_id), 'type': chat_type},
+                'text': text,
+            },
+        })
+
+    def pending(self, offset=0):
+        """True when an update at or after offset waits to be fetched."""
+        for update in self.updates:
+            if update['update_id'] >= offset:
+                return True
+        return False
+
+    def texts(self):
+        """The text of every message sent so far."""
+        return [message.get('text') for message in self.messages]
+
+    def handle(self, method, payload):
+        """One API call; returns (HTTP status, response body bytes)."""
+        self.requests += 1
+        if self._fail:
+            self._fail -= 1
+            return self._fail_status, b'{"ok":false,"error_code":502,"description":"Bad Gateway"}'
+        if method == 'sendMessage':
+            if 'chat_id' not in payload or not payload.get('text'):
+                return 400, b'{"ok":false,"error_code":400,"description":"Bad Request: message text is empty"}'
+            self.messages.append(payload)
+            self._message_id += 1
+            result = {'message_id': self._message_id, 'chat': {'id': payload['chat_id']},
+                      'text': payload['text']}
+        elif method == 'getUpdates':
+            offset = payload.get('offset', 0)
+            limit = payload.get('limit', 100)
+            # Confirmed updates (below offset) are forgotten, like on the real API
+            self.updates = [update for update in self.updates if update['update_id'] >= offset]
+            result = self.updates[:limit]
+        else:
+            result = True
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
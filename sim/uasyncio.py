@@ -0,0 +1,179 @@
+"""A uasyncio scheduler on the board's virtual clock.
+
+Installed as `uasyncio` by sim.install(). Tasks run one at a time in
+deadline order, and the clock jumps straight to the next deadline, so
+waiting costs no host time. Work done inside a task (blocking sleeps, bus
+transfers, network delays) moves the clock too, and every task behind it
+starts late by that much, as on the device.
+
+Only the subset the firmware uses: sleep(), sleep_ms(), create_task(),
+gather(), Task awaiting and cancel(), and run(). BaseExceptions such as
+sim.Stop and machine.DeepSleep end run() straight away.
+"""
+from sim import board as _board
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class TimeoutError(Exception):
+    pass
+
+
+class _Sleep:
+    def __init__(self, ms):
+        self.ms = ms
+
+    def __iter__(self):
+        yield self
+
+    __await__ = __iter__
+
+
+def sleep(seconds):
+    return _Sleep(seconds * 1000)
+
+
+def sleep_ms(ms):
+    return _Sleep(ms)
+
+
+class Task:
+    def __init__(self, coro):
+        self.coro = coro
+        self.done_ = False
+        self.result = None
+        self.exception = None
+        self.waiting = []    # Tasks awaiting this one
+        self._cancel = False
+
+    def done(self):
+        return self.done_
+
+    def cancel(self):
+        if self.done_:
+            return False
+        self._cancel = True
+        _loop.schedule(self, 0)
+        return True
+
+    def __iter__(self):
+        if not self.done_:
+            yield self
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+    __await__ = __iter__
+
+
+class _Loop:
+    def __init__(self):
+        self.queue = []      # [wake_ms, seq, task], kept sorted
+        self.seq = 0
+        self.current = None
+        self.main = None     # run()'s task; its exception goes to the caller
+
+    def schedule(self, task, wake_ms):
+        for entry in self.queue:
+            if entry[2] is task:
+                self.queue.remove(entry)
+                break
+        self.seq += 1
+        entry = [wake_ms, self.seq, task]
+        i = len(self.queue)
+        while i and self.queue[i - 1][:2] > entry[:2]:
+            i -= 1
+        self.queue.insert(i, entry)
+
+    def _finish(self, task, result=None, exception=None):
+        task.done_ = True
+        task.result = result
+        task.exception = exception
+        now = _board.current.clock.now_ms()
+        for waiter in task.waiting:
+            self.schedule(waiter, now)
+        if exception is not None and not task.waiting and task is not self.main \
+                and not isinstance(exception, CancelledError):
+            print("Task exception wasn't retrieved:", repr(exception))
+
+    def step(self):
+        wake_ms, _, task = self.queue.pop(0)
+        clock = _board.current.clock
+        clock.advance_to(wake_ms)
+        self.current = task
+        try:
+            if task._cancel:
+                task._cancel = False
+                awaited = task.coro.throw(CancelledError())
+            else:
+                awaited = task.coro.send(None)
+        except StopIteration as e:
+            self._finish(task, e.value)
+            return
+        except CancelledError as e:
+            self._finish(task, exception=e)
+            return
+        except Exception as e:
+            self._finish(task, exception=e)
+            return
+        finally:
+            self.current = None
+        if isinstance(awaited, _Sleep):
+            self.schedule(task, clock.now_ms() + max(0, awaited.ms))
+        elif isinstance(awaited, Task):
+            awaited.waiting.append(task)
+        else:
+            self.schedule(task, clock.now_ms())  # A bare yield
+
+
+_loop = _Loop()
+
+
+def create_task(coro):
+    task = Task(coro)
+    _loop.schedule(task, _board.current.clock.now_ms())
+    return task
+
+
+def current_task():
+    return _loop.current
+
+
+async def gather(*awaitables, return_exceptions=False):
+    tasks = [a if isinstance(a, Task) else create_task(a) for a in awaitables]
+    results = []
+    for task in tasks:
+        try:
+            results.append(await task)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+async def wait_for(awaitable, timeout):
+    task = awaitable if isinstance(awaitable, Task) else create_task(awaitable)
+    deadline = _board.current.clock.now_ms() + timeout * 1000
+    while not task.done():
+        if _board.current.clock.now_ms() >= deadline:
+            task.cancel()
+            raise TimeoutError()
+        await sleep_ms(min(10, deadline - _board.current.clock.now_ms()))
+    return await task
+
+
+def run(main):
+    """Run main (a coroutine) and every task it starts until main returns."""
+    global _loop
+    _loop = _Loop()
+    task = _loop.main = create_task(main)
+    while not task.done():
+        if not _loop.queue:
+            raise RuntimeError("deadlock: main is waiting on nothing")
+        _loop.step()
+    if task.exception is not None:
+        raise task.exception
+    return task.result
@@ -0,0 +1,60 @@
+"""MicroPython's urequests over the simulated sockets, one connection per call."""
+import json as _json
+
+from sim import usocket, ussl
+
+
+class Response:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return _json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+def request(method, url, data=None, json=None, headers=None):
+    scheme, _, host_path = url.partition('://')
+    host, _, path = host_path.partition('/')
+    if json is not None:
+        data = _json.dumps(json)
+    if isinstance(data, str):
+        data = data.encode()
+    data = data or b''
+    port = 443 if scheme == 'https' else 80
+    address = usocket.getaddrinfo(host, port, 0, usocket.SOCK_STREAM)[0][-1]
+    sock = usocket.socket()
+    sock.connect(address)
+    if scheme == 'https':
+        sock = ussl.wrap_socket(sock, server_hostname=host)
+    head = '{} /{} HTTP/1.0\r\nHost: {}\r\nContent-Length: {}\r\n'.format(method, path, host, len(data))
+    for name, value in (headers or {}).items():
+        head += '{}: {}\r\n'.format(name, value)
+    sock.write(head.encode() + b'\r\n' + data)
+    status = int(sock.readline().split(None, 2)[1])
+    length = 0
+    while True:
+        line = sock.readline()
+        if not line or line == b'\r\n':
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    content = sock.read(length)
+    sock.close()
+    return Response(status, content)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
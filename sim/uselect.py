@@ -0,0 +1,55 @@
+"""MicroPython's uselect module, for the simulated sockets.
+
+poll() objects report POLLIN once a socket has response bytes to read
+(a held getUpdates long poll counts once it is answered) and POLLHUP
+when the connection broke. A wait with a timeout lets virtual time pass
+until something is ready or the timeout ends.
+"""
+POLLIN = 0x001
+POLLOUT = 0x004
+POLLERR = 0x008
+POLLHUP = 0x010
+
+_STEP_MS = 50  # Granularity of a waiting poll()
+
+
+class _Poll:
+    def __init__(self):
+        self._registered = {}  # id(obj) -> [obj, eventmask]
+
+    def register(self, obj, eventmask=POLLIN | POLLOUT):
+        self._registered[id(obj)] = [obj, eventmask]
+
+    def unregister(self, obj):
+        self._registered.pop(id(obj), None)
+
+    def modify(self, obj, eventmask):
+        self._registered[id(obj)][1] = eventmask
+
+    def _ready(self):
+        ready = []
+        for obj, mask in self._registered.values():
+            events = obj._poll_events() & (mask | POLLERR | POLLHUP)
+            if events:
+                ready.append((obj, events))
+        return ready
+
+    def poll(self, timeout=-1):
+        ready = self._ready()
+        if ready or not timeout or not self._registered:
+            return ready
+        from sim import board as _board
+        clock = _board.current.clock
+        end = None if timeout < 0 else clock.now_ms() + timeout
+        while not ready and (end is None or clock.now_ms() < end):
+            step = _STEP_MS if end is None else min(_STEP_MS, end - clock.now_ms())
+            clock.advance(step)
+            ready = self._ready()
+        return ready
+
+    def ipoll(self, timeout=-1, flags=0):
+        return iter(self.poll(timeout))
+
+
+def poll():
+    return _Poll()
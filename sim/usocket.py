@@ -0,0 +1,210 @@
+"""MicroPython's usocket module, connected to the board's fake Bot API.
+
+Only what an HTTP client needs: getaddrinfo(), a TCP socket with stream
+methods, and an HTTP/1.1 server end that answers each complete request
+from board.telegram. DNS, connect, and each request/response round trip
+take the board's configured delays. A getUpdates long poll (timeout > 0)
+with no update waiting is held, as the API does, until an update is
+pushed or its timeout ends. The connection breaks when the
+Wi-Fi link it was made on goes down (even if it comes back) or, with
+board.keepalive_ms set, when it was idle longer than the server keeps
+connections open.
+"""
+import json
+
+from sim import board as _board
+
+AF_INET = 2
+AF_INET6 = 10
+SOCK_STREAM = 1
+SOCK_DGRAM = 2
+IPPROTO_TCP = 6
+SOL_SOCKET = 1
+SO_REUSEADDR = 4
+
+_ECONNRESET = 104
+_ETIMEDOUT = 110
+_EHOSTUNREACH = 113
+
+
+def getaddrinfo(host, port, af=0, type=0, proto=0, flags=0):
+    board = _board.current
+    if not board.online():
+        raise OSError(-202)  # What the ESP32 port raises for a failed lookup
+    board.clock.advance(board.dns_ms)
+    return [(AF_INET, SOCK_STREAM, IPPROTO_TCP, '', ('149.154.167.220', port))]
+
+
+class socket:
+    def __init__(self, af=AF_INET, type=SOCK_STREAM, proto=IPPROTO_TCP):
+        self._board = _board.current
+        self.tls = False
+        self.timeout = None
+        self._open = False     # Connected and not closed by either end
+        self._closed = False   # The server closed its end
+        self._last_ms = 0      # now_ms() of the last request, for keepalive_ms
+        self._link = None      # (WLAN, its join count) the connection was made on
+        self._out = b''  # Request bytes not yet answered
+        self._in = b''   # Response bytes not yet read
+        self._held = None  # (payload, now_ms() deadline) of a held long poll
+
+    def settimeout(self, value):
+        self.timeout = value
+
+    def setblocking(self, flag):
+        self.timeout = None if flag else 0
+
+    def setsockopt(self, level, option, value):
+        pass
+
+    def connect(self, address):
+        board = self._board
+        if not board.online():
+            board.clock.advance((self.timeout or 10) * 1000)
+            raise OSError(_EHOSTUNREACH)
+        board.clock.advance(board.connect_ms)
+        link = board.link()
+        self._link = (link, link.joins)
+        self._open = True
+        self._last_ms = board.clock.now_ms()
+
+    def close(self):
+        self._open = False
+        self._held = None
+
+    def _broken(self):
+        board = self._board
+        keepalive = board.keepalive_ms
+        if self._open and self._held is None and keepalive is not None \
+                and board.clock.now_ms() - self._last_ms > keepalive:
+            self._closed = True  # The server timed the idle connection out
+        link = board.link()
+        return not self._open or self._closed or not board.internet or link is None \
+            or (link, link.joins) != self._link
+
+    def _check(self):
+        if self._broken():
+            raise OSError(_ECONNRESET)
+
+    def _poll_events(self):
+        # For uselect: readable once a response is buffered, hung up when broken
+        self._release()
+        if self._in:
+            return 0x001  # POLLIN
+        if self._held is not None and self._broken():
+            return 0x010  # POLLHUP
+        return 0
+
+    def write(self, data):
+        self._check()
+        self._out += bytes(data)
+        self._serve()
+        return len(data)
+
+    send = write
+
+    def sendall(self, data):
+        self.write(data)
+
+    def _serve(self):
+        # Answer every complete request in the output buffer
+        while True:
+            end = self._out.find(b'\r\n\r\n')
+            if end < 0:
+                return
+            head = self._out[:end].decode().split('\r\n')
+            length = 0
+            for line in head[1:]:
+                name, _, value = line.partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            if len(self._out) < end + 4 + length:
+                return
+            body = self._out[end + 4:end + 4 + length]
+            self._out = self._out[end + 4 + length:]
+            self._respond(head[0], body)
+
+    def _respond(self, request_line, body):
+        board = self._board
+        self._last_ms = board.clock.now_ms()
+        parts = request_line.split(' ')
+        path = parts[1] if len(parts) > 1 else ''
+        if path.startswith('/bot') and '/' in path[4:]:
+            method = path[4:].split('/', 1)[1].split('?')[0]
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                status, data = 400, b'{"ok":false,"error_code":400,"description":"Bad Request"}'
+            else:
+                if method == 'getUpdates' and payload.get('timeout') \
+                        and not board.telegram.pending(payload.get('offset', 0)):
+                    # Sending does not block; the answer comes when _release() says
+                    self._held = (payload, self._last_ms + payload['timeout'] * 1000)
+                    return
+                status, data = board.telegram.handle(method, payload)
+        else:
+            status, data = 404, b'{"ok":false,"error_code":404,"description":"Not Found"}'
+        board.clock.advance(board.rtt_ms)
+        self._last_ms = board.clock.now_ms()
+        self._answer(status, data)
+
+    def _answer(self, status, data):
+        head = 'HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n' \
+               'Connection: keep-alive\r\n\r\n'.format(status, 'OK' if status == 200 else 'Error', len(data))
+        self._in += head.encode() + data
+
+    def _release(self):
+        # Answer a held long poll once an update is waiting or its timeout ends
+        if self._held is None or self._broken():
+            return
+        payload, deadline = self._held
+        board = self._board
+        if board.clock.now_ms() >= deadline or board.telegram.pending(payload.get('offset', 0)):
+            self._held = None
+            self._last_ms = board.clock.now_ms()
+            self._answer(*board.telegram.handle('getUpdates', payload))
+
+    def _wait(self):
+        # Nothing buffered: a real socket would block until the timeout
+        self._release()
+        if self._in or self._closed:
+            return
+        clock = self._board.clock
+        end = clock.now_ms() + (self.timeout or 10) * 1000
+        while self._held is not None and clock.now_ms() < end:
+            clock.advance(min(50, end - clock.now_ms()))
+            self._release()
+            if self._in:
+                return
+        clock.advance_to(end)
+        raise OSError(_ETIMEDOUT)
+
+    def readline(self):
+        if not self._in:
+            if self._closed:
+                return b''
+            self._wait()
+        end = self._in.find(b'\n')
+        end = len(self._in) if end < 0 else end + 1
+        line = self._in[:end]
+        self._in = self._in[end:]
+        return line
+
+    def read(self, size=-1):
+        if not self._in:
+            if self._closed:
+                return b''
+            self._wait()
+        if size < 0:
+            size = len(self._in)
+        data = self._in[:size]
+        self._in = self._in[size:]
+        return data
+
+    recv = read
+
+    def readinto(self, buf, size=None):
+        size = len(buf) if size is None else min(size, len(buf))
+        data = self.read(size)
+        buf[:len(data)] = data
+        return len(data)
@@ -0,0 +1,82 @@
+"""MicroPython's time module on the board's virtual clock.
+
+Installed as `time` by sim.install(). Anything not defined here (e.g.
+CPython's monotonic()) is passed through from the real module.
+"""
+import time as _time
+
+from sim import board as _board
+
+_EPOCH_2000 = 946684800  # The ESP32 counts from 2000-01-01, CPython from 1970
+
+
+def _clock():
+    return _board.current.clock
+
+
+def ticks_ms():
+    return _clock().ticks_ms()
+
+
+def ticks_us():
+    return _clock().ticks_us()
+
+
+ticks_cpu = ticks_us
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) % (1 << 30)
+
+
+def ticks_diff(end, start):
+    half = 1 << 29
+    return ((end - start + half) % (1 << 30)) - half
+
+
+def sleep(seconds):
+    _clock().advance(seconds * 1000)
+
+
+def sleep_ms(ms):
+    _clock().advance(ms)
+
+
+def sleep_us(us):
+    _clock().advance(us / 1000)
+
+
+def time():
+    return int(_clock().time())
+
+
+def time_ns():
+    return int(_clock().time() * 1000000000)
+
+
+def gmtime(secs=None):
+    """(year, month, mday, hour, minute, second, weekday, yearday)."""
+    if secs is None:
+        secs = time()
+    t = _time.gmtime(int(secs) + _EPOCH_2000)
+    return tuple(t)[:8]
+
+
+localtime = gmtime  # The station has no timezone
+
+
+def mktime(t):
+    days = 0
+    for year in range(2000, t[0]):
+        days += 366 if year % 4 == 0 and (year % 100 or year % 400 == 0) else 365
+    month_days = (31, 29 if t[0] % 4 == 0 and (t[0] % 100 or t[0] % 400 == 0) else 28,
+                  31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+    for month in range(t[1] - 1):
+        days += month_days[month]
+    days += t[2] - 1
+    return ((days * 24 + t[3]) * 60 + t[4]) * 60 + t[5]
+
+
+for _name in dir(_time):
+    if not _name.startswith('_') and _name not in globals():
+        globals()[_name] = getattr(_time, _name)
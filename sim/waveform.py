@@ -0,0 +1,67 @@
+"""Scripted signals for the simulated sensors and pins.
+
+A waveform is any callable taking the simulation time in seconds and
+returning a value; these helpers build the common ones. Randomness comes
+from a seeded generator, so a run can be repeated exactly.
+"""
+import math
+
+
+def constant(value):
+    return lambda t: value
+
+
+def sine(mean, amplitude, period_s, phase_s=0):
+    """mean + amplitude * sin(); e.g. a daily temperature swing."""
+    w = 2 * math.pi / period_s
+    return lambda t: mean + amplitude * math.sin(w * (t + phase_s))
+
+
+def square(high, low, period_s, duty=0.5, phase_s=0):
+    """high for the first duty fraction of every period, then low."""
+    return lambda t: high if ((t + phase_s) % period_s) < duty * period_s else low
+
+
+def steps(points, before=0):
+    """Piecewise constant: [(t_s, value), ...] in time order; before the first point: before."""
+    points = tuple(points)
+
+    def wave(t):
+        value = before
+        for start, level in points:
+            if t < start:
+                break
+            value = level
+        return value
+    return wave
+
+
+def ramp(start_value, end_value, start_s, end_s):
+    """Linear change from start_value to end_value between start_s and end_s."""
+    def wave(t):
+        if t <= start_s:
+            return start_value
+        if t >= end_s:
+            return end_value
+        return start_value + (end_value - start_value) * (t - start_s) / (end_s - start_s)
+    return wave
+
+
+def add(*waves):
+    return lambda t: sum(wave(t) for wave in waves)
+
+
+class _Random:
+    # Small LCG, identical on CPython and MicroPython
+    def __init__(self, seed):
+        self.state = seed & 0xFFFFFFFF or 1
+
+    def uniform(self):
+        self.state = (self.state * 1103515245 + 12345) & 0x7FFFFFFF
+        return self.state / 0x7FFFFFFF
+
+
+def noise(wave, amplitude, seed=1):
+    """wave plus uniform noise in [-amplitude, amplitude], new on every read."""
+    rng = _Random(seed)
+    return lambda t: wave(t) + amplitude * (2 * rng.uniform() - 1)
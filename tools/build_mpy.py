@@ -0,0 +1,54 @@
+"""Precompile the station library to .mpy bytecode.
+
+    python tools/build_mpy.py [out_dir]
+
+Runs mpy-cross (from PATH, or the mpy-cross package on PyPI) on every module
+in Final_Project/lib and writes out_dir/lib/*.mpy (default build/lib). Copy
+the result to the board in place of the .py files, e.g.
+
+    mpremote cp -r build/lib :
+
+A .mpy import skips parsing and compiling on the device, which is most of
+the import time of a .py module and a large transient heap cost. boot.py
+itself must stay source. Final_Project/manifest.py freezes the same modules
+into a firmware image instead.
+"""
+import os
+import shutil
+import subprocess
+import sys
+
+SRC = os.path.join('Final_Project', 'lib')
+
+
+def compiler():
+    path = shutil.which('mpy-cross')
+    if path:
+        return [path]
+    try:
+        import mpy_cross
+    except ImportError:
+        sys.exit('mpy-cross not found: pip install mpy-cross, or build it from the MicroPython tree')
+    return [sys.executable, '-m', 'mpy_cross']
+
+
+def main():
+    out = os.path.join(sys.argv[1] if len(sys.argv) > 1 else 'build', 'lib')
+    os.makedirs(out, exist_ok=True)
+    cmd = compiler()
+    total_py = total_mpy = 0
+    print('module              .py bytes  .mpy bytes')
+    for name in sorted(os.listdir(SRC)):
+        if not name.endswith('.py'):
+            continue
+        src = os.path.join(SRC, name)
+        dst = os.path.join(out, name[:-3] + '.mpy')
+        subprocess.run(cmd + ['-o', dst, src], check=True)
+        py_size, mpy_size = os.path.getsize(src), os.path.getsize(dst)
+        total_py += py_size
+        total_mpy += mpy_size
+        print('{:<18} {:>10}  {:>10}'.format(name[:-3], py_size, mpy_size))
+    print('{:<18} {:>10}  {:>10}'.format('total', total_py, total_mpy))
+
+
+main()